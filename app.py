@@ -5,14 +5,21 @@ Interactive Streamlit dashboard for analyzing cyber attack patterns
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 from modules.data_loader import load_data, get_data_summary
 from modules.preprocess import preprocess_data, filter_data
 from modules import visuals
 from modules.anomaly import (
-    train_anomaly_detector, detect_anomalies, get_anomaly_summary,
+    run_anomaly_detection, get_anomaly_summary,
     get_top_anomalies, detect_threshold_anomalies, get_anomaly_insights
 )
+from modules.workers import compute_in_background, rerun_while_pending
+from modules.tracing import section, trace_rerun, render_performance_panel
+from modules.ip_index import ip_search_rows, unpack_ipv4_columns
+from modules.text_index import text_search_rows
+from modules.explorer import render_data_explorer, row_positions
+from modules.exports import render_export
 
 # Page configuration
 st.set_page_config(
@@ -57,8 +64,7 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Load and preprocess data
-@st.cache_data
+# Load and preprocess data (both stages are held in the project result cache)
 def load_and_process():
     df = load_data('cybersecurity_attacks.csv')
     df_processed = preprocess_data(df)
@@ -66,15 +72,18 @@ def load_and_process():
 
 # Main app
 def main():
+    section("Header")
     # Header
     st.title("🛡️ DarkSentinel")
     st.markdown("### Cybercrime Analytics Dashboard")
     st.markdown("---")
     
+    section("Load data")
     # Load data
     with st.spinner("Loading cybersecurity data..."):
         df = load_and_process()
     
+    section("Sidebar filters")
     # Sidebar filters
     st.sidebar.title("🔍 Filters")
     st.sidebar.markdown("---")
@@ -128,6 +137,7 @@ def main():
         default=protocols
     )
     
+    section("Apply filters")
     # Apply filters
     filters = {
         'years': selected_years,
@@ -158,6 +168,7 @@ def main():
     
     # Tab 1: Overview
     with tabs[0]:
+        section("Overview")
         st.header("📊 Overview Dashboard")
         
         # KPI Metrics
@@ -201,6 +212,7 @@ def main():
     
     # Tab 2: Timeline & Trends
     with tabs[1]:
+        section("Timeline & trends")
         st.header("📈 Timeline & Trends")
         
         # Monthly trends
@@ -245,6 +257,7 @@ def main():
     
     # Tab 3: Geo & Heatmap
     with tabs[2]:
+        section("Geo & heatmap")
         st.header("🗺️ Geographic Distribution")
         
         # Top locations
@@ -284,6 +297,7 @@ def main():
     
     # Tab 4: Attack Explorer
     with tabs[3]:
+        section("Attack explorer")
         st.header("🔍 Attack Explorer")
         
         # Search and filter options
@@ -301,56 +315,55 @@ def main():
                 ['All'] + list(filtered_df['Attack Signature'].unique())
             )
         
-        # Apply search filters
-        display_df = filtered_df.copy()
+        # Apply search filters as a row selection (no copy of the frame)
+        keep = np.ones(len(filtered_df), dtype=bool)
         
         if search_ip:
-            display_df = display_df[
-                display_df['Source IP Address'].str.contains(search_ip, case=False) |
-                display_df['Destination IP Address'].str.contains(search_ip, case=False)
-            ]
+            # Exact IPs, prefixes and CIDR blocks are answered from the dataset's IPv4 index
+            keep &= filtered_df.index.isin(
+                ip_search_rows(df, search_ip, ('Source IP Address', 'Destination IP Address'))
+            )
         
         if search_user:
-            display_df = display_df[
-                display_df['User Information'].str.contains(search_user, case=False)
-            ]
+            # Candidates come from the dataset's trigram index; only those are compared
+            keep &= filtered_df.index.isin(text_search_rows(df, search_user, ('User Information',)))
         
         if search_signature != 'All':
-            display_df = display_df[display_df['Attack Signature'] == search_signature]
+            keep &= (filtered_df['Attack Signature'] == search_signature).to_numpy()
+        
+        selected_rows = filtered_df.index[keep]
         
-        # Display table
-        st.dataframe(
-            display_df[[
+        # Sortable, paginated table (only the current page is taken from the frame)
+        page_df = render_data_explorer(
+            df, selected_rows, [
                 'Timestamp', 'Attack Type', 'Severity Level',
                 'Source IP Address', 'Destination IP Address',
                 'Protocol', 'Action Taken', 'IDS/IPS Alerts'
-            ]].head(100),
+            ], key="explorer",
             use_container_width=True,
             height=400
         )
         
-        # Export button
-        csv = display_df.to_csv(index=False)
-        st.download_button(
-            label="📥 Download Filtered Data as CSV",
-            data=csv,
-            file_name="darksentinel_filtered_data.csv",
-            mime="text/csv"
+        # Export, serialized only on request (large selections in a background worker)
+        render_export(
+            df, row_positions(df, selected_rows), key="explorer_export",
+            label="📥 Download Filtered Data",
+            file_stem="darksentinel_filtered_data"
         )
         
         # Detailed view
-        if len(display_df) > 0:
+        if len(page_df) > 0:
             st.markdown("---")
             st.subheader("🔬 Detailed Record View")
             
             record_idx = st.selectbox(
                 "Select record to view details",
-                range(min(50, len(display_df))),
-                format_func=lambda x: f"Record {x+1}: {display_df.iloc[x]['Attack Type']} at {display_df.iloc[x]['Timestamp']}"
+                range(len(page_df)),
+                format_func=lambda x: f"Record {x+1}: {page_df.iloc[x]['Attack Type']} at {page_df.iloc[x]['Timestamp']}"
             )
             
             if record_idx is not None:
-                record = display_df.iloc[record_idx]
+                record = unpack_ipv4_columns(page_df.iloc[[record_idx]]).iloc[0]
                 
                 col1, col2 = st.columns(2)
                 
@@ -391,6 +404,7 @@ def main():
     
     # Tab 5: Devices & Browsers
     with tabs[4]:
+        section("Devices & browsers")
         st.header("💻 Device & Browser Insights")
         
         col1, col2 = st.columns(2)
@@ -419,7 +433,7 @@ def main():
         col1, col2 = st.columns(2)
         
         with col1:
-            device_packet = filtered_df.groupby('Device/OS')['Packet Length'].mean().sort_values(ascending=False)
+            device_packet = filtered_df.groupby('Device/OS', observed=True)['Packet Length'].mean().sort_values(ascending=False)
             fig = px.bar(
                 x=device_packet.values,
                 y=device_packet.index,
@@ -446,6 +460,7 @@ def main():
     
     # Tab 6: Network & Protocols
     with tabs[5]:
+        section("Network & protocols")
         st.header("🌐 Network & Protocol Analysis")
         
         # Protocol distribution
@@ -456,7 +471,7 @@ def main():
         
         with col1:
             # Average packet length by protocol
-            protocol_packet = filtered_df.groupby('Protocol')['Packet Length'].mean().sort_values(ascending=False)
+            protocol_packet = filtered_df.groupby('Protocol', observed=True)['Packet Length'].mean().sort_values(ascending=False)
             fig = px.bar(
                 x=protocol_packet.index,
                 y=protocol_packet.values,
@@ -490,6 +505,7 @@ def main():
     
     # Tab 7: IDS/Firewall Analytics
     with tabs[6]:
+        section("IDS/Firewall")
         st.header("🛡️ IDS/Firewall Analytics")
         
         # Action taken distribution
@@ -540,90 +556,97 @@ def main():
     
     # Tab 8: Anomalies & Reports
     with tabs[7]:
+        section("Anomalies & reports")
         st.header("⚡ Anomaly Detection & Reports")
         
-        # Train anomaly detector
-        with st.spinner("Training anomaly detection model..."):
-            model, scaler, features = train_anomaly_detector(filtered_df, contamination=0.1)
-            df_with_anomalies = detect_anomalies(filtered_df, model, scaler, features)
+        # Train anomaly detector in a background worker so the rerun isn't blocked
+        df_with_anomalies = compute_in_background(
+            run_anomaly_detection, filtered_df, contamination=0.1,
+            label="Training anomaly detection model..."
+        )
         
-        # Anomaly summary
-        summary = get_anomaly_summary(df_with_anomalies)
+        if df_with_anomalies is not None:
+            # Anomaly summary
+            summary = get_anomaly_summary(df_with_anomalies)
         
-        col1, col2, col3, col4 = st.columns(4)
+            col1, col2, col3, col4 = st.columns(4)
         
-        with col1:
-            st.metric("Total Records", f"{summary['total_records']:,}")
+            with col1:
+                st.metric("Total Records", f"{summary['total_records']:,}")
         
-        with col2:
-            st.metric("Anomalies Detected", f"{summary['anomaly_count']:,}")
+            with col2:
+                st.metric("Anomalies Detected", f"{summary['anomaly_count']:,}")
         
-        with col3:
-            st.metric("Normal Records", f"{summary['normal_count']:,}")
+            with col3:
+                st.metric("Normal Records", f"{summary['normal_count']:,}")
         
-        with col4:
-            st.metric("Anomaly Rate", f"{summary['anomaly_percentage']:.2f}%")
+            with col4:
+                st.metric("Anomaly Rate", f"{summary['anomaly_percentage']:.2f}%")
         
-        st.markdown("---")
+            st.markdown("---")
         
-        # Anomaly score distribution
-        fig = visuals.create_anomaly_score_distribution(df_with_anomalies)
-        st.plotly_chart(fig, use_container_width=True)
+            # Anomaly score distribution
+            fig = visuals.create_anomaly_score_distribution(df_with_anomalies)
+            st.plotly_chart(fig, use_container_width=True)
         
-        # Top anomalies
-        st.subheader("🔝 Top Anomalous Records")
+            # Top anomalies
+            st.subheader("🔝 Top Anomalous Records")
         
-        n_anomalies = st.slider("Number of top anomalies to display", 5, 50, 10)
-        top_anomalies = get_top_anomalies(df_with_anomalies, n=n_anomalies)
+            n_anomalies = st.slider("Number of top anomalies to display", 5, 50, 10)
+            top_anomalies = get_top_anomalies(df_with_anomalies, n=n_anomalies)
         
-        st.dataframe(
-            top_anomalies[[
-                'Timestamp', 'Attack Type', 'Severity Level',
-                'Source IP Address', 'Protocol', 'Packet Length',
-                'Anomaly Scores', 'ML_Anomaly_Score'
-            ]],
-            use_container_width=True,
-            height=400
-        )
+            st.dataframe(
+                unpack_ipv4_columns(top_anomalies[[
+                    'Timestamp', 'Attack Type', 'Severity Level',
+                    'Source IP Address', 'Protocol', 'Packet Length',
+                    'Anomaly Scores', 'ML_Anomaly_Score'
+                ]]),
+                use_container_width=True,
+                height=400
+            )
         
-        # Anomaly insights
-        st.markdown("---")
-        st.subheader("📊 Anomaly Insights")
+            # Anomaly insights
+            st.markdown("---")
+            st.subheader("📊 Anomaly Insights")
         
-        insights = get_anomaly_insights(df_with_anomalies)
+            insights = get_anomaly_insights(df_with_anomalies)
         
-        col1, col2, col3 = st.columns(3)
+            col1, col2, col3 = st.columns(3)
         
-        with col1:
-            st.markdown("**Most Common Attack Type:**")
-            st.write(insights['most_common_attack_type'])
+            with col1:
+                st.markdown("**Most Common Attack Type:**")
+                st.write(insights['most_common_attack_type'])
             
-            st.markdown("**Most Common Severity:**")
-            st.write(insights['most_common_severity'])
+                st.markdown("**Most Common Severity:**")
+                st.write(insights['most_common_severity'])
         
-        with col2:
-            st.markdown("**Most Common Device:**")
-            st.write(insights['most_common_device'])
+            with col2:
+                st.markdown("**Most Common Device:**")
+                st.write(insights['most_common_device'])
             
-            st.markdown("**Most Common Protocol:**")
-            st.write(insights['most_common_protocol'])
+                st.markdown("**Most Common Protocol:**")
+                st.write(insights['most_common_protocol'])
         
-        with col3:
-            st.markdown("**Avg Packet Length:**")
-            st.write(f"{insights['avg_packet_length']:.2f} bytes")
+            with col3:
+                st.markdown("**Avg Packet Length:**")
+                st.write(f"{insights['avg_packet_length']:.2f} bytes")
             
-            st.markdown("**Avg Anomaly Score:**")
-            st.write(f"{insights['avg_anomaly_score']:.2f}")
+                st.markdown("**Avg Anomaly Score:**")
+                st.write(f"{insights['avg_anomaly_score']:.2f}")
         
-        # Export anomalies
-        st.markdown("---")
-        anomaly_csv = top_anomalies.to_csv(index=False)
-        st.download_button(
-            label="📥 Download Top Anomalies as CSV",
-            data=anomaly_csv,
-            file_name="darksentinel_anomalies.csv",
-            mime="text/csv"
-        )
+            # Export anomalies
+            st.markdown("---")
+            render_export(
+                top_anomalies, key="anomaly_export",
+                label="📥 Download Top Anomalies",
+                file_stem="darksentinel_anomalies"
+            )
+    
+    render_performance_panel()
+
+    # Keep polling while background computations are still running
+    rerun_while_pending()
 
 if __name__ == "__main__":
-    main()
+    with trace_rerun("app"):
+        main()
@@ -5,8 +5,7 @@ Complete redesign with improved UX and new dataset
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+import numpy as np
 from datetime import datetime
 import time
 
@@ -29,6 +28,10 @@ from modules_v2.visuals_global import (
 from modules_v2.recent_attacks import (
     create_recent_attacks_table, create_attack_summary_cards
 )
+from modules.workers import rerun_while_pending
+from modules.tracing import section, trace_rerun, render_performance_panel
+from modules.explorer import render_data_explorer, row_positions
+from modules.exports import render_export
 
 # Define text color for convenience
 TEXT_COLOR = COLORS['text_secondary']
@@ -44,24 +47,26 @@ st.set_page_config(
 # Apply glassmorphism theme
 apply_glassmorphism_theme()
 
-# Load data
-@st.cache_data(ttl=3600)
+# Load data (held in the project result cache)
 def load_and_cache_data():
     return load_global_data()
 
 # Main app
 def main():
+    section("Header")
     # Header - Updated title without "Real-Time Intelligence"
     st.markdown(create_header(
         "DARKSENTINEL V2",
         "CYBER COMMAND CENTER"
     ), unsafe_allow_html=True)
     
+    section("Load data")
     # Load data with loading animation
     with st.spinner('🔄 Initializing Threat Intelligence System...'):
         df = load_and_cache_data()
         time.sleep(0.3)
     
+    section("Sidebar filters")
     # Sidebar - Advanced Filters with improved colors
     with st.sidebar:
         st.markdown(f"""
@@ -162,6 +167,7 @@ def main():
         if st.button("🔄 RESET ALL", use_container_width=True):
             st.rerun()
     
+    section("Apply filters")
     # Apply filters
     filters = {
         'year_range': (start_year, end_year),
@@ -198,6 +204,7 @@ def main():
     
     # Main content area
     
+    section("Recent attacks")
     # Attack Summary Cards (replaces ticker)
     st.components.v1.html(create_attack_summary_cards(filtered_df), height=120)
     
@@ -208,6 +215,7 @@ def main():
     
     st.markdown("<br><br>", unsafe_allow_html=True)
     
+    section("Metrics")
     # Key Metrics Dashboard - SIMPLIFIED TO 5 CARDS IN SINGLE ROW
     st.markdown(create_section_header("📊 COMMAND CENTER METRICS", ""), unsafe_allow_html=True)
     
@@ -258,6 +266,7 @@ def main():
     
     st.markdown("<br><br>", unsafe_allow_html=True)
     
+    section("Yearly trends")
     # Yearly Trends
     st.markdown(create_section_header("📈 GLOBAL THREAT TRENDS (2015-2024)", ""), unsafe_allow_html=True)
     
@@ -267,6 +276,7 @@ def main():
     
     st.markdown("<br>", unsafe_allow_html=True)
     
+    section("Attack analysis")
     # Attack Distribution
     st.markdown(create_section_header("⚠️ ATTACK ANALYSIS", ""), unsafe_allow_html=True)
     
@@ -282,6 +292,7 @@ def main():
     
     st.markdown("<br>", unsafe_allow_html=True)
     
+    section("Geographic distribution")
     # Geographic Analysis with 3D Globe
     st.markdown(create_section_header("🌍 GEOGRAPHIC DISTRIBUTION", ""), unsafe_allow_html=True)
     
@@ -299,6 +310,7 @@ def main():
     
     st.markdown("<br>", unsafe_allow_html=True)
     
+    section("Defense effectiveness")
     # Defense Mechanism Analysis - REPLACED RADAR WITH BAR CHART
     st.markdown(create_section_header("🛡️ DEFENSE MECHANISM EFFECTIVENESS", ""), unsafe_allow_html=True)
     
@@ -316,6 +328,7 @@ def main():
     
     st.markdown("<br>", unsafe_allow_html=True)
     
+    section("Financial impact")
     # Financial Impact
     st.markdown(create_section_header("💰 FINANCIAL IMPACT ANALYSIS", ""), unsafe_allow_html=True)
     
@@ -331,6 +344,7 @@ def main():
     
     st.markdown("<br>", unsafe_allow_html=True)
     
+    section("Resolution time")
     # Resolution Time Analysis
     st.markdown(create_section_header("⏱️ INCIDENT RESOLUTION ANALYSIS", ""), unsafe_allow_html=True)
     
@@ -339,6 +353,7 @@ def main():
     
     st.markdown("<br>", unsafe_allow_html=True)
     
+    section("3D correlation")
     # 3D Attack Correlation Analysis
     st.markdown(create_section_header("🔮 3D ATTACK CORRELATION ANALYSIS", ""), unsafe_allow_html=True)
     
@@ -348,6 +363,7 @@ def main():
     
     st.markdown("<br>", unsafe_allow_html=True)
     
+    section("Attack flow")
     # Attack Flow Diagram
     st.markdown(create_section_header("🔀 ATTACK FLOW DIAGRAM", ""), unsafe_allow_html=True)
     
@@ -357,6 +373,7 @@ def main():
     
     st.markdown("<br>", unsafe_allow_html=True)
     
+    section("Data explorer")
     # Data Explorer
     st.markdown(create_section_header("🔍 THREAT INTELLIGENCE DATABASE", ""), unsafe_allow_html=True)
     
@@ -381,44 +398,47 @@ def main():
             ['All'] + sorted(filtered_df['Target Industry'].unique().tolist())
         )
     
-    # Apply search filters
-    display_df = filtered_df.copy()
+    # Apply search filters as a row selection (no copy of the frame)
+    keep = np.ones(len(filtered_df), dtype=bool)
     
     if search_country != 'All':
-        display_df = display_df[display_df['Country'] == search_country]
+        keep &= (filtered_df['Country'] == search_country).to_numpy()
     
     if search_attack != 'All':
-        display_df = display_df[display_df['Attack Type'] == search_attack]
+        keep &= (filtered_df['Attack Type'] == search_attack).to_numpy()
     
     if search_industry != 'All':
-        display_df = display_df[display_df['Target Industry'] == search_industry]
+        keep &= (filtered_df['Target Industry'] == search_industry).to_numpy()
     
-    # Display dataframe
-    st.dataframe(
-        display_df[[
+    selected_rows = filtered_df.index[keep]
+    
+    # Sortable, paginated table (only the current page is taken from the frame)
+    render_data_explorer(
+        df, selected_rows, [
             'Year', 'Country', 'Attack Type', 'Target Industry',
             'Financial Loss (in Million $)', 'Number of Affected Users',
             'Attack Source', 'Security Vulnerability Type',
             'Defense Mechanism Used', 'Incident Resolution Time (in Hours)'
-        ]].head(100),
+        ], key="threat_db",
         use_container_width=True,
         height=400
     )
     
+    section("Export")
     # Export functionality
     col1, col2, col3 = st.columns([1, 1, 2])
     
     with col1:
-        csv = display_df.to_csv(index=False).encode('utf-8')
-        st.download_button(
-            label="📥 EXPORT TO CSV",
-            data=csv,
-            file_name=f"darksentinel_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-            mime="text/csv",
+        # Serialized only on request (large selections in a background worker)
+        render_export(
+            df, row_positions(df, selected_rows), key="export",
+            label="📥 EXPORT",
+            file_stem=f"darksentinel_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
             use_container_width=True
         )
 
     
+    section("Footer")
     # Footer
     st.markdown("<br><br>", unsafe_allow_html=True)
     st.markdown(f"""
@@ -440,6 +460,12 @@ def main():
         </div>
     </div>
     """, unsafe_allow_html=True)
+    
+    render_performance_panel()
+
+    # Keep polling while background computations are still running
+    rerun_while_pending()
 
 if __name__ == "__main__":
-    main()
+    with trace_rerun("app_final"):
+        main()
@@ -5,6 +5,7 @@ Complete Glassmorphism Cyber Theme Redesign with Advanced Features
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
@@ -20,8 +21,11 @@ from modules_v2.glassmorphism_theme import (
 TEXT_COLOR = COLORS['text_secondary']
 from modules_v2.data_loader_v2 import (
     load_data, get_data_summary, get_attack_statistics,
-    get_real_time_metrics, filter_data, get_top_threats
+    get_real_time_metrics, filter_data, get_top_threats, load_shared_data
 )
+from modules.shared_store import is_enabled as shared_store_enabled
+from modules_v2.live_ingest import tail_mode_enabled, get_live_store
+from modules_v2.replay import replay_source, replay_speedup, get_replay_store
 from modules_v2.advanced_visuals import (
     create_3d_globe, create_animated_timeline, create_sunburst_chart,
     create_3d_scatter, create_radar_chart, create_heatmap_calendar,
@@ -29,8 +33,13 @@ from modules_v2.advanced_visuals import (
     create_mitigation_chart
 )
 from modules_v2.live_feed import (
-    create_top_attacks, create_attack_ticker, create_status_board
+    create_top_attacks, create_attack_ticker, create_status_board, update_live_terminal_feed
 )
+from modules.workers import rerun_while_pending
+from modules.tracing import section, trace_rerun, render_performance_panel
+from modules.ip_index import ip_search_rows
+from modules.explorer import render_data_explorer, row_positions
+from modules.exports import render_export
 
 # Page configuration
 st.set_page_config(
@@ -53,19 +62,38 @@ if 'fullscreen_chart' not in st.session_state:
 if 'filters_applied' not in st.session_state:
     st.session_state.filters_applied = False
 
+def live_store():
+    """The live store behind the dashboard in replay or tail-follow mode, else None"""
+    source = replay_source()
+    if source is not None:
+        store, _ = get_replay_store(str(source), replay_speedup())
+        return store
+    if tail_mode_enabled():
+        return get_live_store()
+    return None
+
 # Load data
-@st.cache_data(ttl=3600)
 def load_and_cache_data():
+    # Replay / tail-follow mode: serve what the live store has ingested so far
+    store = live_store()
+    if store is not None:
+        store.refresh()
+        return store.frame
+    # Replicas on one host attach to a single shared copy when enabled
+    if shared_store_enabled():
+        return load_shared_data()
     return load_data()
 
 # Main app
 def main():
+    section("Header")
     # Header
     st.markdown(create_header(
         "DARKSENTINEL V2",
         "CYBER COMMAND CENTER | REAL-TIME THREAT INTELLIGENCE"
     ), unsafe_allow_html=True)
     
+    section("Load data")
     # Load data
     df = load_and_cache_data()
 
@@ -73,6 +101,7 @@ def main():
     
     # Notification removed per user request
     
+    section("Sidebar filters")
     # Sidebar - Advanced Filters
     with st.sidebar:
         st.markdown(f"""
@@ -209,6 +238,7 @@ def main():
             st.session_state.filters_applied = False
             st.rerun()
     
+    section("Apply filters")
     # Apply filters
     # Ensure date_range is a tuple with both values
     valid_date_range = None
@@ -252,17 +282,36 @@ def main():
     
     # Main content area
     
+    section("Live feed")
+    # In replay / tail-follow mode the unfiltered view renders from the live
+    # top-N structures instead of scanning every row
+    feed_df = filtered_df
+    store = live_store()
+    if store is not None and len(filtered_df) == len(df):
+        with store.reading() as aggregates:
+            feed_df = aggregates.candidates()
+    
     # Critical Alerts Ticker
-    st.markdown(create_attack_ticker(filtered_df, n_items=10), unsafe_allow_html=True)
+    st.markdown(create_attack_ticker(feed_df, n_items=10), unsafe_allow_html=True)
     
     st.markdown("<br>", unsafe_allow_html=True)
     
     # Real-time Status Board and Live Feed
     # Top attacks display (full width, system status removed per user request)
-    st.markdown(create_top_attacks(filtered_df, n=10), unsafe_allow_html=True)
+    st.markdown(create_top_attacks(feed_df, n=10), unsafe_allow_html=True)
     
     st.markdown("<br>", unsafe_allow_html=True)
     
+    # Live terminal: only the events pushed since this session's last render
+    # are taken from the store's feed ring
+    if store is not None:
+        with store.reading():
+            terminal, shown = update_live_terminal_feed(store.feed, st.session_state.get('live_terminal'))
+        st.session_state['live_terminal'] = shown
+        st.markdown(terminal, unsafe_allow_html=True)
+        st.markdown("<br>", unsafe_allow_html=True)
+    
+    section("Metrics")
     # Key Metrics Dashboard
     st.markdown(create_section_header("📊 COMMAND CENTER METRICS", ""), unsafe_allow_html=True)
     
@@ -366,6 +415,7 @@ def main():
     
     st.markdown("<br><br>", unsafe_allow_html=True)
     
+    section("Global threat intelligence")
     # Main Visualizations
     st.markdown(create_section_header("🌐 GLOBAL THREAT INTELLIGENCE", ""), unsafe_allow_html=True)
     
@@ -433,6 +483,7 @@ def main():
     
     st.markdown("<br>", unsafe_allow_html=True)
     
+    section("Attack patterns")
     # Attack Analysis Section
     st.markdown(create_section_header("📈 ATTACK PATTERN ANALYSIS", ""), unsafe_allow_html=True)
     
@@ -457,6 +508,7 @@ def main():
     
     st.markdown("<br>", unsafe_allow_html=True)
     
+    section("3D correlation")
     # 3D Scatter Analysis
     st.markdown(create_section_header("🔮 3D ATTACK CORRELATION", ""), unsafe_allow_html=True)
     fig_3d = create_3d_scatter(filtered_df)
@@ -464,6 +516,7 @@ def main():
     
     st.markdown("<br>", unsafe_allow_html=True)
     
+    section("Security posture")
     # Security Posture
     st.markdown(create_section_header("🛡️ SECURITY POSTURE ANALYSIS", ""), unsafe_allow_html=True)
     
@@ -479,6 +532,7 @@ def main():
     
     st.markdown("<br>", unsafe_allow_html=True)
     
+    section("Temporal patterns")
     # Temporal Analysis
     st.markdown(create_section_header("⏰ TEMPORAL ATTACK PATTERNS", ""), unsafe_allow_html=True)
     
@@ -550,6 +604,7 @@ def main():
     
     st.markdown("<br>", unsafe_allow_html=True)
     
+    section("Attack flow")
     # Attack Flow
     st.markdown(create_section_header("🔀 ATTACK FLOW DIAGRAM", ""), unsafe_allow_html=True)
     fig_sankey = create_sankey_flow(filtered_df)
@@ -557,6 +612,7 @@ def main():
     
     st.markdown("<br>", unsafe_allow_html=True)
     
+    section("Data explorer")
     # Data Explorer
     st.markdown(create_section_header("🔍 THREAT INTELLIGENCE DATABASE", ""), unsafe_allow_html=True)
     
@@ -578,47 +634,48 @@ def main():
             ['All', 'Low (1-3)', 'Medium (4-6)', 'High (7-10)']
         )
     
-    # Apply search filters
-    display_df = filtered_df.copy()
+    # Apply search filters as a row selection (no copy of the frame)
+    keep = np.ones(len(filtered_df), dtype=bool)
     
     if search_ip:
-        display_df = display_df[
-            display_df['attacker_ip'].str.contains(search_ip, case=False) |
-            display_df['target_ip'].str.contains(search_ip, case=False)
-        ]
+        # Exact IPs, prefixes and CIDR blocks are answered from the dataset's IPv4 index
+        keep &= filtered_df.index.isin(ip_search_rows(df, search_ip, ('attacker_ip', 'target_ip')))
     
     if search_attack != 'All':
-        display_df = display_df[display_df['attack_type'] == search_attack]
+        keep &= (filtered_df['attack_type'] == search_attack).to_numpy()
     
     if search_severity != 'All':
+        severity = filtered_df['attack_severity'].to_numpy()
         if search_severity == 'Low (1-3)':
-            display_df = display_df[display_df['attack_severity'] <= 3]
+            keep &= severity <= 3
         elif search_severity == 'Medium (4-6)':
-            display_df = display_df[(display_df['attack_severity'] >= 4) & (display_df['attack_severity'] <= 6)]
+            keep &= (severity >= 4) & (severity <= 6)
         elif search_severity == 'High (7-10)':
-            display_df = display_df[display_df['attack_severity'] >= 7]
+            keep &= severity >= 7
     
-    # Display dataframe
-    st.dataframe(
-        display_df[[
+    selected_rows = filtered_df.index[keep]
+    
+    # Sortable, paginated table (only the current page is taken from the frame)
+    render_data_explorer(
+        df, selected_rows, [
             'timestamp', 'attack_type', 'target_system', 'outcome',
             'attacker_ip', 'target_ip', 'location', 'industry',
             'attack_severity', 'data_compromised_GB', 'mitigation_method'
-        ]].head(100),
+        ], key="threat_db",
         width='stretch',
         height=400
     )
     
+    section("Export")
     # Export functionality
     col1, col2, col3 = st.columns([1, 1, 2])
     
     with col1:
-        csv = display_df.to_csv(index=False).encode('utf-8')
-        st.download_button(
-            label="📥 EXPORT TO CSV",
-            data=csv,
-            file_name=f"darksentinel_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-            mime="text/csv",
+        # Serialized only on request (large selections in a background worker)
+        render_export(
+            df, row_positions(df, selected_rows), key="export",
+            label="📥 EXPORT",
+            file_stem=f"darksentinel_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
             use_container_width=True
         )
     
@@ -629,6 +686,7 @@ def main():
                 "info"
             ), unsafe_allow_html=True)
     
+    section("Footer")
     # Footer
     st.markdown("<br><br>", unsafe_allow_html=True)
     st.markdown(f"""
@@ -650,6 +708,12 @@ def main():
         </div>
     </div>
     """, unsafe_allow_html=True)
+    
+    render_performance_panel()
+
+    # Keep polling while background computations are still running
+    rerun_while_pending()
 
 if __name__ == "__main__":
-    main()
+    with trace_rerun("app_v2"):
+        main()
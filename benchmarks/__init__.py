@@ -0,0 +1,5 @@
+"""
+DarkSentinel Benchmarks
+Headless timing scripts for the dashboard's data and rendering paths;
+run them as modules, e.g. python -m benchmarks.html_render
+"""
@@ -0,0 +1,101 @@
+"""
+HTML Rendering Benchmark
+Times the row-templated renderers (recent attacks table, terminal feed,
+top attacks) on synthetic tables of 10, 1k and 10k rows
+
+Usage: python -m benchmarks.html_render [--repeat N]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from modules_v2.live_feed import create_terminal_feed, create_top_attacks
+from modules_v2.recent_attacks import create_recent_attacks_table
+
+SIZES = (10, 1_000, 10_000)
+SEED = 42
+
+
+def make_v2_frame(rows, seed=SEED):
+    """Synthetic frame in the V2 (live feed) schema"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'timestamp': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365 * 86400, rows), unit='s'),
+        'attack_type': rng.choice(['DDoS', 'Phishing', 'Ransomware', 'SQL Injection', 'Malware'], rows),
+        'target_system': rng.choice(['Server', 'Workstation', 'Firewall', 'IoT Device'], rows),
+        'location': rng.choice(['USA', 'UK', 'Germany', 'India', 'Brazil'], rows),
+        'attack_severity': rng.integers(1, 11, rows),
+        'data_compromised_GB': rng.uniform(0, 100, rows).round(2),
+        'outcome': rng.choice(['Success', 'Failure'], rows),
+        'attacker_ip': [f"10.0.{i % 256}.{i % 251}" for i in range(rows)],
+        'target_ip': [f"192.168.{i % 256}.{i % 241}" for i in range(rows)],
+        'attack_duration_min': rng.integers(1, 300, rows),
+        'response_time_min': rng.integers(1, 120, rows),
+        'mitigation_method': rng.choice(['Firewall', 'Patch', 'Isolation'], rows),
+    })
+
+
+def make_global_frame(rows, seed=SEED):
+    """Synthetic frame in the global threats schema"""
+    rng = np.random.default_rng(seed)
+    loss = rng.uniform(0.5, 100, rows).round(2)
+    return pd.DataFrame({
+        'Year': rng.integers(2015, 2025, rows),
+        'Country': rng.choice(['USA', 'UK', 'Germany', 'India', 'Brazil'], rows),
+        'Attack Type': rng.choice(['DDoS', 'Phishing', 'Ransomware', 'SQL Injection'], rows),
+        'Target Industry': rng.choice(['Banking', 'Healthcare', 'Retail', 'IT'], rows),
+        'Financial Loss (in Million $)': loss,
+        'Number of Affected Users': rng.integers(1, 1_000_000, rows),
+        'Severity_Score': (loss / 10).clip(1, 10).round(1),
+    })
+
+
+def time_call(fn, repeat):
+    """Best-of-repeat wall time in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def run(sizes=SIZES, repeat=5):
+    """
+    Time every renderer at every table size
+
+    Returns:
+    --------
+    list of dict
+        One record per (renderer, rows) with the best time in ms
+    """
+    results = []
+    for rows in sizes:
+        v2 = make_v2_frame(rows)
+        global_df = make_global_frame(rows)
+        renderers = {
+            'recent_attacks_table': lambda: create_recent_attacks_table(global_df, n=rows),
+            'terminal_feed': lambda: create_terminal_feed(v2, n_recent=rows),
+            # Bypass the result cache so every repeat renders
+            'top_attacks': lambda: create_top_attacks(v2.copy(), n=rows),
+        }
+        for name, render in renderers.items():
+            results.append({'renderer': name, 'rows': rows, 'ms': time_call(render, repeat)})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per case (best is reported)')
+    args = parser.parse_args()
+
+    print(f"{'renderer':<24}{'rows':>8}{'ms':>12}")
+    for record in run(repeat=args.repeat):
+        print(f"{record['renderer']:<24}{record['rows']:>8,}{record['ms']:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+"""
+Import-Time Benchmark
+Measures the cold-start import cost of each dashboard entry point in fresh
+interpreters: the wall time of the entry point's top-level imports, the
+slowest packages reported by `python -X importtime`, and which heavy
+third-party packages (scikit-learn, Plotly, ...) were loaded at import
+
+Usage: python -m benchmarks.import_time [--entry-points app_final.py ...]
+       [--modules modules.workers ...] [--repeat N] [--top N] [--output FILE]
+"""
+
+import argparse
+import ast
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+ENTRY_POINTS = ('app.py', 'app_v2.py', 'app_final.py', 'serve.py')
+# Modules a worker process imports to unpickle its job function
+WORKER_MODULES = ('modules.workers', 'modules.anomaly', 'modules_v2.data_loader_global')
+HEAVY_PACKAGES = ('sklearn', 'scipy', 'plotly.express', 'plotly.graph_objects', 'pyarrow')
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+{imports}
+elapsed = time.perf_counter() - started
+print(json.dumps({{'seconds': elapsed,
+                  'loaded': [m for m in {heavy!r} if m in sys.modules],
+                  'modules': len(sys.modules)}}))
+"""
+
+
+def entry_point_imports(path):
+    """
+    Source of the top-level import statements of a script
+
+    Only imports are executed, so scripts that render a page or start a
+    server when run can be measured without side effects.
+    """
+    tree = ast.parse(Path(path).read_text(encoding='utf-8'))
+    return '\n'.join(ast.unparse(node) for node in tree.body
+                     if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def parse_importtime(stderr, top=10):
+    """
+    Slowest top-level imports from `-X importtime` output
+
+    Returns:
+    --------
+    list of tuple
+        (package, cumulative seconds) for imports at nesting depth 0
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line.split(':', 1)[1].split('|')
+        # Nested imports are indented below their parent
+        if name[1:].startswith(' '):
+            continue
+        rows.append((name.strip(), int(cumulative_us) / 1e6))
+    return sorted(rows, key=lambda row: row[1], reverse=True)[:top]
+
+
+def probe(imports, python=sys.executable):
+    """Run imports in a fresh interpreter; returns (result dict, importtime stderr)"""
+    code = _PROBE.format(imports=imports, heavy=HEAVY_PACKAGES)
+    completed = subprocess.run(
+        [python, '-X', 'importtime', '-c', code],
+        cwd=ROOT, capture_output=True, text=True,
+        env={**os.environ, 'PYTHONPATH': str(ROOT)},
+    )
+    if completed.returncode != 0:
+        error = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else 'failed'
+        raise RuntimeError(error)
+    return json.loads(completed.stdout.strip().splitlines()[-1]), completed.stderr
+
+
+def measure_imports(name, imports, repeat, top):
+    """Time imports over repeat fresh interpreters; returns a benchmark record"""
+    times, loaded, slowest, error, module_count = [], [], [], None, None
+    for run in range(repeat):
+        try:
+            result, stderr = probe(imports)
+        except RuntimeError as exc:
+            error = str(exc)
+            break
+        times.append(result['seconds'])
+        if run == 0:
+            loaded = result['loaded']
+            module_count = result['modules']
+            slowest = parse_importtime(stderr, top)
+    return {
+        'stage': f"import {name}",
+        'group': 'import',
+        'rows': 0,
+        'times_s': times,
+        'best_s': min(times) if times else None,
+        'median_s': statistics.median(times) if times else None,
+        'heavy_loaded': loaded,
+        'modules_loaded': module_count,
+        'slowest_imports': [{'module': module, 'seconds': round(seconds, 4)} for module, seconds in slowest],
+        'error': error,
+    }
+
+
+def run(entry_points=ENTRY_POINTS, modules=WORKER_MODULES, repeat=5, top=8, log=print):
+    """
+    Benchmark the import cost of every entry point and module
+
+    Returns:
+    --------
+    dict
+        Run metadata and a 'results' list in the pipeline benchmark's format,
+        so runs can be stored and compared with benchmarks/results.py
+    """
+    started = datetime.now(timezone.utc)
+    targets = [(name, entry_point_imports(ROOT / name)) for name in entry_points]
+    targets += [(name, f"import {name}") for name in modules]
+
+    results = []
+    for name, imports in targets:
+        record = measure_imports(name, imports, repeat, top)
+        results.append(record)
+        if record['error']:
+            log(f"  {name:<34} {record['error']}")
+            continue
+        heavy = ', '.join(record['heavy_loaded']) or 'none'
+        log(f"  {name:<34} {record['median_s'] * 1000:8.1f} ms  {record['modules_loaded']:5d} modules  "
+            f"heavy: {heavy}")
+        for row in record['slowest_imports']:
+            log(f"      {row['module']:<30} {row['seconds'] * 1000:8.1f} ms")
+    return {
+        'benchmark': 'import_time',
+        'created': started.isoformat(timespec='seconds'),
+        'repeat': repeat,
+        'python': platform.python_version(),
+        'results': results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--entry-points', nargs='*', default=list(ENTRY_POINTS),
+                        help='scripts whose top-level imports are timed')
+    parser.add_argument('--modules', nargs='*', default=list(WORKER_MODULES),
+                        help='modules timed with a plain import (e.g. what worker processes load)')
+    parser.add_argument('--repeat', type=int, default=5, help='fresh interpreters per target')
+    parser.add_argument('--top', type=int, default=8, help='slowest top-level imports listed per target')
+    parser.add_argument('--output', type=Path, default=Path('import_benchmark.json'), help='results file')
+    args = parser.parse_args()
+
+    report = run(args.entry_points, args.modules, args.repeat, args.top)
+    args.output.write_text(json.dumps(report, indent=2))
+    print(f"\nWrote {len(report['results'])} results to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
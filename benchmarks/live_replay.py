@@ -0,0 +1,117 @@
+"""
+Live Replay Load Test
+Replays a stored dataset through the live pipeline (LiveStore ring buffer and
+incremental aggregates) at a speed-up factor while a render loop redraws the
+live panels like a dashboard rerun would, then reports throughput,
+backpressure, lag and panel render latency
+
+Usage: python -m benchmarks.live_replay [--dataset PATH | --rows N]
+       [--speedup X] [--duration S] [--batch-size N] [--buffer N] [--refresh S]
+"""
+
+import argparse
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from modules.data_adapter import find_dataset
+from modules_v2.live_feed import (
+    create_attack_ticker, create_live_terminal_feed, create_status_board, create_top_attacks
+)
+from modules_v2.live_ingest import LiveStore
+from modules_v2.replay import (
+    DEFAULT_BATCH_SIZE, DEFAULT_BUFFER_BATCHES, DEFAULT_MAX_GAP, ReplayEngine, load_replay_frame
+)
+from benchmarks.html_render import make_v2_frame
+
+
+def render_panels(store):
+    """Render every live panel from the store's incremental structures"""
+    with store.reading() as aggregates:
+        candidates = aggregates.candidates()
+        counts = aggregates.status_counts()
+        create_live_terminal_feed(store.feed, n_recent=20)
+    if candidates.empty:
+        return
+    create_attack_ticker(candidates, n_items=10)
+    create_top_attacks(candidates, n=10)
+    create_status_board(candidates, counts=counts)
+
+
+def run(frame, speedup, duration, batch_size=DEFAULT_BATCH_SIZE,
+        buffer_batches=DEFAULT_BUFFER_BATCHES, max_gap=DEFAULT_MAX_GAP, refresh=1.0):
+    """
+    Replay a frame for up to duration seconds while redrawing the panels
+
+    Returns:
+    --------
+    dict
+        The engine's stats plus render latency percentiles (ms) and final row count
+    """
+    store = LiveStore()
+    engine = ReplayEngine(frame, store.ingest, speedup=speedup, batch_size=batch_size,
+                          buffer_batches=buffer_batches, max_gap=max_gap)
+    render_ms = []
+    done = threading.Event()
+
+    def render_loop():
+        while not done.is_set():
+            started = time.perf_counter()
+            render_panels(store)
+            render_ms.append((time.perf_counter() - started) * 1000)
+            done.wait(refresh)
+
+    renderer = threading.Thread(target=render_loop, name='replay-render', daemon=True)
+    engine.start()
+    renderer.start()
+    engine.wait(duration)
+    engine.stop()
+    done.set()
+    renderer.join()
+
+    stats = engine.stats()
+    stats['rows'] = store.rows
+    stats['renders'] = len(render_ms)
+    if render_ms:
+        stats['render_p50_ms'] = float(np.percentile(render_ms, 50))
+        stats['render_p95_ms'] = float(np.percentile(render_ms, 95))
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--dataset', type=Path, help='dataset to replay (default: the adapter\'s pick)')
+    parser.add_argument('--rows', type=int, help='replay N synthetic rows instead of a dataset')
+    parser.add_argument('--speedup', type=float, nargs='+', default=[1.0, 100.0],
+                        help='speed-up factors to run (default: 1 100)')
+    parser.add_argument('--duration', type=float, default=30.0, help='seconds per run at most')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--buffer', type=int, default=DEFAULT_BUFFER_BATCHES, help='buffered batches')
+    parser.add_argument('--max-gap', type=float, default=DEFAULT_MAX_GAP,
+                        help='longest wall-clock wait between events (seconds)')
+    parser.add_argument('--refresh', type=float, default=1.0, help='seconds between panel redraws')
+    args = parser.parse_args()
+
+    if args.rows:
+        frame = make_v2_frame(args.rows).sort_values('timestamp', kind='stable').reset_index(drop=True)
+    else:
+        path = args.dataset or find_dataset(Path(__file__).parent.parent)
+        if path is None:
+            parser.error('no dataset found; pass --dataset or --rows')
+        frame = load_replay_frame(path)
+
+    print(f"{'speedup':>9}{'rows':>10}{'events/s':>12}{'max lag s':>11}"
+          f"{'blocked s':>11}{'buf hw':>8}{'render p50':>12}{'render p95':>12}")
+    for speedup in args.speedup:
+        stats = run(frame, speedup, args.duration, args.batch_size, args.buffer,
+                    args.max_gap, args.refresh)
+        print(f"{speedup:>9g}{stats['rows']:>10,}{stats['events_per_s']:>12,.0f}"
+              f"{stats['max_lag_s']:>11.3f}{stats['producer_blocked_s']:>11.3f}"
+              f"{stats['buffer_high_water']:>8}{stats.get('render_p50_ms', 0):>12.2f}"
+              f"{stats.get('render_p95_ms', 0):>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
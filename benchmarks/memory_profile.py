@@ -0,0 +1,364 @@
+"""
+Memory Profile per Pipeline Stage
+Runs each dashboard's pipeline (load, schema mapping, preprocessing,
+filtering, anomaly scoring, figure building) on a fixed-seed synthetic
+dataset with tracemalloc on, and records after every stage the memory it
+allocated and kept, its traced and RSS peaks, the size of its output, and
+the top allocation sites, to show where the extra copies of the dataset
+come from. Runs headless: no Streamlit server is started.
+
+tracemalloc only sees allocations made through Python's allocator. Arrow-
+backed columns (pandas' default string dtype) live in Arrow's memory pool,
+which is reported separately as arrow_kept_mb; RSS covers everything.
+
+Stage results are kept alive between stages, as they are in a dashboard
+session, and the decorated (result-cached) functions are called, so the
+cache's own references are part of the picture; use --no-cache to call the
+undecorated functions instead.
+
+Usage: python -m benchmarks.memory_profile [--rows N] [--flows app app_v2 app_final]
+       [--top N] [--frames N] [--group-by lineno|filename|traceback]
+       [--no-cache] [--output memory_profile.json]
+"""
+
+import argparse
+import importlib
+import json
+import linecache
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks.pipeline import (
+    GLOBAL_FILTERS, SEED, V1_FILTERS, V2_FILTERS, PeakMemory, _rss_bytes,
+    figure_factories, make_attacks_frame, undecorated, write_global_dataset,
+)
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+ROOT = Path(__file__).resolve().parent.parent
+FLOWS = ('app', 'app_v2', 'app_final')
+MB = 2 ** 20
+# Modules the pipeline imports lazily, loaded by preload() before tracing starts
+PRELOAD_MODULES = ('plotly.io', 'plotly.subplots', 'sklearn.ensemble', 'sklearn.preprocessing')
+
+# Frames that only show the profiler or the import machinery itself
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, linecache.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+
+def _short_path(filename):
+    """Project files relative to the repo, installed packages from the package name"""
+    path = Path(filename)
+    try:
+        return str(path.relative_to(ROOT))
+    except ValueError:
+        parts = path.parts
+        for marker in ('site-packages', f"python{sys.version_info.major}.{sys.version_info.minor}"):
+            if marker in parts:
+                return '/'.join(parts[parts.index(marker) + 1:])
+        return filename
+
+
+def preload():
+    """
+    Import what the pipeline loads lazily before tracing starts
+
+    Plotly's validator tables and scikit-learn's modules are otherwise
+    allocated inside whichever stage touches them first and crowd out the
+    data copies the profile is meant to show.
+    """
+    import plotly.express as px
+
+    # Imported only for their allocations, so nothing here uses them
+    for module in PRELOAD_MODULES:
+        importlib.import_module(module)
+    px.bar(pd.DataFrame({'x': ['a'], 'y': [1]}), x='x', y='y').to_json()
+
+
+def _arrow_bytes():
+    """Bytes held by Arrow's memory pool (Arrow-backed columns), which tracemalloc does not see"""
+    return pa.total_allocated_bytes() if pa is not None else 0
+
+
+def _frame_label(frame):
+    return f"{_short_path(frame.filename)}:{frame.lineno}"
+
+
+def _frame_source(frame):
+    return linecache.getline(frame.filename, frame.lineno).strip()
+
+
+class MemoryProfiler:
+    """
+    tracemalloc-based profiler recording memory per named stage
+
+    Parameters:
+    -----------
+    top : int
+        Allocation sites kept per stage
+    frames : int
+        Traceback depth stored per allocation
+    group_by : str
+        'lineno', 'filename' or 'traceback' (see tracemalloc.Snapshot.statistics)
+    """
+
+    def __init__(self, top=10, frames=8, group_by='lineno'):
+        self.top = top
+        self.frames = frames
+        self.group_by = group_by
+        self.stages = []
+        self._previous = None
+        self._started_here = False
+
+    def __enter__(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_here = True
+        self._previous = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+        return self
+
+    def __exit__(self, *exc):
+        self._previous = None
+        if self._started_here:
+            tracemalloc.stop()
+
+    def _sites(self, snapshot):
+        growth = snapshot.compare_to(self._previous, self.group_by)
+        sites = []
+        for stat in growth:
+            if stat.size_diff <= 0:
+                continue
+            frames = stat.traceback
+            sites.append({
+                'site': _frame_label(frames[0]),
+                'code': _frame_source(frames[0]),
+                'size_mb': round(stat.size_diff / MB, 3),
+                'blocks': stat.count_diff,
+                'traceback': [_frame_label(frame) for frame in frames] if self.group_by == 'traceback' else None,
+            })
+            if len(sites) >= self.top:
+                break
+        return sites
+
+    @contextmanager
+    def stage(self, flow, name):
+        """
+        Profile the block as one stage
+
+        Yields a dict; store the stage's result under 'output' to have its
+        estimated size recorded next to the memory it cost.
+        """
+        from modules.result_cache import estimate_nbytes
+
+        holder = {'output': None, 'error': None}
+        tracemalloc.reset_peak()
+        traced_before = tracemalloc.get_traced_memory()[0]
+        arrow_before = _arrow_bytes()
+        started = time.perf_counter()
+        with PeakMemory() as rss:
+            try:
+                yield holder
+            except Exception as exc:
+                holder['error'] = f"{type(exc).__name__}: {exc}"
+        elapsed = time.perf_counter() - started
+        traced_after, traced_peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+        output = holder['output']
+        self.stages.append({
+            'flow': flow,
+            'stage': name,
+            'seconds': round(elapsed, 4),
+            'kept_mb': round((traced_after - traced_before) / MB, 3),
+            'peak_mb': round((traced_peak - traced_before) / MB, 3),
+            'traced_mb': round(traced_after / MB, 3),
+            'arrow_kept_mb': round((_arrow_bytes() - arrow_before) / MB, 3),
+            'rss_mb': round(_rss_bytes() / MB, 3),
+            'peak_rss_delta_mb': round(rss.delta_mb, 3),
+            'output_mb': round(estimate_nbytes(output) / MB, 3) if output is not None else None,
+            'top_sites': self._sites(snapshot),
+            'error': holder['error'],
+        })
+        self._previous = snapshot
+
+
+def _call(fn, use_cache):
+    return fn if use_cache else undecorated(fn)
+
+
+def profile_app(profiler, workdir, rows, seed, use_cache):
+    """app.py: load_data -> preprocess_data -> filter_data -> anomaly detection -> figures"""
+    from modules import anomaly, preprocess, visuals
+    from modules.data_loader import load_data
+
+    csv_path = Path(workdir) / 'cybersecurity_attacks.csv'
+    make_attacks_frame(rows, seed).to_csv(csv_path, index=False)
+    held = {}
+    with profiler.stage('app', 'load') as stage:
+        held['raw'] = stage['output'] = _call(load_data, use_cache)(str(csv_path))
+    with profiler.stage('app', 'preprocess') as stage:
+        held['df'] = stage['output'] = _call(preprocess.preprocess_data, use_cache)(held['raw'])
+    with profiler.stage('app', 'filter') as stage:
+        held['filtered'] = stage['output'] = _call(preprocess.filter_data, use_cache)(held['df'], V1_FILTERS['all'])
+    with profiler.stage('app', 'anomaly') as stage:
+        held['anomalies'] = stage['output'] = anomaly.run_anomaly_detection(held['df'])
+    with profiler.stage('app', 'figures') as stage:
+        held['figures'] = _build_figures(visuals, held['filtered'], {}, use_cache)
+    return held
+
+
+def profile_app_v2(profiler, global_csv, use_cache):
+    """app_v2.py: read CSV -> map_global_schema -> add_derived_columns -> filter_data -> figures"""
+    from modules.data_adapter import map_global_schema
+    from modules_v2 import advanced_visuals, data_loader_v2
+
+    held = {}
+    with profiler.stage('app_v2', 'load') as stage:
+        held['raw'] = stage['output'] = pd.read_csv(global_csv)
+    with profiler.stage('app_v2', 'schema') as stage:
+        held['canonical'] = stage['output'] = map_global_schema(held['raw'])
+    with profiler.stage('app_v2', 'preprocess') as stage:
+        held['df'] = stage['output'] = data_loader_v2.add_derived_columns(held['canonical'])
+    with profiler.stage('app_v2', 'filter') as stage:
+        held['filtered'] = stage['output'] = _call(data_loader_v2.filter_data, use_cache)(
+            held['df'], V2_FILTERS['all'])
+    with profiler.stage('app_v2', 'figures') as stage:
+        held['figures'] = _build_figures(advanced_visuals, held['filtered'],
+                                         {'create_gauge_chart': (72,)}, use_cache)
+    return held
+
+
+def profile_app_final(profiler, global_csv, use_cache):
+    """app_final.py: load_global_data -> filter_data -> aggregates -> figures"""
+    from modules_v2 import data_loader_global, visuals_global
+
+    held = {}
+    with profiler.stage('app_final', 'load') as stage:
+        held['df'] = stage['output'] = _call(data_loader_global.load_global_data, use_cache)(str(global_csv))
+    with profiler.stage('app_final', 'filter') as stage:
+        held['filtered'] = stage['output'] = _call(data_loader_global.filter_data, use_cache)(
+            held['df'], GLOBAL_FILTERS['all'])
+    with profiler.stage('app_final', 'aggregate') as stage:
+        held['defense'] = _call(data_loader_global.get_defense_effectiveness, use_cache)(held['filtered'])
+        held['yearly'] = _call(data_loader_global.get_yearly_trends, use_cache)(held['filtered'])
+        stage['output'] = held['defense']
+    with profiler.stage('app_final', 'figures') as stage:
+        held['figures'] = _build_figures(visuals_global, held['filtered'], {
+            'create_defense_effectiveness_chart': (held['defense'],),
+            'create_defense_metrics_comparison': (held['defense'],),
+            'create_yearly_trend_chart': (held['yearly'],),
+        }, use_cache)
+    return held
+
+
+def _build_figures(module, df, special_inputs, use_cache):
+    """Build every figure of a visuals module; a failing factory is skipped"""
+    figures = []
+    for name, fn in sorted(figure_factories(module).items()):
+        try:
+            figures.append(_call(fn, use_cache)(*special_inputs.get(name, (df,))))
+        except Exception:
+            logging.getLogger(__name__).debug("Figure %s failed", name, exc_info=True)
+    return figures
+
+
+def run(rows=100_000, flows=FLOWS, top=10, frames=8, group_by='lineno', use_cache=True, seed=SEED, log=print):
+    """
+    Profile every selected dashboard flow on one dataset size
+
+    Returns:
+    --------
+    dict
+        Run metadata and a 'stages' list with one record per (flow, stage)
+    """
+    from modules.result_cache import get_result_cache
+
+    started = datetime.now(timezone.utc)
+    stages = []
+    preload()
+    with tempfile.TemporaryDirectory(prefix='darksentinel-memprof-') as workdir:
+        global_csv = None
+        if {'app_v2', 'app_final'} & set(flows):
+            log(f"Generating {rows:,}-row dataset (seed {seed})...")
+            global_csv = write_global_dataset(rows, workdir, seed)
+        for flow in flows:
+            get_result_cache().clear()
+            log(f"Profiling {flow}...")
+            with MemoryProfiler(top, frames, group_by) as profiler:
+                if flow == 'app':
+                    held = profile_app(profiler, workdir, rows, seed, use_cache)
+                elif flow == 'app_v2':
+                    held = profile_app_v2(profiler, global_csv, use_cache)
+                else:
+                    held = profile_app_final(profiler, global_csv, use_cache)
+                del held
+            stages.extend(profiler.stages)
+            for record in profiler.stages:
+                log(format_stage(record))
+    return {
+        'benchmark': 'memory_profile',
+        'created': started.isoformat(timespec='seconds'),
+        'rows': rows,
+        'seed': seed,
+        'group_by': group_by,
+        'result_cache': use_cache,
+        'stages': stages,
+    }
+
+
+def format_stage(record):
+    """Printable summary of one stage record with its top allocation sites"""
+    if record['error']:
+        return f"  {record['stage']:<12} {record['error']}"
+    output = f"{record['output_mb']:9.1f} MB out" if record['output_mb'] is not None else ' ' * 16
+    lines = [
+        f"  {record['stage']:<12} {record['seconds'] * 1000:9.1f} ms  kept {record['kept_mb']:9.1f} MB  "
+        f"peak {record['peak_mb']:9.1f} MB  arrow {record['arrow_kept_mb']:+9.1f} MB  rss {record['rss_mb']:9.1f} MB "
+        f"(+{record['peak_rss_delta_mb']:.1f} peak)  {output}"
+    ]
+    for site in record['top_sites']:
+        lines.append(f"      {site['size_mb']:9.2f} MB {site['blocks']:>9,} blocks  {site['site']}  {site['code'][:60]}")
+        for frame in (site['traceback'] or [])[1:]:
+            lines.append(f"{'':40}<- {frame}")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000, help='dataset size in rows')
+    parser.add_argument('--flows', nargs='+', choices=FLOWS, default=list(FLOWS), help='dashboards to profile')
+    parser.add_argument('--top', type=int, default=10, help='allocation sites listed per stage')
+    parser.add_argument('--frames', type=int, default=8, help='traceback depth stored per allocation')
+    parser.add_argument('--group-by', choices=('lineno', 'filename', 'traceback'), default='lineno')
+    parser.add_argument('--no-cache', dest='use_cache', action='store_false',
+                        help='call the undecorated functions (result cache bypassed)')
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--output', type=Path, default=Path('memory_profile.json'), help='results file')
+    args = parser.parse_args()
+
+    os.environ.setdefault('DARKSENTINEL_CACHE_DIR', tempfile.mkdtemp(prefix='darksentinel-bench-cache-'))
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+
+    report = run(args.rows, args.flows, args.top, args.frames, args.group_by, args.use_cache, args.seed)
+    args.output.write_text(json.dumps(report, indent=2))
+    print(f"\nWrote {len(report['stages'])} stage profiles to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
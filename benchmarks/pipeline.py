@@ -0,0 +1,403 @@
+"""
+Pipeline Benchmark
+Times every stage of the load -> preprocess -> filter -> aggregate -> render
+pipeline on fixed-seed synthetic datasets (10k, 1M and 10M rows by default)
+and records wall time and peak memory per stage to a JSON results file.
+Runs headless: no Streamlit server is started.
+
+Each stage calls the undecorated function (the result cache is bypassed and
+cleared before every call), so timings are cold-path compute costs.
+
+Usage: python -m benchmarks.pipeline [--sizes N ...] [--repeat N]
+       [--stages SUBSTRING ...] [--output results.json]
+"""
+
+import argparse
+import inspect
+import json
+import logging
+import os
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SIZES = (10_000, 1_000_000, 10_000_000)
+SEED = 42
+GLOBAL_CSV = 'Global_Cybersecurity_Threats_2015-2024_LARGE.csv'
+
+# filter_data variants and the filter sets each is timed with
+V1_FILTERS = {
+    'none': {},
+    'attack_types': {'attack_types': ['DDoS', 'Malware']},
+    'all': {
+        'years': [2021, 2022, 2023], 'months': list(range(1, 7)), 'attack_types': ['DDoS', 'Malware'],
+        'severity_levels': ['High', 'Medium'], 'devices': ['Windows', 'Linux'],
+        'protocols': ['TCP', 'UDP'], 'actions': ['Blocked', 'Logged'],
+    },
+}
+V2_FILTERS = {
+    'none': {},
+    'date_range': {'date_range': ('2018-01-01', '2021-12-31')},
+    'all': {
+        'date_range': ('2016-01-01', '2023-12-31'), 'attack_types': ['DDoS', 'Phishing', 'Ransomware'],
+        'locations': ['USA', 'China', 'India', 'UK'], 'severity_range': (3, 9),
+    },
+}
+GLOBAL_FILTERS = {
+    'none': {},
+    'countries': {'countries': ['USA', 'China', 'India']},
+    'all': {
+        'year_range': (2017, 2022), 'countries': ['USA', 'China', 'India', 'UK'],
+        'attack_types': ['DDoS', 'Phishing', 'Ransomware'], 'industries': ['Banking', 'Healthcare', 'IT'],
+        'sources': ['Hacker Group', 'Nation-state'], 'severity_categories': ['High', 'Critical'],
+    },
+}
+
+
+# ---------------------------------------------------------------------------
+# Datasets
+# ---------------------------------------------------------------------------
+
+_PROTOCOLS = ['ICMP', 'TCP', 'UDP']
+_ATTACK_TYPES = ['DDoS', 'Intrusion', 'Malware']
+_ACTIONS = ['Blocked', 'Ignored', 'Logged']
+_SEVERITIES = ['High', 'Low', 'Medium']
+_USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Safari/605.1',
+    'Mozilla/5.0 (X11; Linux x86_64; rv:121.0) Gecko/20100101 Firefox/121.0',
+    'Mozilla/5.0 (iPhone; CPU iPhone OS 17_1 like Mac OS X) AppleWebKit/605.1.15 Mobile/15E148',
+    'Mozilla/5.0 (Linux; Android 14; Pixel 8) AppleWebKit/537.36 Chrome/120.0 Mobile Safari/537.36',
+    'Opera/9.80 (Windows NT 6.1; U; en) Presto/2.12.388 Version/12.16',
+    'Mozilla/5.0 (compatible; MSIE 10.0; Windows NT 6.2; Trident/6.0)',
+    'Mozilla/5.0 (iPad; CPU OS 16_6 like Mac OS X) AppleWebKit/605.1.15 Mobile/15E148',
+]
+_CITIES = ['Jamshedpur, Sikkim', 'Bilaspur, Nagaland', 'Bokaro, Rajasthan', 'Jaunpur, Rajasthan',
+           'Anantapur, Tripura', 'Aurangabad, Gujarat', 'Bhopal, Madhya Pradesh', 'Pune, Maharashtra']
+
+
+def _pick(rng, options, rows, missing=0.0):
+    """Labels drawn uniformly; with missing > 0 that share becomes NaN"""
+    values = np.asarray(options, dtype=object)[rng.integers(0, len(options), rows)]
+    if missing:
+        values[rng.random(rows) < missing] = np.nan
+    return values
+
+
+def _ip_strings(rng, rows, pool=65_536):
+    octets = np.array([str(i) for i in range(256)], dtype=object)
+    a, b, c, d = (octets[rng.integers(1, 255, pool)] for _ in range(4))
+    return (a + '.' + b + '.' + c + '.' + d)[rng.integers(0, pool, rows)]
+
+
+def make_attacks_frame(rows, seed=SEED):
+    """Synthetic frame in the raw cybersecurity_attacks.csv schema (app.py's pipeline)"""
+    rng = np.random.default_rng(seed)
+    start = np.datetime64('2020-01-01T00:00:00', 's')
+    seconds = rng.integers(0, 4 * 365 * 86400, rows).astype('timedelta64[s]')
+    return pd.DataFrame({
+        'Timestamp': pd.to_datetime(start + seconds).astype('datetime64[ns]'),
+        'Source IP Address': _ip_strings(rng, rows),
+        'Destination IP Address': _ip_strings(rng, rows),
+        'Source Port': rng.integers(1024, 65536, rows),
+        'Destination Port': rng.integers(1024, 65536, rows),
+        'Protocol': _pick(rng, _PROTOCOLS, rows),
+        'Packet Length': rng.integers(64, 1501, rows),
+        'Packet Type': _pick(rng, ['Control', 'Data'], rows),
+        'Traffic Type': _pick(rng, ['DNS', 'FTP', 'HTTP'], rows),
+        'Malware Indicators': _pick(rng, ['IoC Detected'], rows, missing=0.5),
+        'Anomaly Scores': rng.uniform(0, 100, rows).round(2),
+        'Alerts/Warnings': _pick(rng, ['Alert Triggered'], rows, missing=0.5),
+        'Attack Type': _pick(rng, _ATTACK_TYPES, rows),
+        'Attack Signature': _pick(rng, ['Known Pattern A', 'Known Pattern B'], rows),
+        'Action Taken': _pick(rng, _ACTIONS, rows),
+        'Severity Level': _pick(rng, _SEVERITIES, rows),
+        'Device Information': _pick(rng, _USER_AGENTS, rows),
+        'Network Segment': _pick(rng, ['Segment A', 'Segment B', 'Segment C'], rows),
+        'Geo-location Data': _pick(rng, _CITIES, rows),
+        'Proxy Information': _pick(rng, ['192.168.1.1', '10.0.0.1'], rows, missing=0.5),
+        'Firewall Logs': _pick(rng, ['Log Data'], rows, missing=0.5),
+        'IDS/IPS Alerts': _pick(rng, ['Alert Data'], rows, missing=0.5),
+        'Log Source': _pick(rng, ['Firewall', 'Server'], rows),
+    })
+
+
+def write_global_dataset(rows, directory, seed=SEED):
+    """Write the global-threats CSV (generate_large_dataset's distributions) and return its path"""
+    from generate_large_dataset import generate_dataset
+
+    path = Path(directory) / GLOBAL_CSV
+    generate_dataset(rows, csv_path=str(path), seed=seed, progress=False)
+    return path
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def _rss_bytes():
+    """Current resident set size (Linux /proc), or the peak so far elsewhere"""
+    try:
+        with open('/proc/self/statm') as handle:
+            return int(handle.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        scale = 1 if sys.platform == 'darwin' else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+class PeakMemory:
+    """Samples RSS on a background thread; peak is the high-water mark above the start"""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.start = self.peak = 0
+        self._done = threading.Event()
+
+    def _sample(self):
+        while not self._done.wait(self.interval):
+            self.peak = max(self.peak, _rss_bytes())
+
+    def __enter__(self):
+        self.start = self.peak = _rss_bytes()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._done.set()
+        self._thread.join()
+        self.peak = max(self.peak, _rss_bytes())
+
+    @property
+    def delta_mb(self):
+        return (self.peak - self.start) / 2**20
+
+
+def undecorated(fn):
+    """The function underneath cached_result / cached_figure"""
+    return getattr(fn, '__wrapped__', fn)
+
+
+def measure(stage, group, rows, fn, repeat, before=None):
+    """
+    Run fn repeat times and record its wall times and peak memory
+
+    Parameters:
+    -----------
+    stage, group : str
+        Names recorded with the result
+    rows : int
+        Dataset size
+    fn : callable
+        Stage to run (no arguments)
+    repeat : int
+        Timed runs
+    before : callable, optional
+        Called before each run, outside the timing (e.g. cache clearing)
+
+    Returns:
+    --------
+    tuple
+        (record, value of the first run or None if it raised)
+    """
+    from modules.result_cache import get_result_cache
+
+    times, value, error = [], None, None
+    with PeakMemory() as memory:
+        for run in range(repeat):
+            get_result_cache().clear()
+            if before is not None:
+                before()
+            started = time.perf_counter()
+            try:
+                result = fn()
+            except Exception as exc:
+                error = f"{type(exc).__name__}: {exc}"
+                break
+            times.append(time.perf_counter() - started)
+            if run == 0:
+                value = result
+            del result
+    record = {
+        'stage': stage,
+        'group': group,
+        'rows': rows,
+        'times_s': times,
+        'best_s': min(times) if times else None,
+        'median_s': statistics.median(times) if times else None,
+        'peak_rss_mb': round(memory.delta_mb, 2),
+        'error': error,
+    }
+    return record, value
+
+
+# ---------------------------------------------------------------------------
+# Stages
+# ---------------------------------------------------------------------------
+
+def figure_factories(module):
+    """create_* functions defined in a visuals module, by name"""
+    return {
+        name: fn for name, fn in inspect.getmembers(module, inspect.isfunction)
+        if name.startswith('create_') and undecorated(fn).__module__ == module.__name__
+    }
+
+
+def run_size(rows, repeat, selected=None, seed=SEED, log=print):
+    """
+    Build the datasets for one size and time every stage on them
+
+    Returns:
+    --------
+    list of dict
+        One record per stage (see measure)
+    """
+    from modules import anomaly, preprocess, visuals
+    from modules.data_adapter import load_best_dataset, map_global_schema
+    from modules_v2 import advanced_visuals, data_loader_global, data_loader_v2, visuals_global
+
+    results = []
+
+    def stage(name, group, fn, before=None):
+        if selected and not any(part in name for part in selected):
+            return None
+        record, value = measure(name, group, rows, fn, repeat, before)
+        results.append(record)
+        status = record['error'] or f"{record['best_s'] * 1000:10.1f} ms  {record['peak_rss_mb']:8.1f} MB"
+        log(f"  {name:<58}{status}")
+        return value
+
+    with tempfile.TemporaryDirectory(prefix='darksentinel-bench-') as workdir:
+        log(f"Generating {rows:,}-row datasets (seed {seed})...")
+        global_csv = write_global_dataset(rows, workdir, seed)
+        global_raw = pd.read_csv(global_csv)
+        attacks = make_attacks_frame(rows, seed)
+
+        # Load
+        canonical = stage('load_best_dataset', 'load', lambda: load_best_dataset(workdir))
+        stage('map_global_schema', 'load', lambda raw=global_raw: map_global_schema(raw))
+        if canonical is None:
+            canonical = map_global_schema(global_raw)
+        v2_df = stage('add_derived_columns', 'load',
+                      lambda frame=canonical: data_loader_v2.add_derived_columns(frame))
+        if v2_df is None:
+            v2_df = data_loader_v2.add_derived_columns(canonical)
+        load_global = undecorated(data_loader_global.load_global_data)
+        global_df = stage('load_global_data', 'load', lambda: load_global(str(global_csv)))
+        if global_df is None:
+            global_df = load_global(str(global_csv))
+        # The stage lambdas bind their inputs as defaults, so these frames can be freed
+        del global_raw, canonical
+
+        # Preprocess
+        preprocess_data = undecorated(preprocess.preprocess_data)
+        v1_df = stage('preprocess_data', 'preprocess', lambda frame=attacks: preprocess_data(frame))
+        if v1_df is None:
+            v1_df = preprocess_data(attacks)
+        del attacks
+
+        # Filter
+        variants = (
+            ('preprocess.filter_data', preprocess.filter_data, v1_df, V1_FILTERS),
+            ('data_loader_v2.filter_data', data_loader_v2.filter_data, v2_df, V2_FILTERS),
+            ('data_loader_global.filter_data', data_loader_global.filter_data, global_df, GLOBAL_FILTERS),
+        )
+        for label, fn, df, cases in variants:
+            fn = undecorated(fn)
+            for case, filters in cases.items():
+                stage(f"{label}[{case}]", 'filter', lambda fn=fn, df=df, filters=filters: fn(df, filters))
+
+        # Aggregate
+        aggregates = (
+            ('data_loader_v2', data_loader_v2, v2_df,
+             ('get_data_summary', 'get_attack_statistics', 'get_top_threats')),
+            ('data_loader_global', data_loader_global, global_df,
+             ('get_data_summary', 'get_attack_statistics', 'get_top_threats',
+              'get_yearly_trends', 'get_defense_effectiveness')),
+        )
+        for label, module, df, names in aggregates:
+            for name in names:
+                fn = undecorated(getattr(module, name))
+                stage(f"{label}.{name}", 'aggregate', lambda fn=fn, df=df: fn(df))
+
+        # Anomaly detection
+        trained = stage('train_anomaly_detector', 'anomaly',
+                        lambda: anomaly.train_anomaly_detector(v1_df),
+                        before=anomaly.train_anomaly_detector.clear)
+        if trained is not None:
+            stage('detect_anomalies', 'anomaly', lambda: anomaly.detect_anomalies(v1_df, *trained))
+
+        # Render
+        defense_stats = undecorated(data_loader_global.get_defense_effectiveness)(global_df)
+        yearly_data = undecorated(data_loader_global.get_yearly_trends)(global_df)
+        special_inputs = {
+            'create_gauge_chart': (72,),
+            'create_defense_effectiveness_chart': (defense_stats,),
+            'create_defense_metrics_comparison': (defense_stats,),
+            'create_yearly_trend_chart': (yearly_data,),
+        }
+        for module, df in ((visuals, v1_df), (advanced_visuals, v2_df), (visuals_global, global_df)):
+            label = module.__name__.rsplit('.', 1)[-1]
+            for name, fn in sorted(figure_factories(module).items()):
+                fn = undecorated(fn)
+                args = special_inputs.get(name, (df,))
+                stage(f"{label}.{name}", 'render', lambda fn=fn, args=args: fn(*args))
+    return results
+
+
+def run(sizes=SIZES, repeat=3, selected=None, seed=SEED, log=print):
+    """
+    Benchmark the pipeline at every size
+
+    Returns:
+    --------
+    dict
+        Run metadata and a 'results' list with one record per (stage, rows)
+    """
+    started = datetime.now(timezone.utc)
+    results = []
+    for rows in sizes:
+        results.extend(run_size(rows, repeat, selected, seed, log))
+    return {
+        'benchmark': 'pipeline',
+        'created': started.isoformat(timespec='seconds'),
+        'seed': seed,
+        'sizes': list(sizes),
+        'repeat': repeat,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'results': results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES), help='dataset sizes in rows')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per stage')
+    parser.add_argument('--stages', nargs='+', help='only stages whose name contains one of these')
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--output', type=Path, default=Path('pipeline_benchmark.json'), help='results file')
+    args = parser.parse_args()
+
+    # Headless: keep the result cache away from the user's and silence the
+    # "no script run context" warnings Streamlit logs outside a server
+    os.environ.setdefault('DARKSENTINEL_CACHE_DIR', tempfile.mkdtemp(prefix='darksentinel-bench-cache-'))
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+
+    report = run(args.sizes, args.repeat, args.stages, args.seed)
+    args.output.write_text(json.dumps(report, indent=2))
+    print(f"\nWrote {len(report['results'])} results to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,354 @@
+"""
+Benchmark Result Store
+Keeps pipeline benchmark runs (see benchmarks.pipeline) together with the
+machine they ran on, and compares any run to a saved baseline: every
+(stage, rows) pair is reported as faster, slower or unchanged, where a change
+only counts when it exceeds both a minimum threshold and the spread measured
+between the repeated runs.
+
+Usage:
+    python -m benchmarks.results run [--name NAME] [--sizes N ...] [--repeat N] [--stages S ...]
+    python -m benchmarks.results save pipeline_benchmark.json [--name NAME]
+    python -m benchmarks.results list
+    python -m benchmarks.results baseline NAME
+    python -m benchmarks.results compare [NAME] [--baseline NAME] [--threshold 0.05] [--fail-on-regression]
+
+The store lives in ./.benchmarks (override with DARKSENTINEL_BENCH_STORE or --store).
+"""
+
+import argparse
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+STORE_ENV = 'DARKSENTINEL_BENCH_STORE'
+DEFAULT_STORE = Path('.benchmarks')
+DEFAULT_THRESHOLD = 0.05      # smallest relative change reported as faster/slower
+DEFAULT_MIN_DELTA_MS = 1.0    # changes below this are timer noise whatever the ratio
+_PACKAGES = ('numpy', 'pandas', 'sklearn', 'plotly', 'streamlit', 'pyarrow')
+
+
+# ---------------------------------------------------------------------------
+# Machine metadata
+# ---------------------------------------------------------------------------
+
+def _memory_total_mb():
+    try:
+        return round(os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') / 2**20)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def _cpu_model():
+    try:
+        with open('/proc/cpuinfo') as handle:
+            for line in handle:
+                if line.startswith('model name'):
+                    return line.split(':', 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def _git(*args):
+    try:
+        return subprocess.run(['git', *args], capture_output=True, text=True, timeout=10,
+                              cwd=Path(__file__).parent.parent).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def machine_metadata():
+    """Host, CPU, memory, interpreter, package versions and git revision of this run"""
+    versions = {}
+    for name in _PACKAGES:
+        try:
+            versions[name] = __import__(name).__version__
+        except Exception:
+            versions[name] = None
+    status = _git('status', '--porcelain', '--untracked-files=no')
+    return {
+        'hostname': socket.gethostname(),
+        'platform': platform.platform(),
+        'cpu': _cpu_model(),
+        'cpu_count': os.cpu_count(),
+        'memory_mb': _memory_total_mb(),
+        'python': platform.python_version(),
+        'packages': versions,
+        'git_commit': _git('rev-parse', '--short', 'HEAD'),
+        'git_dirty': bool(status) if status is not None else None,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+class ResultStore:
+    """
+    Directory of benchmark runs: runs/<name>.json plus a baseline pointer
+
+    Parameters:
+    -----------
+    root : str or Path, optional
+        Store directory (default: DARKSENTINEL_BENCH_STORE or ./.benchmarks)
+    """
+
+    def __init__(self, root=None):
+        self.root = Path(root or os.environ.get(STORE_ENV) or DEFAULT_STORE)
+        self.runs = self.root / 'runs'
+
+    def _path(self, name):
+        return self.runs / f"{name}.json"
+
+    def save(self, report, name=None):
+        """Store a pipeline report with machine metadata; returns the run name"""
+        report = dict(report)
+        report.setdefault('machine', machine_metadata())
+        if name is None:
+            stamp = datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S')
+            commit = report['machine'].get('git_commit')
+            name = f"{stamp}-{commit}" if commit else stamp
+        report['name'] = name
+        self.runs.mkdir(parents=True, exist_ok=True)
+        self._path(name).write_text(json.dumps(report, indent=2))
+        return name
+
+    def load(self, name):
+        path = self._path(name)
+        if not path.exists():
+            raise FileNotFoundError(f"No stored run named {name!r} in {self.runs}")
+        return json.loads(path.read_text())
+
+    def names(self):
+        """Stored run names, oldest first"""
+        if not self.runs.exists():
+            return []
+        return [p.stem for p in sorted(self.runs.glob('*.json'), key=lambda p: p.stat().st_mtime)]
+
+    def latest(self):
+        names = self.names()
+        return names[-1] if names else None
+
+    @property
+    def baseline(self):
+        pointer = self.root / 'baseline'
+        return pointer.read_text().strip() if pointer.exists() else None
+
+    @baseline.setter
+    def baseline(self, name):
+        self.load(name)
+        self.root.mkdir(parents=True, exist_ok=True)
+        (self.root / 'baseline').write_text(name + '\n')
+
+
+# ---------------------------------------------------------------------------
+# Comparison
+# ---------------------------------------------------------------------------
+
+def relative_spread(times):
+    """(max - min) / median of repeated timings; 0 for a single sample"""
+    if len(times) < 2:
+        return 0.0
+    median = statistics.median(times)
+    return (max(times) - min(times)) / median if median else 0.0
+
+
+def compare_results(baseline, current, threshold=DEFAULT_THRESHOLD, min_delta_ms=DEFAULT_MIN_DELTA_MS):
+    """
+    Compare two runs stage by stage
+
+    A stage is 'slower' when its median time grew by more than the noise
+    limit, 'faster' when it shrank by more, '~' otherwise. The noise limit is
+    the larger of threshold and the relative spread of either run's repeats,
+    and differences under min_delta_ms never count.
+
+    Parameters:
+    -----------
+    baseline, current : dict
+        Pipeline reports (their 'results' lists)
+    threshold : float
+        Smallest relative change that counts
+    min_delta_ms : float
+        Smallest absolute change that counts
+
+    Returns:
+    --------
+    list of dict
+        One row per (stage, rows) in either run, with base_ms, current_ms,
+        speedup (base / current), change (relative), noise and verdict
+    """
+    def index(report):
+        return {(r['stage'], r['rows']): r for r in report['results']}
+
+    base, cur = index(baseline), index(current)
+    rows = []
+    for key in sorted(set(base) | set(cur), key=lambda k: (k[1], k[0])):
+        b, c = base.get(key), cur.get(key)
+        row = {'stage': key[0], 'rows': key[1], 'base_ms': None, 'current_ms': None,
+               'speedup': None, 'change': None, 'noise': None}
+        if c is None:
+            row['verdict'] = 'missing'
+        elif b is None or not b.get('times_s'):
+            row['verdict'] = 'new' if c.get('times_s') else 'error'
+        elif not c.get('times_s'):
+            row['verdict'] = 'error'
+        else:
+            base_s, cur_s = statistics.median(b['times_s']), statistics.median(c['times_s'])
+            noise = max(threshold, relative_spread(b['times_s']), relative_spread(c['times_s']))
+            change = (cur_s - base_s) / base_s if base_s else 0.0
+            if abs(cur_s - base_s) * 1000 < min_delta_ms:
+                verdict = '~'
+            elif cur_s > base_s * (1 + noise):
+                verdict = 'slower'
+            elif cur_s * (1 + noise) < base_s:
+                verdict = 'faster'
+            else:
+                verdict = '~'
+            row.update(base_ms=base_s * 1000, current_ms=cur_s * 1000,
+                       speedup=base_s / cur_s if cur_s else None, change=change, noise=noise,
+                       verdict=verdict)
+        if b is not None and c is not None:
+            row['base_peak_mb'], row['current_peak_mb'] = b.get('peak_rss_mb'), c.get('peak_rss_mb')
+        rows.append(row)
+    return rows
+
+
+def machine_differences(baseline, current):
+    """Metadata fields that differ between the machines of two runs"""
+    a, b = baseline.get('machine', {}), current.get('machine', {})
+    fields = ('hostname', 'cpu', 'cpu_count', 'memory_mb', 'python')
+    differences = [f for f in fields if a.get(f) != b.get(f)]
+    packages = a.get('packages', {}), b.get('packages', {})
+    differences += [f"{name} {packages[0].get(name)} -> {packages[1].get(name)}"
+                    for name in _PACKAGES if packages[0].get(name) != packages[1].get(name)]
+    return differences
+
+
+def format_report(rows, baseline_name, current_name, show_missing=False):
+    """
+    Per-function speedup/slowdown table, largest regressions first
+
+    Stages the current run did not measure (e.g. a run limited with
+    --stages) are only counted in the summary line unless show_missing.
+    """
+    order = {'slower': 0, 'error': 1, 'missing': 2, 'faster': 3, 'new': 4, '~': 5}
+    missing = sum(r['verdict'] == 'missing' for r in rows)
+    if not show_missing:
+        rows = [r for r in rows if r['verdict'] != 'missing']
+    rows = sorted(rows, key=lambda r: (order[r['verdict']], -abs(r['change'] or 0), r['rows'], r['stage']))
+
+    def ms(value):
+        return f"{value:,.1f}" if value is not None else '-'
+
+    lines = [
+        f"Baseline: {baseline_name}    Current: {current_name}",
+        f"{'stage':<54}{'rows':>12}{'base ms':>12}{'now ms':>12}{'speedup':>9}{'change':>9}{'noise':>7}  verdict",
+    ]
+    for r in rows:
+        speedup = f"{r['speedup']:.2f}x" if r['speedup'] else '-'
+        change = f"{r['change']:+.1%}" if r['change'] is not None else '-'
+        noise = f"{r['noise']:.0%}" if r['noise'] is not None else '-'
+        lines.append(f"{r['stage']:<54}{r['rows']:>12,}{ms(r['base_ms']):>12}{ms(r['current_ms']):>12}"
+                     f"{speedup:>9}{change:>9}{noise:>7}  {r['verdict']}")
+    counts = {v: sum(r['verdict'] == v for r in rows) for v in ('slower', 'faster', '~', 'error', 'new')}
+    counts['not in current run'] = missing
+    lines.append(', '.join(f"{n} {v}" for v, n in counts.items() if n))
+    return '\n'.join(lines)
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--store', type=Path, help=f'store directory (default ${STORE_ENV} or {DEFAULT_STORE})')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_cmd = commands.add_parser('run', help='run the pipeline benchmark and store the result')
+    run_cmd.add_argument('--name')
+    run_cmd.add_argument('--sizes', type=int, nargs='+')
+    run_cmd.add_argument('--repeat', type=int, default=5)
+    run_cmd.add_argument('--stages', nargs='+')
+    run_cmd.add_argument('--baseline', action='store_true', help='also make this run the baseline')
+
+    save_cmd = commands.add_parser('save', help='store a results file written by benchmarks.pipeline')
+    save_cmd.add_argument('file', type=Path)
+    save_cmd.add_argument('--name')
+    save_cmd.add_argument('--baseline', action='store_true', help='also make this run the baseline')
+
+    commands.add_parser('list', help='list stored runs')
+
+    baseline_cmd = commands.add_parser('baseline', help='set (or show) the baseline run')
+    baseline_cmd.add_argument('name', nargs='?')
+
+    compare_cmd = commands.add_parser('compare', help='compare a run (default: latest) to the baseline')
+    compare_cmd.add_argument('name', nargs='?')
+    compare_cmd.add_argument('--baseline', dest='baseline_name')
+    compare_cmd.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                             help=f'smallest relative change that counts (default {DEFAULT_THRESHOLD})')
+    compare_cmd.add_argument('--min-delta-ms', type=float, default=DEFAULT_MIN_DELTA_MS)
+    compare_cmd.add_argument('--show-missing', action='store_true',
+                             help='also list baseline stages the run did not measure')
+    compare_cmd.add_argument('--fail-on-regression', action='store_true', help='exit 1 if any stage is slower')
+
+    args = parser.parse_args(argv)
+    store = ResultStore(args.store)
+
+    if args.command in ('run', 'save'):
+        if args.command == 'run':
+            import logging
+            import tempfile
+            from benchmarks import pipeline
+
+            os.environ.setdefault('DARKSENTINEL_CACHE_DIR', tempfile.mkdtemp(prefix='darksentinel-bench-cache-'))
+            logging.getLogger('streamlit').setLevel(logging.ERROR)
+            report = pipeline.run(args.sizes or pipeline.SIZES, args.repeat, args.stages)
+        else:
+            report = json.loads(args.file.read_text())
+        name = store.save(report, args.name)
+        if args.baseline:
+            store.baseline = name
+        print(f"Stored run {name}" + (' (baseline)' if args.baseline else ''))
+        return 0
+
+    if args.command == 'list':
+        baseline = store.baseline
+        for name in store.names():
+            report = store.load(name)
+            machine = report.get('machine', {})
+            marker = '*' if name == baseline else ' '
+            print(f"{marker} {name:<32}{report.get('created', ''):<28}{machine.get('hostname', ''):<20}"
+                  f"{len(report.get('results', [])):>5} results")
+        return 0
+
+    if args.command == 'baseline':
+        if args.name:
+            store.baseline = args.name
+        print(store.baseline or 'No baseline set')
+        return 0
+
+    baseline_name = args.baseline_name or store.baseline
+    current_name = args.name or store.latest()
+    if baseline_name is None or current_name is None:
+        parser.error('need a baseline (python -m benchmarks.results baseline NAME) and a stored run')
+    baseline, current = store.load(baseline_name), store.load(current_name)
+    differences = machine_differences(baseline, current)
+    if differences:
+        print(f"Note: runs are from different environments ({'; '.join(differences)})\n")
+    rows = compare_results(baseline, current, args.threshold, args.min_delta_ms)
+    print(format_report(rows, baseline_name, current_name, args.show_missing))
+    if args.fail_on_regression and any(r['verdict'] == 'slower' for r in rows):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
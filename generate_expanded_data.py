@@ -3,6 +3,7 @@ Data Generator for Cyber Attack Dataset
 Generates realistic cybersecurity attack data with proper variation
 """
 
+import argparse
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -87,6 +88,55 @@ ACTION_TAKEN = [
     'Monitored', 'Contained', 'Restored'
 ]
 
+# Attack severity (1-10) ranges per attack type (others: 3-8)
+SEVERITY_RANGES = {
+    'Ransomware': (7, 10),
+    'Zero-Day Exploit': (8, 10),
+    'APT': (8, 10),
+    'Supply Chain Attack': (7, 10),
+    'Rootkit': (7, 9),
+    'SQL Injection': (6, 9),
+    'Malware': (5, 9),
+    'Worm': (5, 8),
+    'Backdoor': (6, 9),
+    'DDoS': (4, 8),
+    'Trojan': (5, 8),
+    'IoT Attack': (4, 7),
+    'Cryptojacking': (3, 6),
+    'Phishing': (3, 7),
+    'Business Email Compromise': (5, 8),
+    'Credential Stuffing': (4, 7),
+    'Brute Force': (3, 6),
+    'Spyware': (4, 7)
+}
+
+# Affected-user multiplier per target industry (others: 7)
+INDUSTRY_USER_MULTIPLIER = {
+    'Finance': 10,
+    'Healthcare': 8,
+    'Government': 15,
+    'Retail': 20,
+    'Education': 12,
+    'Technology': 5
+}
+
+# Skew and burst defaults for the vectorized generator
+ATTACKER_POOL_SIZE = 50000   # distinct attacker IPs
+TARGET_POOL_SIZE = 5000      # distinct target IPs
+ZIPF_EXPONENT = 1.1          # rank-frequency exponent (s > 0; larger = heavier head)
+
+# Relative attack intensity by hour of day (UTC) and by weekday (Mon-Sun)
+HOURLY_PROFILE = [
+    0.35, 0.30, 0.28, 0.27, 0.28, 0.32, 0.45, 0.65, 0.85, 1.00, 1.05, 1.05,
+    1.00, 1.00, 1.05, 1.05, 1.00, 0.90, 0.75, 0.65, 0.58, 0.52, 0.45, 0.40
+]
+WEEKDAY_PROFILE = [1.00, 1.05, 1.05, 1.00, 0.95, 0.60, 0.50]
+
+CAMPAIGN_SIZE = (50, 500)          # events per injected campaign
+CAMPAIGN_SPAN_HOURS = (0.5, 48)    # how long a campaign lasts
+CAMPAIGN_ATTACKERS = (1, 8)        # attacker IPs a campaign rotates through
+CAMPAIGN_TARGETS = (1, 4)          # target IPs a campaign hits
+
 def generate_timestamp():
     """Generate random timestamp between start and end dates with better distribution"""
     # Don't use fixed seed for timestamps to get better distribution across years
@@ -112,27 +162,7 @@ def generate_attack_record():
     target_system = random.choice(TARGET_SYSTEMS)
     
     # Attack severity (1-10) - some attack types are more severe
-    severity_weights = {
-        'Ransomware': (7, 10),
-        'Zero-Day Exploit': (8, 10),
-        'APT': (8, 10),
-        'Supply Chain Attack': (7, 10),
-        'Rootkit': (7, 9),
-        'SQL Injection': (6, 9),
-        'Malware': (5, 9),
-        'Worm': (5, 8),
-        'Backdoor': (6, 9),
-        'DDoS': (4, 8),
-        'Trojan': (5, 8),
-        'IoT Attack': (4, 7),
-        'Cryptojacking': (3, 6),
-        'Phishing': (3, 7),
-        'Business Email Compromise': (5, 8),
-        'Credential Stuffing': (4, 7),
-        'Brute Force': (3, 6),
-        'Spyware': (4, 7)
-    }
-    severity_range = severity_weights.get(attack_type, (3, 8))
+    severity_range = SEVERITY_RANGES.get(attack_type, (3, 8))
     attack_severity = random.randint(*severity_range)
     
     # Financial loss - correlated with severity
@@ -140,15 +170,7 @@ def generate_attack_record():
     financial_loss = base_loss * (attack_severity / 5) * random.uniform(0.5, 2.0)
     
     # Number of affected users - correlated with target industry
-    industry_user_multiplier = {
-        'Finance': 10,
-        'Healthcare': 8,
-        'Government': 15,
-        'Retail': 20,
-        'Education': 12,
-        'Technology': 5
-    }
-    multiplier = industry_user_multiplier.get(target_industry, 7)
+    multiplier = INDUSTRY_USER_MULTIPLIER.get(target_industry, 7)
     affected_users = int(random.randint(10, 500) * multiplier * random.uniform(0.5, 1.5))
     
     # Attack source
@@ -241,26 +263,280 @@ def generate_dataset(num_records):
     # Sort by timestamp
     df = df.sort_values('timestamp').reset_index(drop=True)
     
+    print_generation_summary(df)
+    
+    return df
+
+def print_generation_summary(df):
+    """Print the record count, date range and category counts of a generated dataset"""
     print(f"\nDataset generated successfully!")
     print(f"Total records: {len(df)}")
     print(f"Date range: {df['timestamp'].min()} to {df['timestamp'].max()}")
     print(f"Countries: {df['location'].nunique()}")
     print(f"Attack types: {df['attack_type'].nunique()}")
-    
+
+# ---------------------------------------------------------------------------
+# Vectorized generator: whole columns per NumPy call, with optional skew
+# (Zipf-distributed attacker/target IPs), diurnal/weekly seasonality and
+# injected attack campaigns. Column distributions mirror generate_attack_record.
+# ---------------------------------------------------------------------------
+
+# Data loss (GB) per attack-type group: (types, low, high, severity divisor or None)
+DATA_LOSS_RULES = [
+    (['Ransomware', 'SQL Injection', 'Supply Chain Attack', 'APT'], 1, 100, 3),
+    (['Business Email Compromise', 'Credential Stuffing'], 0.5, 20, 4),
+    (['DDoS', 'Brute Force', 'Cryptojacking'], 0.1, 5, None),
+    (['Backdoor', 'Rootkit', 'Trojan', 'Spyware'], 5, 80, 4),
+]
+DATA_LOSS_DEFAULT = (0.5, 50, 5)
+
+# Attack duration (minutes) per attack-type group: (types, low, high)
+DURATION_RULES = [
+    (['DDoS', 'Ransomware', 'Worm'], 30, 180),
+    (['APT', 'Supply Chain Attack', 'Rootkit'], 60, 240),
+    (['Cryptojacking', 'IoT Attack'], 120, 300),
+    (['Phishing', 'Business Email Compromise'], 5, 30),
+]
+DURATION_DEFAULT = (10, 90)
+
+_OCTETS = np.array([str(i) for i in range(256)], dtype=object)
+
+def _per_type(rules, default):
+    """Expand (types, *params) rules into one parameter row per ATTACK_TYPES entry"""
+    table = []
+    for attack_type in ATTACK_TYPES:
+        params = next((rule[1:] for rule in rules if attack_type in rule[0]), default)
+        table.append([np.nan if p is None else p for p in params])
+    return np.array(table, dtype='float64')
+
+def _draw_ranks(rng, n, pool_size, zipf_exponent):
+    """Pool indices, Zipf-distributed by rank (rank 0 most frequent) or uniform"""
+    if zipf_exponent is None:
+        return rng.integers(0, pool_size, size=n)
+    weights = 1.0 / np.arange(1, pool_size + 1) ** zipf_exponent
+    return rng.choice(pool_size, size=n, p=weights / weights.sum())
+
+def _ip_pool(rng, size, prefix=None):
+    """Distinct dotted-quad IPs; with prefix, inside prefix.0.0.0/8"""
+    if prefix is None:
+        # Public unicast space 1.0.0.0 - 223.255.255.255
+        values = rng.integers(1 << 24, 224 << 24, size=size * 2, dtype=np.int64)
+    else:
+        values = (prefix << 24) | rng.integers(1, 1 << 24, size=size * 2, dtype=np.int64)
+    _, first = np.unique(values, return_index=True)
+    values = values[np.sort(first)][:size]
+    octets = [_OCTETS[(values >> shift) & 0xFF] for shift in (24, 16, 8, 0)]
+    return octets[0] + '.' + octets[1] + '.' + octets[2] + '.' + octets[3]
+
+def _draw_seconds(rng, n, seasonality):
+    """Seconds after START_DATE, uniform or shaped by HOURLY_PROFILE / WEEKDAY_PROFILE"""
+    days = (END_DATE - START_DATE).days
+    if not seasonality:
+        return rng.integers(0, days * 86400 + 1, size=n)
+    day_weights = np.array([WEEKDAY_PROFILE[(START_DATE.weekday() + d) % 7] for d in range(days)])
+    hour_weights = np.asarray(HOURLY_PROFILE, dtype='float64')
+    day = rng.choice(days, size=n, p=day_weights / day_weights.sum())
+    hour = rng.choice(24, size=n, p=hour_weights / hour_weights.sum())
+    return day * 86400 + hour * 3600 + rng.integers(0, 3600, size=n)
+
+def _campaign_sizes(rng, num_records, campaign_share):
+    """Sizes of the injected campaigns, covering about campaign_share of the records"""
+    budget = int(round(num_records * campaign_share))
+    sizes = []
+    while budget > 0:
+        size = min(int(rng.integers(CAMPAIGN_SIZE[0], CAMPAIGN_SIZE[1] + 1)), budget)
+        sizes.append(size)
+        budget -= size
+    return np.array(sizes, dtype=np.int64)
+
+def generate_dataset_vectorized(num_records, seed=42, zipf_exponent=None, seasonality=False,
+                                campaign_share=0.0, attacker_pool=ATTACKER_POOL_SIZE,
+                                target_pool=TARGET_POOL_SIZE):
+    """
+    Generate the dataset with vectorized NumPy draws, optionally with production-like skew
+
+    Parameters:
+    -----------
+    num_records : int
+        Number of records
+    seed : int
+        Seed of the NumPy generator (the output depends only on the arguments)
+    zipf_exponent : float, optional
+        Draw attacker and target IPs from their pools with Zipf rank weights
+        1/rank**s, so a few IPs dominate (heavy hitters); uniform when None
+    seasonality : bool
+        Shape timestamps by hour of day and weekday instead of uniformly
+    campaign_share : float
+        Fraction of records that belong to injected campaigns: bursts of
+        CAMPAIGN_SIZE related events (same attack type, origin, source and
+        industry, a few attacker IPs against a few targets) within
+        CAMPAIGN_SPAN_HOURS. Adds a campaign_id column (-1 = background).
+    attacker_pool, target_pool : int
+        Number of distinct attacker / target IPs
+
+    Returns:
+    --------
+    pd.DataFrame
+        The generate_attack_record columns plus attacker_ip and target_ip,
+        sorted by timestamp
+    """
+    rng = np.random.default_rng(seed)
+    n = num_records
+
+    # Categories as codes into the option lists
+    major = np.array([MAJOR_COUNTRIES.get(c, 0.5) for c in COUNTRIES])
+    country_p = 0.7 * major / major.sum() + 0.3 / len(COUNTRIES)
+    country = rng.choice(len(COUNTRIES), size=n, p=country_p / country_p.sum())
+    attack_type = rng.integers(0, len(ATTACK_TYPES), size=n)
+    industry = rng.integers(0, len(TARGET_INDUSTRIES), size=n)
+    system = rng.integers(0, len(TARGET_SYSTEMS), size=n)
+    source = rng.integers(0, len(ATTACK_SOURCES), size=n)
+    seconds = _draw_seconds(rng, n, seasonality)
+    attacker = _draw_ranks(rng, n, attacker_pool, zipf_exponent)
+    target = _draw_ranks(rng, n, target_pool, zipf_exponent)
+
+    # Injected campaigns overwrite the leading rows (rows are sorted by time later)
+    campaign_id = None
+    if campaign_share > 0:
+        sizes = _campaign_sizes(rng, n, campaign_share)
+        k = len(sizes)
+        rows = int(sizes.sum())
+        member = np.repeat(np.arange(k), sizes)
+        campaign_id = np.full(n, -1, dtype=np.int64)
+        campaign_id[:rows] = member
+
+        start = _draw_seconds(rng, k, seasonality)
+        span = rng.uniform(CAMPAIGN_SPAN_HOURS[0], CAMPAIGN_SPAN_HOURS[1], size=k) * 3600
+        last = (END_DATE - START_DATE).days * 86400
+        seconds[:rows] = np.minimum(start[member] + (rng.random(rows) * span[member]).astype(np.int64), last)
+        country[:rows] = rng.choice(len(COUNTRIES), size=k, p=country_p / country_p.sum())[member]
+        attack_type[:rows] = rng.integers(0, len(ATTACK_TYPES), size=k)[member]
+        industry[:rows] = rng.integers(0, len(TARGET_INDUSTRIES), size=k)[member]
+        source[:rows] = rng.integers(0, len(ATTACK_SOURCES), size=k)[member]
+        # Each campaign rotates through a small block of attacker IPs against a few targets
+        attackers = rng.integers(CAMPAIGN_ATTACKERS[0], CAMPAIGN_ATTACKERS[1] + 1, size=k)
+        targets = rng.integers(CAMPAIGN_TARGETS[0], CAMPAIGN_TARGETS[1] + 1, size=k)
+        attacker_base = rng.integers(0, attacker_pool, size=k)
+        target_base = rng.integers(0, target_pool, size=k)
+        attacker[:rows] = (attacker_base[member] + rng.integers(0, attackers[member])) % attacker_pool
+        target[:rows] = (target_base[member] + rng.integers(0, targets[member])) % target_pool
+
+    # Attack severity (1-10) - some attack types are more severe
+    severity_range = np.array([SEVERITY_RANGES.get(t, (3, 8)) for t in ATTACK_TYPES])
+    severity = rng.integers(severity_range[attack_type, 0], severity_range[attack_type, 1] + 1)
+
+    # Financial loss - correlated with severity
+    financial_loss = rng.uniform(1000, 50000, size=n) * (severity / 5) * rng.uniform(0.5, 2.0, size=n)
+
+    # Number of affected users - correlated with target industry
+    multiplier = np.array([INDUSTRY_USER_MULTIPLIER.get(i, 7) for i in TARGET_INDUSTRIES])[industry]
+    affected_users = (rng.integers(10, 501, size=n) * multiplier * rng.uniform(0.5, 1.5, size=n)).astype(np.int64)
+
+    vulnerability = rng.integers(0, len(SECURITY_VULNERABILITIES), size=n)
+    defense = rng.integers(0, len(DEFENSE_MECHANISMS), size=n)
+    action = rng.integers(0, len(ACTION_TAKEN), size=n)
+
+    # Incident resolution time (hours) - inversely correlated with severity
+    base_resolution = rng.uniform(2, 72, size=n)
+    factor = np.select(
+        [severity >= 8, severity >= 5],
+        [rng.uniform(0.3, 0.7, size=n), rng.uniform(0.6, 1.2, size=n)],
+        rng.uniform(1.0, 1.8, size=n),
+    )
+    resolution_time = base_resolution * factor
+
+    # Data compromised (GB) - correlated with severity and attack type
+    loss_params = _per_type(DATA_LOSS_RULES, DATA_LOSS_DEFAULT)[attack_type]
+    divisor = loss_params[:, 2]
+    data_loss = rng.uniform(loss_params[:, 0], loss_params[:, 1]) * \
+        np.where(np.isnan(divisor), 1.0, severity / np.nan_to_num(divisor, nan=1.0))
+
+    # Attack duration (minutes) - some attacks are longer
+    duration_params = _per_type(DURATION_RULES, DURATION_DEFAULT)[attack_type]
+    attack_duration = rng.uniform(duration_params[:, 0], duration_params[:, 1])
+
+    # Outcome based on action taken
+    outcome_of_action = np.array([
+        'Mitigated' if a in ['Blocked', 'Quarantined', 'Contained']
+        else 'Detected' if a in ['Logged', 'Monitored'] else 'Resolved'
+        for a in ACTION_TAKEN
+    ], dtype=object)
+    origin_of_source = np.array(
+        ['External' if 'Insider' not in s else 'Internal' for s in ATTACK_SOURCES], dtype=object)
+
+    timestamp = pd.DatetimeIndex(np.datetime64(START_DATE, 's') + seconds.astype('timedelta64[s]')).astype('datetime64[ns]')
+
+    def labels(options, codes):
+        return pd.Categorical.from_codes(codes, categories=options)
+
+    df = pd.DataFrame({
+        'timestamp': timestamp,
+        'year': timestamp.year.astype(np.int64),
+        'location': labels(COUNTRIES, country),
+        'attack_type': labels(ATTACK_TYPES, attack_type),
+        'target_industry': labels(TARGET_INDUSTRIES, industry),
+        'target_system': labels(TARGET_SYSTEMS, system),
+        'attack_severity': severity,
+        'attack_duration_min': np.round(attack_duration, 2),
+        'data_compromised_GB': np.round(data_loss, 2),
+        'financial_impact_USD': np.round(financial_loss, 2),
+        'response_time_min': np.round(resolution_time * 60, 2),
+        'mitigation_method': labels(DEFENSE_MECHANISMS, defense),
+        'outcome': outcome_of_action[action],
+        'attack_vector': labels(SECURITY_VULNERABILITIES, vulnerability),
+        'attacker_origin': origin_of_source[source],
+        'affected_users': affected_users,
+        'attacker_ip': _ip_pool(rng, attacker_pool)[attacker],
+        'target_ip': _ip_pool(rng, target_pool, prefix=10)[target],
+    })
+    if campaign_id is not None:
+        df['campaign_id'] = campaign_id
+
+    # Sort by timestamp
+    df = df.take(np.argsort(seconds, kind='stable')).reset_index(drop=True)
+
+    print_generation_summary(df)
+
     return df
 
+def save_dataset(df, output_file):
+    """Write the dataset as Parquet (.parquet) or CSV"""
+    if str(output_file).endswith('.parquet'):
+        df.to_parquet(output_file, index=False)
+    else:
+        df.to_csv(output_file, index=False)
+
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description="Cyber Attack Data Generator")
+    parser.add_argument('--records', type=int, default=NUM_RECORDS, help=f'records to generate (default {NUM_RECORDS:,})')
+    parser.add_argument('--output', default='expanded_cyber_attacks.csv', help='output file (.csv or .parquet)')
+    parser.add_argument('--vectorized', action='store_true',
+                        help='generate whole columns with NumPy (implied by the skew options)')
+    parser.add_argument('--zipf', type=float, nargs='?', const=ZIPF_EXPONENT, metavar='S',
+                        help=f'Zipf-distributed attacker/target IPs (exponent, default {ZIPF_EXPONENT})')
+    parser.add_argument('--seasonality', action='store_true', help='diurnal and weekly timestamp seasonality')
+    parser.add_argument('--campaigns', type=float, nargs='?', const=0.05, default=0.0, metavar='SHARE',
+                        help='share of records in injected attack campaigns (default 0.05)')
+    parser.add_argument('--seed', type=int, default=42, help='seed of the vectorized generator')
+    args = parser.parse_args()
+
     print("=" * 60)
     print("Cyber Attack Data Generator")
     print("=" * 60)
     
     # Generate dataset
-    df = generate_dataset(NUM_RECORDS)
+    if args.vectorized or args.zipf is not None or args.seasonality or args.campaigns:
+        df = generate_dataset_vectorized(
+            args.records, seed=args.seed, zipf_exponent=args.zipf,
+            seasonality=args.seasonality, campaign_share=args.campaigns,
+        )
+    else:
+        df = generate_dataset(args.records)
     
     # Save to CSV
-    output_file = 'expanded_cyber_attacks.csv'
-    df.to_csv(output_file, index=False)
+    output_file = args.output
+    save_dataset(df, output_file)
     print(f"\nDataset saved to: {output_file}")
     
     # Display sample
@@ -281,6 +557,11 @@ def main():
     print(f"\nTop 10 Countries: {df['location'].value_counts().head(10).to_dict()}")
     print(f"\nTop 5 Attack Types: {df['attack_type'].value_counts().head().to_dict()}")
     print(f"\nTop 5 Industries: {df['target_industry'].value_counts().head().to_dict()}")
+    if 'attacker_ip' in df.columns:
+        top_attackers = df['attacker_ip'].value_counts().head()
+        print(f"\nTop 5 Attacker IPs ({top_attackers.sum() / len(df):.1%} of attacks): {top_attackers.to_dict()}")
+    if 'campaign_id' in df.columns:
+        print(f"\nCampaigns: {df['campaign_id'].max() + 1} ({(df['campaign_id'] >= 0).mean():.1%} of attacks)")
     
     print("\n" + "=" * 60)
     print("✅ Data generation complete!")
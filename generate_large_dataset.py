@@ -1,16 +1,33 @@
 """
 Generate Large Cybersecurity Threats Dataset (50,000+ records)
 Maintains same structure as original but with more realistic volume
+
+Every column is drawn with vectorized NumPy calls, chunk by chunk. Chunks are
+generated in parallel worker processes, each with its own SeedSequence stream,
+and written in order to CSV and/or Parquet, so the output only depends on the
+seed and chunk size (not on the number of workers) and memory stays bounded
+by a few chunks even for 100M rows.
+
+Usage:
+    python generate_large_dataset.py                      # 50,000 rows -> LARGE.csv
+    python generate_large_dataset.py --rows 100000000 --parquet threats_100m.parquet
 """
 
-import pandas as pd
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
-from datetime import datetime, timedelta
-import random
+import pandas as pd
 
-# Set seed for reproducibility
-np.random.seed(42)
-random.seed(42)
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
 
 # Define all possible values (same as original)
 COUNTRIES = ['Australia', 'Brazil', 'China', 'France', 'Germany', 'India', 'Japan', 'Russia', 'UK', 'USA']
@@ -25,134 +42,279 @@ VULNERABILITIES = ['Social Engineering', 'Unpatched Software', 'Weak Passwords',
 
 DEFENSE_MECHANISMS = ['AI-based Detection', 'Antivirus', 'Encryption', 'Firewall', 'VPN']
 
-# Generate 50,000 records
+# Category weights
+COUNTRY_WEIGHTS = [0.08, 0.10, 0.12, 0.09, 0.10, 0.11, 0.09, 0.07, 0.11, 0.13]
+ATTACK_WEIGHTS = [0.20, 0.15, 0.10, 0.25, 0.18, 0.12]  # Phishing and DDoS most common
+INDUSTRY_WEIGHTS = [0.18, 0.12, 0.15, 0.14, 0.16, 0.13, 0.12]
+SOURCE_WEIGHTS = [0.35, 0.15, 0.25, 0.25]
+VULN_WEIGHTS = [0.35, 0.30, 0.20, 0.15]
+DEFENSE_WEIGHTS = [0.15, 0.20, 0.20, 0.25, 0.20]
+
+# Financial Loss tiers (realistic distribution):
+# Most attacks: $0.5M - $20M (80%), Medium: $20M - $50M (15%), Major: $50M - $100M (5%)
+LOSS_TIERS = [(0.80, 0.5, 20.0), (0.15, 20.0, 50.0), (0.05, 50.0, 99.99)]
+
+# Affected users / resolution hours by financial loss (inclusive ranges)
+USER_RANGES = [(10, 1000, 300000), (30, 200000, 600000), (None, 500000, 999999)]
+RESOLUTION_RANGES = [(10, 1, 24), (30, 12, 48), (None, 24, 72)]
+
+YEARS = (2015, 2024)
+
 NUM_RECORDS = 50000
+CHUNK_SIZE = 1_000_000
+SEED = 42
+OUTPUT_FILE = 'Global_Cybersecurity_Threats_2015-2024_LARGE.csv'
 
-print(f"Generating {NUM_RECORDS:,} cybersecurity attack records...")
-print("This may take a few minutes...\n")
-
-# Generate data
-data = {
-    'Country': [],
-    'Year': [],
-    'Attack Type': [],
-    'Target Industry': [],
-    'Financial Loss (in Million $)': [],
-    'Number of Affected Users': [],
-    'Attack Source': [],
-    'Security Vulnerability Type': [],
-    'Defense Mechanism Used': [],
-    'Incident Resolution Time (in Hours)': []
-}
-
-# Generate records in batches for better performance
-batch_size = 5000
-for batch in range(NUM_RECORDS // batch_size):
-    print(f"Generating batch {batch + 1}/{NUM_RECORDS // batch_size}...")
-    
-    for _ in range(batch_size):
-        # Country (weighted towards major cyber targets)
-        country_weights = [0.08, 0.10, 0.12, 0.09, 0.10, 0.11, 0.09, 0.07, 0.11, 0.13]
-        country = random.choices(COUNTRIES, weights=country_weights)[0]
-        
-        # Year (2015-2024)
-        year = random.randint(2015, 2024)
-        
-        # Attack Type (weighted by commonality)
-        attack_weights = [0.20, 0.15, 0.10, 0.25, 0.18, 0.12]  # Phishing and DDoS most common
-        attack_type = random.choices(ATTACK_TYPES, weights=attack_weights)[0]
-        
-        # Target Industry (weighted by attack frequency)
-        industry_weights = [0.18, 0.12, 0.15, 0.14, 0.16, 0.13, 0.12]
-        target_industry = random.choices(TARGET_INDUSTRIES, weights=industry_weights)[0]
-        
-        # Financial Loss (realistic distribution)
-        # Most attacks: $0.5M - $20M (80%)
-        # Medium attacks: $20M - $50M (15%)
-        # Major attacks: $50M - $100M (5%)
-        loss_category = random.random()
-        if loss_category < 0.80:
-            financial_loss = round(random.uniform(0.5, 20.0), 2)
-        elif loss_category < 0.95:
-            financial_loss = round(random.uniform(20.0, 50.0), 2)
-        else:
-            financial_loss = round(random.uniform(50.0, 99.99), 2)
-        
-        # Number of Affected Users (correlated with financial loss)
-        if financial_loss < 10:
-            affected_users = random.randint(1000, 300000)
-        elif financial_loss < 30:
-            affected_users = random.randint(200000, 600000)
-        else:
-            affected_users = random.randint(500000, 999999)
-        
-        # Attack Source (weighted)
-        source_weights = [0.35, 0.15, 0.25, 0.25]
-        attack_source = random.choices(ATTACK_SOURCES, weights=source_weights)[0]
-        
-        # Vulnerability Type (weighted by prevalence)
-        vuln_weights = [0.35, 0.30, 0.20, 0.15]
-        vulnerability = random.choices(VULNERABILITIES, weights=vuln_weights)[0]
-        
-        # Defense Mechanism (weighted by usage)
-        defense_weights = [0.15, 0.20, 0.20, 0.25, 0.20]
-        defense = random.choices(DEFENSE_MECHANISMS, weights=defense_weights)[0]
-        
-        # Resolution Time (correlated with attack severity)
-        if financial_loss < 10:
-            resolution_time = random.randint(1, 24)
-        elif financial_loss < 30:
-            resolution_time = random.randint(12, 48)
+
+def _weighted(rng, values, weights, n):
+    """Draw n labels with the given weights (normalized) as a categorical"""
+    p = np.asarray(weights, dtype='float64')
+    codes = rng.choice(len(values), size=n, p=p / p.sum())
+    return pd.Categorical.from_codes(codes, categories=values)
+
+
+def _by_loss(rng, loss, ranges):
+    """Draw integers from the range of each row's financial-loss band"""
+    conditions, lows, highs = [], [], []
+    for bound, low, high in ranges:
+        conditions.append(loss < bound if bound is not None else np.ones(len(loss), dtype=bool))
+        lows.append(low)
+        highs.append(high)
+    band = np.select(conditions, np.arange(len(ranges)))
+    low = np.asarray(lows)[band]
+    high = np.asarray(highs)[band]
+    return rng.integers(low, high + 1)
+
+
+def generate_chunk(n, seed):
+    """
+    Generate n records with one vectorized draw per column
+
+    Parameters:
+    -----------
+    n : int
+        Number of records
+    seed : np.random.SeedSequence or int
+        Seed for this chunk's independent stream
+
+    Returns:
+    --------
+    pd.DataFrame
+        Records with the original column layout (text columns as categoricals)
+    """
+    rng = np.random.default_rng(seed)
+
+    tier = rng.choice(len(LOSS_TIERS), size=n, p=[share for share, _, _ in LOSS_TIERS])
+    low = np.array([low for _, low, _ in LOSS_TIERS])[tier]
+    high = np.array([high for _, _, high in LOSS_TIERS])[tier]
+    financial_loss = np.round(rng.uniform(low, high), 2)
+
+    return pd.DataFrame({
+        'Country': _weighted(rng, COUNTRIES, COUNTRY_WEIGHTS, n),
+        'Year': rng.integers(YEARS[0], YEARS[1] + 1, size=n),
+        'Attack Type': _weighted(rng, ATTACK_TYPES, ATTACK_WEIGHTS, n),
+        'Target Industry': _weighted(rng, TARGET_INDUSTRIES, INDUSTRY_WEIGHTS, n),
+        'Financial Loss (in Million $)': financial_loss,
+        'Number of Affected Users': _by_loss(rng, financial_loss, USER_RANGES),
+        'Attack Source': _weighted(rng, ATTACK_SOURCES, SOURCE_WEIGHTS, n),
+        'Security Vulnerability Type': _weighted(rng, VULNERABILITIES, VULN_WEIGHTS, n),
+        'Defense Mechanism Used': _weighted(rng, DEFENSE_MECHANISMS, DEFENSE_WEIGHTS, n),
+        'Incident Resolution Time (in Hours)': _by_loss(rng, financial_loss, RESOLUTION_RANGES),
+    })
+
+
+def summarize_chunk(df):
+    """Running-total statistics of a chunk (mergeable with merge_summaries)"""
+    loss = df['Financial Loss (in Million $)'].to_numpy()
+    users = df['Number of Affected Users'].to_numpy()
+    return {
+        'rows': len(df),
+        'loss_sum': float(loss.sum()),
+        'loss_max': float(loss.max()) if len(loss) else 0.0,
+        'users_sum': int(users.sum()),
+        'countries': np.bincount(df['Country'].cat.codes, minlength=len(COUNTRIES)),
+        'attack_types': np.bincount(df['Attack Type'].cat.codes, minlength=len(ATTACK_TYPES)),
+    }
+
+
+def merge_summaries(total, part):
+    if total is None:
+        return part
+    return {
+        'rows': total['rows'] + part['rows'],
+        'loss_sum': total['loss_sum'] + part['loss_sum'],
+        'loss_max': max(total['loss_max'], part['loss_max']),
+        'users_sum': total['users_sum'] + part['users_sum'],
+        'countries': total['countries'] + part['countries'],
+        'attack_types': total['attack_types'] + part['attack_types'],
+    }
+
+
+def _column_text(values):
+    """A column's values as CSV text (categoricals and small int ranges via a lookup table)"""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        labels = np.asarray(values.cat.categories, dtype=object)
+        return labels[values.cat.codes.to_numpy()].tolist()
+    array = values.to_numpy()
+    if array.dtype.kind in 'iu' and len(array):
+        low, high = int(array.min()), int(array.max())
+        if high - low <= 4096:
+            labels = np.array([str(v) for v in range(low, high + 1)], dtype=object)
+            return labels[array - low].tolist()
+    return list(map(str, array.tolist()))
+
+
+def to_csv_bytes(df, header=True):
+    """
+    Encode a generated chunk as CSV, byte-identical to df.to_csv(index=False)
+
+    Several times faster than to_csv: columns are turned into text in bulk and
+    rows joined once. Only valid for this generator's output, whose labels
+    never contain separators or quotes.
+    """
+    lines = map(','.join, zip(*(_column_text(df[name]) for name in df.columns)))
+    text = '\n'.join(lines)
+    if header:
+        text = ','.join(df.columns) + '\n' + text
+    return (text + '\n').encode('utf-8') if len(df) else text.encode('utf-8')
+
+
+def _build_chunk(n, seed, want_csv, want_parquet, header):
+    """Worker: generate a chunk and encode it for the requested outputs"""
+    df = generate_chunk(n, seed)
+    encoded = {'summary': summarize_chunk(df)}
+    if want_csv:
+        encoded['csv'] = to_csv_bytes(df, header=header)
+    if want_parquet:
+        encoded['table'] = pa.Table.from_pandas(df, preserve_index=False)
+    return encoded
+
+
+def chunk_plan(num_records, chunk_size, seed=SEED):
+    """(rows, seed) per chunk; each chunk gets its own spawned SeedSequence"""
+    sizes = [chunk_size] * (num_records // chunk_size)
+    if num_records % chunk_size:
+        sizes.append(num_records % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    return list(zip(sizes, seeds))
+
+
+def generate_dataset(num_records=NUM_RECORDS, csv_path=OUTPUT_FILE, parquet_path=None,
+                     chunk_size=CHUNK_SIZE, workers=None, seed=SEED, progress=True):
+    """
+    Generate a dataset chunk by chunk and stream it to CSV and/or Parquet
+
+    Parameters:
+    -----------
+    num_records : int
+        Total number of records
+    csv_path, parquet_path : str or None
+        Output files (at least one)
+    chunk_size : int
+        Records per chunk (also the Parquet row-group size)
+    workers : int, optional
+        Worker processes (default: CPU count; 1 generates in-process)
+    seed : int
+        Root seed; the output is identical for any number of workers
+
+    Returns:
+    --------
+    dict
+        Summary statistics of the generated data
+    """
+    if csv_path is None and parquet_path is None:
+        raise ValueError("Give a CSV and/or a Parquet output path")
+    if parquet_path is not None and not PARQUET_AVAILABLE:
+        raise ImportError("Parquet output needs pyarrow (pip install pyarrow)")
+
+    plan = chunk_plan(num_records, chunk_size, seed)
+    workers = workers or os.cpu_count() or 1
+    want_csv, want_parquet = csv_path is not None, parquet_path is not None
+    csv_file = open(csv_path, 'wb') if want_csv else None
+    parquet_writer = None
+    summary = None
+
+    def write(index, encoded):
+        nonlocal parquet_writer, summary
+        if csv_file is not None:
+            csv_file.write(encoded['csv'])
+        if want_parquet:
+            table = encoded['table']
+            if parquet_writer is None:
+                parquet_writer = pq.ParquetWriter(parquet_path, table.schema)
+            parquet_writer.write_table(table)
+        summary = merge_summaries(summary, encoded['summary'])
+        if progress:
+            print(f"Generated chunk {index + 1}/{len(plan)} ({summary['rows']:,} records)")
+
+    try:
+        if workers == 1:
+            for index, (n, chunk_seed) in enumerate(plan):
+                write(index, _build_chunk(n, chunk_seed, want_csv, want_parquet, index == 0))
         else:
-            resolution_time = random.randint(24, 72)
-        
-        # Add to data
-        data['Country'].append(country)
-        data['Year'].append(year)
-        data['Attack Type'].append(attack_type)
-        data['Target Industry'].append(target_industry)
-        data['Financial Loss (in Million $)'].append(financial_loss)
-        data['Number of Affected Users'].append(affected_users)
-        data['Attack Source'].append(attack_source)
-        data['Security Vulnerability Type'].append(vulnerability)
-        data['Defense Mechanism Used'].append(defense)
-        data['Incident Resolution Time (in Hours)'].append(resolution_time)
-
-print("\nCreating DataFrame...")
-df = pd.DataFrame(data)
-
-# Shuffle the data
-print("Shuffling records...")
-df = df.sample(frac=1).reset_index(drop=True)
-
-# Save to CSV
-output_file = 'Global_Cybersecurity_Threats_2015-2024_LARGE.csv'
-print(f"\nSaving to {output_file}...")
-df.to_csv(output_file, index=False)
-
-print("\n" + "="*70)
-print("✅ DATASET GENERATION COMPLETE!")
-print("="*70)
-print(f"\nDataset Statistics:")
-print(f"  Total Records: {len(df):,}")
-print(f"  Columns: {len(df.columns)}")
-print(f"  File: {output_file}")
-print(f"  Size: {df.memory_usage(deep=True).sum() / (1024**2):.2f} MB")
-print(f"\nDate Range: 2015-2024")
-print(f"Countries: {df['Country'].nunique()}")
-print(f"Attack Types: {df['Attack Type'].nunique()}")
-print(f"Industries: {df['Target Industry'].nunique()}")
-print(f"\nFinancial Impact:")
-print(f"  Total Loss: ${df['Financial Loss (in Million $)'].sum()/1000:.2f} Billion")
-print(f"  Average Loss: ${df['Financial Loss (in Million $)'].mean():.2f} Million")
-print(f"  Max Loss: ${df['Financial Loss (in Million $)'].max():.2f} Million")
-print(f"\nAffected Users:")
-print(f"  Total: {df['Number of Affected Users'].sum():,}")
-print(f"  Average: {df['Number of Affected Users'].mean():,.0f}")
-print(f"\nTop 5 Countries by Attack Count:")
-print(df['Country'].value_counts().head())
-print(f"\nTop 5 Attack Types:")
-print(df['Attack Type'].value_counts().head())
-print("\n" + "="*70)
-print("✅ Ready to use with your dashboard!")
-print("="*70)
+            # Keep at most two chunks per worker in flight so memory stays bounded
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = deque()
+                for index, (n, chunk_seed) in enumerate(plan):
+                    pending.append(pool.submit(_build_chunk, n, chunk_seed, want_csv, want_parquet, index == 0))
+                    if len(pending) >= 2 * workers:
+                        write(index - len(pending) + 1, pending.popleft().result())
+                done = len(plan) - len(pending)
+                while pending:
+                    write(done, pending.popleft().result())
+                    done += 1
+    finally:
+        if csv_file is not None:
+            csv_file.close()
+        if parquet_writer is not None:
+            parquet_writer.close()
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a large synthetic cybersecurity threats dataset")
+    parser.add_argument('--rows', type=int, default=NUM_RECORDS, help=f'records to generate (default {NUM_RECORDS:,})')
+    parser.add_argument('--csv', help=f'CSV output (default {OUTPUT_FILE} when --parquet is not given)')
+    parser.add_argument('--parquet', help='Parquet output (needs pyarrow)')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='records per chunk')
+    parser.add_argument('--workers', type=int, help='worker processes (default: CPU count)')
+    parser.add_argument('--seed', type=int, default=SEED)
+    args = parser.parse_args()
+    csv_path = args.csv or (None if args.parquet else OUTPUT_FILE)
+
+    print(f"Generating {args.rows:,} cybersecurity attack records...")
+    started = time.perf_counter()
+    summary = generate_dataset(args.rows, csv_path, args.parquet, args.chunk_size, args.workers, args.seed)
+    elapsed = time.perf_counter() - started
+
+    print("\n" + "="*70)
+    print("✅ DATASET GENERATION COMPLETE!")
+    print("="*70)
+    print(f"\nDataset Statistics:")
+    print(f"  Total Records: {summary['rows']:,}")
+    print(f"  Columns: 10")
+    for path in (csv_path, args.parquet):
+        if path:
+            print(f"  File: {path} ({os.path.getsize(path) / (1024**2):.2f} MB)")
+    print(f"  Time: {elapsed:.1f}s ({summary['rows'] / elapsed:,.0f} records/s)")
+    print(f"\nDate Range: {YEARS[0]}-{YEARS[1]}")
+    print(f"Countries: {int((summary['countries'] > 0).sum())}")
+    print(f"Attack Types: {int((summary['attack_types'] > 0).sum())}")
+    print(f"\nFinancial Impact:")
+    print(f"  Total Loss: ${summary['loss_sum']/1000:.2f} Billion")
+    print(f"  Average Loss: ${summary['loss_sum'] / summary['rows']:.2f} Million")
+    print(f"  Max Loss: ${summary['loss_max']:.2f} Million")
+    print(f"\nAffected Users:")
+    print(f"  Total: {summary['users_sum']:,}")
+    print(f"  Average: {summary['users_sum'] / summary['rows']:,.0f}")
+    print(f"\nTop 5 Countries by Attack Count:")
+    print(pd.Series(summary['countries'], index=COUNTRIES, name='count').sort_values(ascending=False).head())
+    print(f"\nTop 5 Attack Types:")
+    print(pd.Series(summary['attack_types'], index=ATTACK_TYPES, name='count').sort_values(ascending=False).head())
+    print("\n" + "="*70)
+    print("✅ Ready to use with your dashboard!")
+    print("="*70)
+
+
+if __name__ == '__main__':
+    main()
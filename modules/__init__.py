@@ -1,11 +1,15 @@
 """
 DarkSentinel Modules Package
 Contains data processing, visualization, and anomaly detection modules
+
+Submodules are imported on first attribute access (PEP 562), so importing
+one module, e.g. modules.workers, no longer pulls in scikit-learn and Plotly
+through anomaly and visuals.
 """
 
-from . import data_loader
-from . import preprocess
-from . import visuals
-from . import anomaly
+from .lazy_imports import lazy_submodules
+
+__all__ = ['data_loader', 'preprocess', 'visuals', 'anomaly', 'fingerprint', 'workers', 'shared_store', 'result_cache',
+           'tracing', 'metrics', 'lazy_imports', 'compact', 'ip_index', 'text_index', 'explorer', 'exports']
 
-__all__ = ['data_loader', 'preprocess', 'visuals', 'anomaly']
+__getattr__, __dir__ = lazy_submodules(__name__, __all__)
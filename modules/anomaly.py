@@ -5,9 +5,13 @@ Implements machine learning-based anomaly detection
 
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import IsolationForest
-from sklearn.preprocessing import StandardScaler
 import streamlit as st
+from .lazy_imports import lazy_module
+from .tracing import traced
+
+# scikit-learn is imported on the first model fit, not when the module loads
+sklearn_ensemble = lazy_module('sklearn.ensemble')
+sklearn_preprocessing = lazy_module('sklearn.preprocessing')
 
 @st.cache_resource
 def train_anomaly_detector(df, contamination=0.1):
@@ -26,6 +30,16 @@ def train_anomaly_detector(df, contamination=0.1):
     tuple
         (model, scaler, feature_columns)
     """
+    return fit_anomaly_detector(df, contamination)
+
+@traced
+def fit_anomaly_detector(df, contamination=0.1):
+    """
+    Fit the Isolation Forest without Streamlit caching
+    
+    Safe to call from worker processes; see train_anomaly_detector for
+    parameters and return value.
+    """
     # Select numerical features for anomaly detection
     feature_columns = ['Anomaly Scores', 'Packet Length', 'Source Port', 'Destination Port']
     
@@ -36,11 +50,11 @@ def train_anomaly_detector(df, contamination=0.1):
     X = X.fillna(X.mean())
     
     # Scale features
-    scaler = StandardScaler()
+    scaler = sklearn_preprocessing.StandardScaler()
     X_scaled = scaler.fit_transform(X)
     
     # Train Isolation Forest
-    model = IsolationForest(
+    model = sklearn_ensemble.IsolationForest(
         contamination=contamination,
         random_state=42,
         n_estimators=100
@@ -49,6 +63,7 @@ def train_anomaly_detector(df, contamination=0.1):
     
     return model, scaler, feature_columns
 
+@traced
 def detect_anomalies(df, model, scaler, feature_columns):
     """
     Detect anomalies in the dataset
@@ -90,6 +105,30 @@ def detect_anomalies(df, model, scaler, feature_columns):
     
     return result_df
 
+@traced
+def run_anomaly_detection(df, contamination=0.1):
+    """
+    Train the detector and score the dataset in one call
+    
+    This is the unit of work submitted to the background worker pool, so it
+    only uses plain (picklable) inputs and outputs.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Input dataframe
+    contamination : float
+        Expected proportion of outliers in the dataset
+        
+    Returns:
+    --------
+    pd.DataFrame
+        Dataframe with anomaly predictions and scores
+    """
+    model, scaler, feature_columns = fit_anomaly_detector(df, contamination)
+    return detect_anomalies(df, model, scaler, feature_columns)
+
+@traced
 def get_anomaly_summary(df_with_anomalies):
     """
     Get summary statistics of detected anomalies
@@ -117,6 +156,7 @@ def get_anomaly_summary(df_with_anomalies):
     
     return summary
 
+@traced
 def get_top_anomalies(df_with_anomalies, n=10):
     """
     Get top N most anomalous records
@@ -138,6 +178,7 @@ def get_top_anomalies(df_with_anomalies, n=10):
     
     return top_anomalies
 
+@traced
 def get_anomaly_by_attack_type(df_with_anomalies):
     """
     Get anomaly distribution by attack type
@@ -152,11 +193,12 @@ def get_anomaly_by_attack_type(df_with_anomalies):
     pd.DataFrame
         Anomaly counts by attack type
     """
-    anomaly_by_type = df_with_anomalies[df_with_anomalies['Anomaly'] == -1].groupby('Attack Type').size().reset_index(name='count')
+    anomaly_by_type = df_with_anomalies[df_with_anomalies['Anomaly'] == -1].groupby('Attack Type', observed=True).size().reset_index(name='count')
     anomaly_by_type = anomaly_by_type.sort_values('count', ascending=False)
     
     return anomaly_by_type
 
+@traced
 def detect_threshold_anomalies(df, threshold_multiplier=2):
     """
     Detect anomalies based on threshold (mean + n*std)
@@ -184,6 +226,7 @@ def detect_threshold_anomalies(df, threshold_multiplier=2):
     
     return result_df
 
+@traced
 def get_anomaly_insights(df_with_anomalies):
     """
     Generate insights about detected anomalies
@@ -0,0 +1,248 @@
+"""
+Compact Frames for DarkSentinel
+Shrinks loaded datasets: IPv4 address columns are packed into uint32 (see
+modules/ip_index.py), low-cardinality text columns become categoricals and
+numeric columns are downcast to the narrowest dtype their values fit in. The
+chosen dtypes are recorded per dataset and reused on the next load, so only
+columns whose values no longer fit are inferred again.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .fingerprint import fingerprint
+from .ip_index import IPV4_DTYPE, parse_ipv4
+from .result_cache import CACHE_DIR_ENV, DEFAULT_CACHE_DIR
+from .tracing import traced
+
+COMPACT_ENV = 'DARKSENTINEL_COMPACT_FRAMES'
+SCHEMA_DIR_NAME = 'schemas'
+CATEGORY_MAX_RATIO = 0.5    # distinct values / rows above which text stays as it is
+CATEGORY_SAMPLE = 10_000    # rows checked before factorizing a whole text column
+FLOAT32_RTOL = 1e-6         # relative round-trip error allowed when narrowing floats
+INT_TYPES = ('int8', 'int16', 'int32')
+
+
+def compact_mode_enabled():
+    """True when DARKSENTINEL_COMPACT_FRAMES switches the loaders to compact frames"""
+    return os.environ.get(COMPACT_ENV, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def schema_key(name, source=None):
+    """
+    Build the key a dataset's recorded schema is stored under
+
+    Unlike shared_store.dataset_key(), the key ignores the source file's
+    mtime, so an edited file reuses its schema (drifted columns are re-inferred).
+    """
+    if source is None:
+        return name
+    return f"{name}-{fingerprint(str(Path(source).resolve()))}"
+
+
+def _schema_path(key):
+    directory = Path(os.environ.get(CACHE_DIR_ENV, DEFAULT_CACHE_DIR)) / SCHEMA_DIR_NAME
+    return directory / f"{key}.json"
+
+
+def load_schema(key):
+    """Return the recorded {column: {'from': dtype, 'to': dtype or None}} for key, or {}"""
+    try:
+        return json.loads(_schema_path(key).read_text())['columns']
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def save_schema(key, schema):
+    """Record a schema for key (written atomically; failures are ignored)"""
+    path = _schema_path(key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        staging = path.with_suffix(f".{os.getpid()}.tmp")
+        staging.write_text(json.dumps({'columns': schema}, indent=1))
+        os.replace(staging, path)
+    except OSError:
+        pass
+
+
+def _is_text(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return False
+    if series.dtype == object:
+        return pd.api.types.infer_dtype(series, skipna=True) == 'string'
+    return pd.api.types.is_string_dtype(series.dtype)
+
+
+def _narrowest_int(low, high):
+    for name in INT_TYPES:
+        info = np.iinfo(name)
+        if info.min <= low and high <= info.max:
+            return name
+    return None
+
+
+def infer_column_dtype(series):
+    """
+    Pick the compact dtype for one column
+
+    Text made only of dotted-quad addresses becomes 'ipv4' (checked on a
+    sample here, on every row by convert_column). Other text becomes
+    'category' when at most CATEGORY_MAX_RATIO of its values are distinct.
+    Integers get the narrowest signed integer type covering their range;
+    unsigned types are avoided so that subtraction cannot wrap around (uint32
+    marks packed addresses). Floats stay floats, even when they only hold
+    whole numbers, and become float32 when every value survives the round
+    trip within FLOAT32_RTOL.
+
+    Returns:
+    --------
+    str or None
+        Target dtype name, or None to keep the column as it is
+    """
+    n = len(series)
+    if n == 0:
+        return None
+    if _is_text(series):
+        limit = CATEGORY_MAX_RATIO
+        sample = series.iloc[np.linspace(0, n - 1, min(n, CATEGORY_SAMPLE)).astype(int)]
+        if parse_ipv4(sample)[1].all():
+            return 'ipv4'
+        if n > CATEGORY_SAMPLE:
+            if sample.nunique() > limit * CATEGORY_SAMPLE:
+                return None
+        return 'category' if series.nunique() <= limit * n else None
+
+    dtype = series.dtype
+    if dtype == IPV4_DTYPE:
+        return 'ipv4'
+    if not isinstance(dtype, np.dtype) or dtype.kind not in 'iuf':
+        return None
+    values = series.to_numpy()
+    if dtype.kind == 'f':
+        return 'float32' if dtype.itemsize > 4 and _fits_float32(values) else None
+    target = _narrowest_int(values.min(), values.max())
+    if target is None or np.dtype(target).itemsize >= dtype.itemsize:
+        return None
+    return target
+
+
+def _fits_float32(values):
+    finite = values[np.isfinite(values)]
+    if finite.size and np.abs(finite).max() > np.finfo(np.float32).max:
+        return False
+    narrowed = finite.astype(np.float32).astype(np.float64)
+    return bool(np.allclose(narrowed, finite, rtol=FLOAT32_RTOL, atol=0))
+
+
+def convert_column(series, target):
+    """
+    Convert a column to a recorded dtype, or return None if its values no longer fit
+
+    Parameters:
+    -----------
+    series : pd.Series
+        Column as loaded
+    target : str
+        'ipv4', 'category', an integer type name or 'float32'
+    """
+    dtype = series.dtype
+    if target == 'ipv4':
+        if dtype == IPV4_DTYPE:
+            return series
+        if not (_is_text(series) or isinstance(dtype, pd.CategoricalDtype)):
+            return None
+        packed, valid = parse_ipv4(series)
+        return pd.Series(packed, index=series.index, name=series.name) if valid.all() else None
+    if target == 'category':
+        if isinstance(dtype, pd.CategoricalDtype):
+            return series
+        return series.astype('category') if _is_text(series) else None
+    if not isinstance(dtype, np.dtype) or dtype.kind not in 'iuf':
+        return None
+    values = series.to_numpy()
+    if target == 'float32':
+        return series.astype(np.float32) if dtype.kind == 'f' and _fits_float32(values) else None
+    if dtype.kind == 'f':
+        return None
+    if len(values):
+        info = np.iinfo(target)
+        if values.min() < info.min or values.max() > info.max:
+            return None
+    return series.astype(target)
+
+
+@traced
+def compact_frame(df, key=None):
+    """
+    Return a compacted copy of a dataframe
+
+    With a key, the schema recorded under it is applied first; columns that
+    are new, changed source dtype or no longer fit their recorded dtype are
+    inferred again, and the record is updated. Columns inferred to stay as
+    they are are recorded too, so they are not re-examined on reload.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Dataframe to compact (not modified)
+    key : str, optional
+        Schema record to reuse and update (see schema_key)
+
+    Returns:
+    --------
+    pd.DataFrame
+        Dataframe with the same columns, index and values in compact dtypes
+    """
+    recorded = load_schema(key) if key is not None else {}
+    schema = {}
+    columns = {}
+    for name in df.columns:
+        series = df[name]
+        source_dtype = str(series.dtype)
+        entry = recorded.get(str(name))
+        converted = None
+        if entry is not None and entry.get('from') == source_dtype:
+            target = entry.get('to')
+            converted = series if target is None else convert_column(series, target)
+        if converted is None:
+            target = infer_column_dtype(series)
+            converted = None if target is None else convert_column(series, target)
+            if converted is None:
+                target, converted = None, series
+        schema[str(name)] = {'from': source_dtype, 'to': target}
+        columns[name] = converted
+    if key is not None and schema != recorded:
+        save_schema(key, schema)
+    return pd.DataFrame(columns, index=df.index)
+
+
+def prune_categories(df):
+    """
+    Drop the categories a filtered frame no longer uses
+
+    Without this, value_counts() on a filtered categorical column lists
+    every category of the full dataset with a zero count. Ordered
+    categoricals (pd.cut bins) keep all their levels; frames without
+    unordered categorical columns are returned as they are.
+    """
+    pruned = None
+    for name in df.columns:
+        series = df[name]
+        if isinstance(series.dtype, pd.CategoricalDtype) and not series.dtype.ordered:
+            used = series.cat.remove_unused_categories()
+            if len(used.cat.categories) < len(series.cat.categories):
+                if pruned is None:
+                    pruned = df.copy(deep=False)
+                pruned[name] = used
+    return df if pruned is None else pruned
+
+
+def maybe_compact(df, name, source=None):
+    """Compact a loader's result when compact frame mode is on (see compact_mode_enabled)"""
+    if not compact_mode_enabled() or not isinstance(df, pd.DataFrame):
+        return df
+    return compact_frame(df, schema_key(name, source))
@@ -13,6 +13,8 @@ import numpy as np
 from datetime import datetime
 import streamlit as st
 
+from .tracing import traced
+
 
 CANONICAL_COLUMNS = [
     'Timestamp', 'Device Information', 'Attack Type', 'Anomaly Scores',
@@ -40,6 +42,16 @@ def find_dataset(root: Path):
     return None
 
 
+@traced
+def resolve_dataset(file_path, root: Path):
+    """Return the requested file if it exists, else the dataset find_dataset() picks."""
+    requested = Path(file_path)
+    if requested.exists():
+        return requested
+    return find_dataset(Path(root))
+
+
+@traced
 def map_global_schema(df: pd.DataFrame) -> pd.DataFrame:
     """Map the 'Global_Cybersecurity_Threats' style schema to the canonical
     schema used by app.py and app_v2.py. This will create safe placeholders 
@@ -313,6 +325,7 @@ def map_global_schema(df: pd.DataFrame) -> pd.DataFrame:
     return standardized
 
 
+@traced
 def load_best_dataset(root_dir: str = '.') -> pd.DataFrame:
     """Find and load the best dataset available under root_dir and return a
     dataframe compatible with `app.py`.
@@ -327,8 +340,14 @@ def load_best_dataset(root_dir: str = '.') -> pd.DataFrame:
         st.stop()
 
     # Silently load dataset
-    df = pd.read_csv(ds)
+    return map_to_canonical(pd.read_csv(ds))
 
+
+@traced
+def map_to_canonical(df: pd.DataFrame) -> pd.DataFrame:
+    """Apply the schema mapping load_best_dataset() would pick for a raw
+    frame read from one of the supported CSVs (also used for appended rows).
+    """
     # Heuristics: if this looks like the global dataset, map accordingly
     if 'Country' in df.columns and 'Financial Loss (in Million $)' in df.columns:
         mapped = map_global_schema(df)
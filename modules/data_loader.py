@@ -7,16 +7,26 @@ import pandas as pd
 import streamlit as st
 from pathlib import Path
 
+from .result_cache import cached_result, estimate_nbytes
+from .compact import maybe_compact
+
 # Prefer the adapter which will detect available CSVs and make a best-effort
 # mapping so the UI code (app.py) doesn't need to change. The adapter is
 # conservative and creates placeholders for missing columns.
 try:
-    from .data_adapter import load_best_dataset
+    from .data_adapter import load_best_dataset, resolve_dataset
 except Exception:
-    load_best_dataset = None
+    load_best_dataset = resolve_dataset = None
+
+
+def _dataset_source(file_path: str = 'cybersecurity_attacks.csv'):
+    """Path load_data() will read for file_path (used for change detection)"""
+    if resolve_dataset is None:
+        return Path(file_path)
+    return resolve_dataset(file_path, '.')
 
 
-@st.cache_data
+@cached_result('dataset', source=_dataset_source)
 def load_data(file_path: str = 'cybersecurity_attacks.csv'):
     """
     Load cybersecurity attack data from CSV.
@@ -35,7 +45,7 @@ def load_data(file_path: str = 'cybersecurity_attacks.csv'):
             # Try to ensure Timestamp column is proper datetime if present
             if 'Timestamp' in df.columns:
                 df['Timestamp'] = pd.to_datetime(df['Timestamp'], errors='coerce').fillna(pd.Timestamp.now())
-            return df
+            return maybe_compact(df, 'data_loader.load_data', requested)
         except Exception as e:
             st.error(f"❌ Error loading requested data file {file_path}: {e}")
             st.stop()
@@ -44,7 +54,7 @@ def load_data(file_path: str = 'cybersecurity_attacks.csv'):
     if load_best_dataset is not None:
         try:
             df = load_best_dataset(root_dir='.')
-            return df
+            return maybe_compact(df, 'data_loader.load_data', _dataset_source(file_path))
         except Exception as e:
             st.error(f"❌ Adapter failed to load dataset: {e}")
             st.stop()
@@ -54,6 +64,7 @@ def load_data(file_path: str = 'cybersecurity_attacks.csv'):
     st.info("Place a CSV (e.g. 'cybersecurity_attacks.csv' or 'Global_Cybersecurity_Threats_2015-2024.csv') in the project root.")
     st.stop()
 
+@cached_result('aggregate')
 def get_data_summary(df):
     """
     Get basic summary statistics of the dataset
@@ -72,6 +83,6 @@ def get_data_summary(df):
         'total_records': len(df),
         'total_columns': len(df.columns),
         'date_range': (df['Timestamp'].min(), df['Timestamp'].max()) if 'Timestamp' in df.columns else None,
-        'memory_usage': df.memory_usage(deep=True).sum() / 1024**2  # MB
+        'memory_usage': estimate_nbytes(df) / 1024**2  # MB
     }
     return summary
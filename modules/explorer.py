@@ -0,0 +1,168 @@
+"""
+Data Explorer for DarkSentinel
+Paginated, sortable record table backed by row-id selections: a view is an
+array of row positions into the full dataset, each column's sort order is
+computed once per dataset version, and only the rows of the current page
+are ever taken from the frame.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .ip_index import unpack_ipv4_columns
+from .result_cache import cached_result
+
+PAGE_SIZES = (25, 50, 100, 250)
+DEFAULT_PAGE_SIZE = 100
+UNSORTED = '(dataset order)'
+
+
+def row_positions(df, rows):
+    """
+    Positions in df of a selection of row labels
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Full dataset
+    rows : pd.Index or array-like
+        Labels of the selected rows (e.g. filtered_df.index)
+
+    Returns:
+    --------
+    np.ndarray
+        int64 positions, in the order of rows
+    """
+    index = df.index
+    if isinstance(index, pd.RangeIndex) and index.start == 0 and index.step == 1:
+        return np.asarray(rows, dtype=np.int64)
+    return index.get_indexer(rows).astype(np.int64)
+
+
+@cached_result('index')
+def build_sort_index(df, column):
+    """
+    Rank of every row of df when sorted by column (stable, missing values last)
+
+    Cached per dataset version, so each column is sorted at most once and
+    any selection is then ordered by sorting its small integer ranks.
+
+    Returns:
+    --------
+    np.ndarray
+        rank[position] for every row position of df
+    """
+    order = df[column].reset_index(drop=True).sort_values(kind='stable', na_position='last').index.to_numpy()
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    return rank
+
+
+@cached_result('filter')
+def sorted_positions(df, positions, column=None, ascending=True):
+    """
+    Order a selection of row positions by one column
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Full dataset
+    positions : np.ndarray
+        Selected row positions (see row_positions)
+    column : str, optional
+        Sort column; None keeps the dataset order
+    ascending : bool
+        Sort direction; descending is the reverse of ascending except that
+        missing values stay last
+
+    Returns:
+    --------
+    np.ndarray
+        The positions in display order
+    """
+    if column is None:
+        return np.sort(positions)
+    ranks = build_sort_index(df, column)[positions]
+    if not ascending:
+        ranks = np.where(ranks < df[column].count(), -ranks, ranks)
+    order = np.argsort(ranks, kind='stable')
+    return positions[order]
+
+
+def page_of(df, positions, page, page_size, columns=None):
+    """
+    Rows of one page of an ordered selection
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Full dataset
+    positions : np.ndarray
+        Row positions in display order (see sorted_positions)
+    page : int
+        Zero-based page number
+    page_size : int
+        Rows per page
+    columns : list of str, optional
+        Columns to return (default: all)
+
+    Returns:
+    --------
+    pd.DataFrame
+        At most page_size rows, taken without touching the rest of df
+    """
+    rows = df.iloc[positions[page * page_size:(page + 1) * page_size]]
+    return rows if columns is None else rows[list(columns)]
+
+
+def render_data_explorer(df, rows, columns, key, **dataframe_kwargs):
+    """
+    Render the sortable, paginated record table for a selection
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Full dataset the selection refers to
+    rows : pd.Index or array-like
+        Labels of the selected rows
+    columns : list of str
+        Columns to show (and to offer for sorting)
+    key : str
+        Widget key prefix, unique per page
+    **dataframe_kwargs :
+        Passed to st.dataframe (width, height, ...)
+
+    Returns:
+    --------
+    pd.DataFrame
+        The rows shown on the current page (all columns)
+    """
+    import streamlit as st
+
+    positions = row_positions(df, rows)
+    col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+    with col1:
+        sort_by = st.selectbox("↕️ Sort by", [UNSORTED] + list(columns), key=f"{key}_sort_by")
+    with col2:
+        direction = st.radio("Order", ['Ascending', 'Descending'], horizontal=True,
+                             key=f"{key}_direction", disabled=sort_by == UNSORTED)
+    with col3:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, index=PAGE_SIZES.index(DEFAULT_PAGE_SIZE),
+                                 key=f"{key}_page_size")
+    pages = max(1, -(-len(positions) // page_size))
+    page_key = f"{key}_page"
+    if st.session_state.get(page_key, 1) > pages:
+        st.session_state[page_key] = 1    # the selection shrank under the current page
+    with col4:
+        page = int(st.number_input("Page", min_value=1, max_value=pages, step=1, key=page_key)) - 1
+
+    ordered = sorted_positions(df, positions, None if sort_by == UNSORTED else sort_by,
+                               ascending=direction == 'Ascending')
+    shown = page_of(df, ordered, page, page_size)
+    st.dataframe(unpack_ipv4_columns(shown[list(columns)]), **dataframe_kwargs)
+    if len(positions):
+        first = page * page_size + 1
+        st.caption(f"Rows {first:,}–{first + len(shown) - 1:,} of {len(positions):,} · page {page + 1} of {pages:,}")
+    else:
+        st.caption("No matching records")
+    return shown
@@ -0,0 +1,173 @@
+"""
+On-Demand Exports for DarkSentinel
+Serializes a selection as CSV, gzip-compressed CSV or Parquet only when the
+user asks for it. Rows are written in chunks, so an export never holds a
+second full-size copy of the selection as text, and large exports run in the
+background worker pool, where results are kept per selection fingerprint.
+"""
+
+import gzip
+import importlib.util
+import io
+
+from .fingerprint import fingerprint, tag
+from .ip_index import unpack_ipv4_columns
+
+CHUNK_ROWS = 50_000            # rows serialized per chunk
+INLINE_EXPORT_ROWS = 20_000    # larger exports go to the worker pool
+EXPORT_TIMEOUT = 300           # seconds
+
+# format -> (label, file extension, MIME type)
+FORMATS = {
+    'csv': ('CSV', '.csv', 'text/csv'),
+    'csv.gz': ('CSV (gzip)', '.csv.gz', 'application/gzip'),
+    'parquet': ('Parquet', '.parquet', 'application/vnd.apache.parquet'),
+}
+
+
+def available_formats():
+    """Export formats usable here (Parquet needs the optional pyarrow package)"""
+    if importlib.util.find_spec('pyarrow') is None:
+        return [name for name in FORMATS if name != 'parquet']
+    return list(FORMATS)
+
+
+def iter_chunks(df, positions=None, chunk_rows=CHUNK_ROWS):
+    """
+    Yield a selection of df as display-ready frames of at most chunk_rows rows
+
+    Packed address columns are turned back into strings chunk by chunk.
+    """
+    total = len(df) if positions is None else len(positions)
+    for start in range(0, max(total, 1), chunk_rows):
+        stop = start + chunk_rows
+        chunk = df.iloc[start:stop] if positions is None else df.iloc[positions[start:stop]]
+        yield unpack_ipv4_columns(chunk)
+
+
+def write_csv(df, stream, positions=None, chunk_rows=CHUNK_ROWS):
+    """Write a selection of df to a binary stream as UTF-8 CSV, one chunk at a time"""
+    for number, chunk in enumerate(iter_chunks(df, positions, chunk_rows)):
+        stream.write(chunk.to_csv(index=False, header=number == 0).encode('utf-8'))
+
+
+def write_parquet(df, stream, positions=None, chunk_rows=CHUNK_ROWS):
+    """
+    Write a selection of df to a binary stream as Parquet, one row group per chunk
+
+    Columns are dictionary-encoded, so repeated labels (attack types,
+    countries, categorical columns) are stored once per row group.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in iter_chunks(df, positions, chunk_rows):
+            if writer is None:
+                schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+                writer = pq.ParquetWriter(stream, schema, use_dictionary=True, compression='snappy')
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def export_bytes(df, positions=None, fmt='csv'):
+    """
+    Serialize a selection of df in an export format (export job)
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Dataset to export from
+    positions : np.ndarray, optional
+        Row positions to export (default: every row)
+    fmt : str
+        One of FORMATS
+
+    Returns:
+    --------
+    bytes
+        The export file's contents
+    """
+    buffer = io.BytesIO()
+    if fmt == 'csv':
+        write_csv(df, buffer, positions)
+    elif fmt == 'csv.gz':
+        with gzip.GzipFile(fileobj=buffer, mode='wb', compresslevel=6, mtime=0) as compressed:
+            write_csv(df, compressed, positions)
+    elif fmt == 'parquet':
+        write_parquet(df, buffer, positions)
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+    return buffer.getvalue()
+
+
+def render_export(df, positions=None, key='export', label="📥 Download", file_stem='darksentinel_export',
+                  **button_kwargs):
+    """
+    Render an on-demand export: a format picker, a prepare button and, once
+    the export is ready, the download button
+
+    Nothing is serialized until the user asks for it. Exports of up to
+    INLINE_EXPORT_ROWS rows are built in the page; larger ones run in the
+    worker pool on a copy of just the selected rows, and the pool keeps
+    finished results per fingerprint of (dataset, selection, format). The
+    finished export is kept for the session. Changing the selection or
+    the format asks again.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Dataset to export from
+    positions : np.ndarray, optional
+        Row positions to export (default: every row)
+    key : str
+        Widget key prefix, unique per page
+    label : str
+        Download button label
+    file_stem : str
+        Download file name without extension
+    **button_kwargs :
+        Passed to st.button and st.download_button (e.g. use_container_width)
+    """
+    import streamlit as st
+    from .workers import compute_in_background
+
+    formats = available_formats()
+    fmt = st.selectbox("Export format", formats, format_func=lambda name: FORMATS[name][0],
+                       key=f"{key}_format")
+    name, extension, mime = FORMATS[fmt]
+    token = fingerprint(df, positions, fmt)
+    state_key = f"{key}_requested"
+
+    if st.session_state.get(state_key) != token:
+        if not st.button(f"📦 Prepare {name} export", key=f"{key}_prepare", **button_kwargs):
+            return
+        st.session_state[state_key] = token
+
+    rows = len(df) if positions is None else len(positions)
+    ready = st.session_state.get(f"{key}_data")
+    if ready is not None and ready[0] == token:
+        data = ready[1]
+    elif rows <= INLINE_EXPORT_ROWS:
+        data = export_bytes(df, positions, fmt)
+    else:
+        # Only the selected rows are sent to the worker. They are taken once
+        # per request and tagged with its token, so polling neither copies nor
+        # fingerprints them again.
+        selection = st.session_state.get(f"{key}_selection")
+        if positions is None:
+            selection = (token, df)
+        elif selection is None or selection[0] != token:
+            selection = (token, tag(df.iloc[positions], token))
+            st.session_state[f"{key}_selection"] = selection
+        data = compute_in_background(export_bytes, selection[1], None, fmt,
+                                     label=f"Preparing {name} export...", timeout=EXPORT_TIMEOUT)
+    if data is not None and (ready is None or ready[0] != token):
+        st.session_state[f"{key}_data"] = (token, data)
+        st.session_state.pop(f"{key}_selection", None)
+    if data is not None:
+        st.download_button(label=label, data=data, file_name=f"{file_stem}{extension}", mime=mime,
+                           key=f"{key}_download", **button_kwargs)
@@ -0,0 +1,119 @@
+"""
+Source File Watching for DarkSentinel
+Detects when a dataset CSV changes on disk (by modification events when
+watchdog is available, and by cheap mtime/size checks otherwise) so that only
+the changed file is reloaded and results derived from it are dropped
+"""
+
+import logging
+import os
+import threading
+from pathlib import Path
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
+logger = logging.getLogger(__name__)
+
+
+def file_signature(path):
+    """
+    Cheap content signature of a file: (mtime in ns, size in bytes)
+
+    Returns None when the file does not exist.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class _ChangeHandler(FileSystemEventHandler):
+    """Forwards watchdog events for tracked files to the watcher"""
+
+    def __init__(self, watcher):
+        super().__init__()
+        self.watcher = watcher
+
+    def on_any_event(self, event):
+        for attr in ('src_path', 'dest_path'):
+            path = getattr(event, attr, None)
+            if path:
+                self.watcher.check(os.fsdecode(path))
+
+
+class SourceWatcher:
+    """
+    Tracks the signature of every source file a cached result was loaded from
+
+    check() compares a file's current signature with the one recorded at load
+    time and calls on_change(path) when they differ. With watchdog installed
+    the same check runs as soon as the file is modified, so stale results are
+    released immediately instead of on the next request.
+    """
+
+    def __init__(self, on_change, use_events=True):
+        self.on_change = on_change
+        self._lock = threading.Lock()
+        self._signatures = {}
+        self._observer = None
+        self._watched_dirs = set()
+        self._use_events = use_events and Observer is not None
+
+    def check(self, path):
+        """
+        Return the file's current signature, firing on_change if it moved on
+
+        Untracked files are only stat'ed.
+        """
+        path = str(path)
+        current = file_signature(path)
+        with self._lock:
+            recorded = self._signatures.get(path)
+            changed = path in self._signatures and recorded != current
+            if changed:
+                del self._signatures[path]
+        if changed:
+            logger.info("Source file changed: %s", path)
+            self.on_change(path)
+        return current
+
+    def track(self, path, signature):
+        """Record the signature a result was loaded with and start watching the file"""
+        path = str(path)
+        with self._lock:
+            self._signatures[path] = signature
+        self._watch(Path(path).parent)
+
+    def _watch(self, directory):
+        if not self._use_events:
+            return
+        directory = str(directory)
+        with self._lock:
+            if directory in self._watched_dirs:
+                return
+            try:
+                if self._observer is None:
+                    self._observer = Observer()
+                    self._observer.daemon = True
+                    self._observer.start()
+                self._observer.schedule(_ChangeHandler(self), directory, recursive=False)
+            except Exception:
+                # Too many inotify watches, unsupported filesystem, ...:
+                # the per-call signature checks still catch every change
+                logger.warning("Cannot watch %s; falling back to mtime/size checks", directory)
+                self._use_events = False
+                return
+            self._watched_dirs.add(directory)
+
+    def stop(self):
+        with self._lock:
+            observer, self._observer = self._observer, None
+            self._watched_dirs.clear()
+        if observer is not None:
+            observer.stop()
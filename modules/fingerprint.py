@@ -0,0 +1,140 @@
+"""
+Input Fingerprinting for DarkSentinel
+Builds stable digests of dataframes and plain arguments so that expensive
+results can be cached and shared by content rather than by object identity
+"""
+
+import hashlib
+import pickle
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+
+
+# id(obj) -> (weakref, token, sources) for frames whose content is already
+# identified by a cache key, so they need not be re-hashed row by row
+_TAGS = {}
+_TAGS_LOCK = threading.Lock()
+
+
+def tag(obj, token, sources=()):
+    """
+    Attach a precomputed fingerprint token to a dataframe or series
+
+    Cached results are tagged with their cache key, which makes fingerprinting
+    them (and anything derived from them) O(1). Tagged objects must be treated
+    as read-only: mutating one in place would leave a stale token behind.
+
+    Parameters:
+    -----------
+    obj : pd.DataFrame or pd.Series
+        Object to tag (other types are ignored)
+    token : str
+        Fingerprint standing in for the object's content
+    sources : iterable of str
+        Source files the content was derived from
+    """
+    if not isinstance(obj, (pd.DataFrame, pd.Series)):
+        return obj
+    key = id(obj)
+
+    def _forget(_ref, key=key):
+        with _TAGS_LOCK:
+            entry = _TAGS.get(key)
+            if entry is not None and entry[0] is _ref:
+                del _TAGS[key]
+
+    with _TAGS_LOCK:
+        _TAGS[key] = (weakref.ref(obj, _forget), token, frozenset(sources))
+    return obj
+
+
+def _lookup_tag(obj):
+    entry = _TAGS.get(id(obj))
+    if entry is not None and entry[0]() is obj:
+        return entry
+    return None
+
+
+def tag_of(obj):
+    """Return the token attached to obj, or None"""
+    entry = _lookup_tag(obj)
+    return entry[1] if entry is not None else None
+
+
+def sources_of(*values):
+    """Union of the source files recorded on any tagged values (also inside dicts/lists)"""
+    found = set()
+    for value in values:
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            entry = _lookup_tag(value)
+            if entry is not None:
+                found.update(entry[2])
+        elif isinstance(value, dict):
+            found.update(sources_of(*value.values()))
+        elif isinstance(value, (list, tuple)):
+            found.update(sources_of(*value))
+    return frozenset(found)
+
+
+def _update_with_frame(digest, df):
+    """Feed a dataframe's columns, dtypes and row hashes into a digest"""
+    digest.update(repr(list(df.columns)).encode('utf-8'))
+    digest.update(repr([str(t) for t in df.dtypes]).encode('utf-8'))
+    row_hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    digest.update(np.ascontiguousarray(row_hashes).tobytes())
+
+
+def _update_with_value(digest, value):
+    """Feed a single argument into a digest"""
+    token = tag_of(value) if isinstance(value, (pd.DataFrame, pd.Series)) else None
+    if token is not None:
+        digest.update(b'tag:' + token.encode('utf-8'))
+    elif isinstance(value, pd.DataFrame):
+        _update_with_frame(digest, value)
+    elif isinstance(value, pd.Series):
+        _update_with_frame(digest, value.to_frame())
+    elif isinstance(value, np.ndarray):
+        digest.update(str(value.dtype).encode('utf-8'))
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        for key in sorted(value, key=repr):
+            digest.update(repr(key).encode('utf-8'))
+            _update_with_value(digest, value[key])
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = sorted(value, key=repr) if isinstance(value, (set, frozenset)) else value
+        digest.update(type(value).__name__.encode('utf-8'))
+        for item in items:
+            _update_with_value(digest, item)
+    else:
+        try:
+            digest.update(pickle.dumps(value, protocol=4))
+        except Exception:
+            digest.update(repr(value).encode('utf-8'))
+
+
+def fingerprint(*parts, **named):
+    """
+    Compute a content fingerprint for a set of inputs
+
+    Parameters:
+    -----------
+    *parts : any
+        Positional inputs (dataframes, arrays, filter dicts, scalars)
+    **named : any
+        Keyword inputs, included with their names
+
+    Returns:
+    --------
+    str
+        Hex digest identifying the inputs
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        _update_with_value(digest, part)
+    for name in sorted(named):
+        digest.update(name.encode('utf-8'))
+        _update_with_value(digest, named[name])
+    return digest.hexdigest()
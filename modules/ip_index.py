@@ -0,0 +1,311 @@
+"""
+Packed IPv4 Columns for DarkSentinel
+Packs dotted-quad address columns into uint32 and answers the explorer's IP
+search (exact addresses, octet prefixes and CIDR blocks) by binary search over
+a sorted index built once per dataset version
+
+In compact frames (see modules/compact.py) uint32 is reserved for packed
+IPv4 columns: the compaction pass only produces signed integers otherwise.
+Use ipv4_strings()/unpack_ipv4_columns() wherever addresses are shown.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .result_cache import cached_result
+
+IPV4_DTYPE = np.dtype(np.uint32)
+
+_MAX_CHARS = len('255.255.255.255')
+_OCTET_STRINGS = np.array([str(i) for i in range(256)], dtype=object)
+
+
+def _factorized(values):
+    """Integer codes (-1 for missing) and the distinct values, reusing categorical codes"""
+    if isinstance(values, pd.Index):
+        values = values.to_series()
+    if isinstance(values, pd.Series) and isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), values.cat.categories
+    return pd.factorize(np.asarray(values, dtype=object), use_na_sentinel=True)
+
+
+def _parse_dotted(strings):
+    """
+    Parse an array of strings as canonical dotted quads, one character column at a time
+
+    The strings are laid out as a fixed-width code-point matrix, so the work
+    is a few vectorized operations per character position (at most 16)
+    instead of a regex or a Python call per string. Leading zeros, missing
+    or extra octets and octets above 255 are rejected, so packing and
+    formatting round-trip exactly.
+    """
+    width = _MAX_CHARS + 1    # one spare column catches longer strings
+    chars = strings.astype(f"U{width}").view(np.uint32).reshape(len(strings), width)
+    n = len(strings)
+    packed = np.zeros(n, dtype=np.int64)
+    octet = np.zeros(n, dtype=np.int32)
+    digits = np.zeros(n, dtype=np.int32)
+    dots = np.zeros(n, dtype=np.int32)
+    ended = np.zeros(n, dtype=bool)
+    valid = np.ones(n, dtype=bool)
+    for position in range(width):
+        char = chars[:, position]
+        value = char - 48                   # wraps around for characters below '0'
+        is_digit = value <= 9
+        is_dot = char == 46
+        is_end = char == 0
+        valid &= (is_digit | is_dot | is_end) & (is_end | ~ended)
+        valid &= ~(is_digit & (digits == 1) & (octet == 0))    # leading zero
+        valid &= ~(is_dot & (digits == 0))
+        ended |= is_end
+        octet[is_digit] = octet[is_digit] * 10 + value[is_digit].astype(np.int32)
+        digits += is_digit
+        valid &= (digits <= 3) & (octet <= 255)
+        if is_dot.any():
+            packed[is_dot] = packed[is_dot] * 256 + octet[is_dot]
+            dots += is_dot
+            octet[is_dot] = 0
+            digits[is_dot] = 0
+    valid &= (dots == 3) & (digits > 0)
+    packed = np.where(valid, packed * 256 + octet, 0).astype(IPV4_DTYPE)
+    return packed, valid
+
+
+def parse_ipv4(values):
+    """
+    Pack dotted-quad strings into uint32
+
+    Each distinct string is parsed once, so repeated addresses cost one
+    lookup per row.
+
+    Parameters:
+    -----------
+    values : pd.Series, pd.Index or array-like
+        Address strings (may be categorical or contain missing values)
+
+    Returns:
+    --------
+    tuple
+        (packed, valid): uint32 array (0 where invalid) and a bool array
+        marking the rows that held a canonical IPv4 address
+    """
+    codes, uniques = _factorized(values)
+    if len(uniques) == 0:
+        return np.zeros(len(codes), dtype=IPV4_DTYPE), np.zeros(len(codes), dtype=bool)
+    packed_unique, valid_unique = _parse_dotted(np.asarray(uniques, dtype=object))
+    present = codes >= 0
+    safe_codes = np.where(present, codes, 0)
+    packed = np.where(present, packed_unique[safe_codes], 0).astype(IPV4_DTYPE)
+    return packed, valid_unique[safe_codes] & present
+
+
+def format_ipv4(packed):
+    """Dotted-quad strings (object array) for an array of packed addresses"""
+    packed = np.asarray(packed, dtype=IPV4_DTYPE)
+    return (_OCTET_STRINGS[packed >> 24] + '.' + _OCTET_STRINGS[(packed >> 16) & 255] + '.'
+            + _OCTET_STRINGS[(packed >> 8) & 255] + '.' + _OCTET_STRINGS[packed & 255])
+
+
+def is_packed_ipv4(values):
+    """True for a packed (uint32) address column"""
+    return getattr(values, 'dtype', None) == IPV4_DTYPE
+
+
+def ipv4_strings(values):
+    """Address strings for a column or index, unpacking it when it is packed"""
+    if not is_packed_ipv4(values):
+        return values
+    strings = format_ipv4(np.asarray(values))
+    if isinstance(values, pd.Series):
+        return pd.Series(strings, index=values.index, name=values.name)
+    if isinstance(values, pd.Index):
+        return pd.Index(strings, name=values.name)
+    return strings
+
+
+def unpack_ipv4_columns(df):
+    """Return df with every packed address column turned back into strings (for display and export)"""
+    packed = [name for name in df.columns if is_packed_ipv4(df[name])]
+    if not packed:
+        return df
+    unpacked = df.copy(deep=False)
+    for name in packed:
+        unpacked[name] = ipv4_strings(df[name])
+    return unpacked
+
+
+def parse_ip_query(text):
+    """
+    Turn an IP search string into ranges of packed addresses
+
+    Accepted forms:
+    - exact address: "10.1.2.3"
+    - whole-octet prefix: "10.1." or "10.1.2."
+    - prefix ending in a partial octet: "10.1" also matches 10.10-19.x.x and
+      10.100-199.x.x, like typing into a substring search would
+    - CIDR block: "10.1.0.0/16" (missing octets count as 0, e.g. "10/8")
+
+    Returns:
+    --------
+    list of tuple or None
+        Sorted, non-overlapping (low, high) ranges, or None if text is not
+        an address query
+    """
+    text = (text or '').strip()
+    if not text:
+        return None
+    if '/' in text:
+        address, _, bits = text.partition('/')
+        octets = address.split('.')
+        if not bits.isdigit() or not 0 <= int(bits) <= 32 or len(octets) > 4:
+            return None
+        if not all(o.isdigit() and int(o) <= 255 for o in octets):
+            return None
+        base = 0
+        for position, octet in enumerate(octets):
+            base |= int(octet) << (24 - 8 * position)
+        mask = (0xFFFFFFFF << (32 - int(bits))) & 0xFFFFFFFF
+        low = base & mask
+        return [(low, low | (~mask & 0xFFFFFFFF))]
+
+    trailing_dot = text.endswith('.')
+    octets = text.rstrip('.').split('.')
+    if len(octets) > 4 or (trailing_dot and len(octets) == 4):
+        return None
+    if not all(o.isdigit() and len(o) <= 3 for o in octets):
+        return None
+    complete, partial = (octets, None) if trailing_dot or len(octets) == 4 else (octets[:-1], octets[-1])
+    if not all(int(o) <= 255 for o in complete):
+        return None
+
+    def block(prefix):
+        base = 0
+        for position, octet in enumerate(prefix):
+            base |= int(octet) << (24 - 8 * position)
+        span = 1 << (32 - 8 * len(prefix))
+        return base, base + span - 1
+
+    if partial is None:
+        return [block(complete)]
+    candidates = [v for v in range(256) if str(v).startswith(partial)]
+    if not candidates:
+        return None
+    ranges = []
+    for value in candidates:
+        low, high = block(complete + [str(value)])
+        if ranges and ranges[-1][1] + 1 == low:
+            ranges[-1] = (ranges[-1][0], high)
+        else:
+            ranges.append((low, high))
+    return ranges
+
+
+class IPv4Index:
+    """
+    Sorted packed addresses with the row labels they came from
+
+    One index can cover several columns (e.g. source and destination); a
+    search returns each matching row label once.
+    """
+
+    __slots__ = ('values', 'labels')
+
+    def __init__(self, packed, labels):
+        order = np.argsort(packed, kind='stable')
+        self.values = np.asarray(packed, dtype=IPV4_DTYPE)[order]
+        self.labels = np.asarray(labels)[order]
+
+    def __len__(self):
+        return len(self.values)
+
+    def search(self, ranges):
+        """
+        Row labels whose address falls into any of the (low, high) ranges
+
+        Returns:
+        --------
+        np.ndarray
+            Sorted, distinct row labels
+        """
+        hits = [
+            self.labels[np.searchsorted(self.values, low, 'left'):np.searchsorted(self.values, high, 'right')]
+            for low, high in ranges
+        ]
+        if not hits:
+            return self.labels[:0]
+        return np.unique(np.concatenate(hits))
+
+
+@cached_result('index')
+def build_ip_index(df, columns):
+    """
+    Build the IPv4 index over the given address columns of a dataset
+
+    Cached per dataset version, so it is sorted once and then shared by
+    every search and session.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Dataset (packed or string address columns)
+    columns : tuple of str
+        Address columns to index; missing ones are skipped
+
+    Returns:
+    --------
+    IPv4Index
+    """
+    labels = df.index.to_numpy()
+    packed_parts, label_parts = [], []
+    for name in columns:
+        if name not in df.columns:
+            continue
+        column = df[name]
+        if is_packed_ipv4(column):
+            packed, valid = column.to_numpy(), slice(None)
+        else:
+            packed, valid = parse_ipv4(column)
+        packed_parts.append(packed[valid])
+        label_parts.append(labels[valid])
+    if not packed_parts:
+        return IPv4Index(np.zeros(0, dtype=IPV4_DTYPE), labels[:0])
+    return IPv4Index(np.concatenate(packed_parts), np.concatenate(label_parts))
+
+
+def search_ip(df, query, columns, base=None):
+    """
+    Rows of df with an address in any of columns matching an IP search
+
+    Address queries (see parse_ip_query) are answered from the cached index
+    of base, the dataset df was filtered from, so changing the search text
+    never rescans the frame. Any other text falls back to a case-insensitive
+    substring match through the trigram index (see modules/text_index.py).
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Rows to search (labels must come from base)
+    query : str
+        Search box text
+    columns : sequence of str
+        Address columns, e.g. ('attacker_ip', 'target_ip')
+    base : pd.DataFrame, optional
+        Full dataset to index (defaults to df)
+
+    Returns:
+    --------
+    pd.DataFrame
+        Matching rows of df
+    """
+    base = base if base is not None else df
+    return df[df.index.isin(ip_search_rows(base, query, columns))]
+
+
+def ip_search_rows(base, query, columns):
+    """Labels of the rows of base matching an IP search (see search_ip); a label may repeat"""
+    columns = tuple(c for c in columns if c in base.columns)
+    ranges = parse_ip_query(query)
+    if ranges is None:
+        from .text_index import text_search_rows
+        return text_search_rows(base, query, columns)
+    return build_ip_index(base, columns).search(ranges)
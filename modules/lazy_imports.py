@@ -0,0 +1,103 @@
+"""
+Lazy Imports for DarkSentinel
+Defers heavy third-party modules (Plotly, scikit-learn) until first attribute
+access, so an entry point only pays the import cost of what it actually uses
+
+Usage:
+    px = lazy_module('plotly.express')   # nothing is imported yet
+    px.bar(...)                           # imported here, once
+"""
+
+import importlib
+import sys
+import threading
+import types
+
+_import_lock = threading.RLock()
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stand-in for a module that imports the real one on first attribute access
+
+    After loading, the real module's namespace is copied in, so later lookups
+    are plain attribute reads that never reach __getattr__ again.
+    """
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__['_lazy_target'] = None
+
+    def _load(self):
+        target = self.__dict__['_lazy_target']
+        if target is None:
+            # Sessions run on separate threads; import exactly once
+            with _import_lock:
+                target = self.__dict__['_lazy_target']
+                if target is None:
+                    target = importlib.import_module(self.__name__)
+                    self.__dict__.update(target.__dict__)
+                    self.__dict__['_lazy_target'] = target
+        return target
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self.__dict__['_lazy_target'] is not None else 'not loaded'
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_module(name):
+    """
+    Return a module proxy that imports name on first use
+
+    Parameters:
+    -----------
+    name : str
+        Fully qualified module name, e.g. 'plotly.express'
+
+    Returns:
+    --------
+    module
+        The real module when it is already imported, otherwise a LazyModule
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+
+def lazy_submodules(package, submodules):
+    """
+    PEP 562 module __getattr__ / __dir__ for a package of lazy submodules
+
+    Parameters:
+    -----------
+    package : str
+        The package's __name__
+    submodules : iterable of str
+        Submodule names imported on first attribute access
+
+    Returns:
+    --------
+    tuple
+        (__getattr__, __dir__) to assign in the package's __init__
+    """
+    submodules = frozenset(submodules)
+
+    def __getattr__(name):
+        if name in submodules:
+            # import_module also binds the submodule on the package, so this
+            # hook only runs on the first access
+            return importlib.import_module(f"{package}.{name}")
+        raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+    def __dir__():
+        package_module = sys.modules[package]
+        return sorted(set(vars(package_module)) | submodules)
+
+    return __getattr__, __dir__
@@ -0,0 +1,314 @@
+"""
+Metrics Registry for DarkSentinel
+Process-wide counters, gauges and latency histograms that the loaders,
+filters, anomaly module and figure factories report into, exposed in the
+Prometheus text format on a local port next to Streamlit's _stcore/health
+"""
+
+import bisect
+import logging
+import math
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+METRICS_PORT_ENV = 'DARKSENTINEL_METRICS_PORT'
+METRICS_ADDRESS_ENV = 'DARKSENTINEL_METRICS_ADDRESS'
+DEFAULT_METRICS_ADDRESS = '127.0.0.1'
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds; spans sub-millisecond cache hits up to cold loads of large files
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+logger = logging.getLogger(__name__)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs += [f'{name}="{_escape(value)}"' for name, value in extra]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if value == -math.inf:
+        return '-Inf'
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """
+    Base of the metric types: a name, help text and a set of label names
+
+    A metric either holds values recorded with inc/set/observe, or gets
+    them from a callback at scrape time (for state that already lives
+    elsewhere, such as the result cache's counters).
+    """
+
+    kind = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=(), callback=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self):
+        """(suffix, label values, extra labels, value) tuples for exposition"""
+        if self.callback is not None:
+            try:
+                collected = self.callback()
+            except Exception:
+                logger.exception("Metric callback for %s failed", self.name)
+                return []
+            if not isinstance(collected, dict):
+                collected = {(): collected}
+            return [('', tuple(str(v) for v in key), (), value) for key, value in collected.items()]
+        with self._lock:
+            return [('', key, (), value) for key, value in self._values.items()]
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, key, extra, value in self.samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(self.labelnames, key, extra)} "
+                         f"{_format_value(value)}")
+        return '\n'.join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing count"""
+
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    """Value that can go up and down"""
+
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    """Distribution of observed values over fixed buckets"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket (non-cumulative) counts, then sum and count
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def samples(self):
+        with self._lock:
+            snapshot = [(key, list(state[0]), state[1], state[2]) for key, state in self._values.items()]
+        samples = []
+        for key, counts, total, count in snapshot:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                samples.append(('_bucket', key, (('le', _format_value(float(bound))),), cumulative))
+            samples.append(('_sum', key, (), total))
+            samples.append(('_count', key, (), count))
+        return samples
+
+
+class Registry:
+    """Named collection of metrics rendered together"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, documentation, labelnames=(), callback=None):
+        return self.register(Counter(name, documentation, labelnames, callback))
+
+    def gauge(self, name, documentation, labelnames=(), callback=None):
+        return self.register(Gauge(name, documentation, labelnames, callback))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name):
+        return self._metrics.get(name)
+
+    def expose(self):
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(metric.expose() for metric in metrics) + '\n'
+
+
+REGISTRY = Registry()
+
+
+# -- scrape-time collectors -----------------------------------------------
+
+def _cache_events():
+    from .result_cache import get_result_cache
+    stats = get_result_cache().stats()
+    return {(event,): stats[event] for event in ('evictions', 'spills', 'expirations', 'invalidations')}
+
+
+def _cache_bytes():
+    from .result_cache import get_result_cache
+    stats = get_result_cache().stats()
+    return {('memory',): stats['memory_bytes'], ('disk',): stats['disk_bytes']}
+
+
+def _resident_bytes():
+    from .result_cache import get_result_cache
+    return {(kind,): nbytes for kind, nbytes in get_result_cache().resident_bytes().items()}
+
+
+def _resident_dataset_bytes():
+    from .result_cache import get_result_cache
+    return get_result_cache().resident_bytes().get('dataset', 0)
+
+
+def _active_sessions():
+    try:
+        from streamlit.runtime import Runtime
+        if not Runtime.exists():
+            return 0
+        return Runtime.instance()._session_mgr.num_active_sessions()
+    except Exception:
+        return 0
+
+
+STAGE_SECONDS = REGISTRY.histogram(
+    'darksentinel_stage_duration_seconds',
+    'Wall time of pipeline stages (loaders, filters, aggregates, anomaly detection, figure factories)',
+    ('stage', 'kind'))
+CACHE_LOOKUPS = REGISTRY.counter(
+    'darksentinel_cache_lookups_total',
+    'Result cache lookups by stage and the tier that answered (memory, disk or miss)',
+    ('stage', 'kind', 'result'))
+RERUN_SECONDS = REGISTRY.histogram(
+    'darksentinel_rerun_duration_seconds', 'Wall time of complete script reruns', ('app',))
+REGISTRY.counter(
+    'darksentinel_cache_events_total', 'Result cache evictions, spills, expirations and invalidations',
+    ('event',), callback=_cache_events)
+REGISTRY.gauge(
+    'darksentinel_cache_bytes', 'Bytes held by each result cache tier', ('tier',), callback=_cache_bytes)
+REGISTRY.gauge(
+    'darksentinel_resident_bytes', 'Bytes of results resident in memory by kind', ('kind',),
+    callback=_resident_bytes)
+REGISTRY.gauge(
+    'darksentinel_resident_dataset_bytes', 'Bytes of loaded datasets resident in memory',
+    callback=_resident_dataset_bytes)
+REGISTRY.gauge(
+    'darksentinel_active_sessions', 'Browser sessions connected to this server',
+    callback=_active_sessions)
+
+
+# -- exposition server ----------------------------------------------------
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = self.registry.expose().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port=None, address=None):
+    """
+    Serve /metrics from a daemon thread (once per process)
+
+    Parameters:
+    -----------
+    port : int, optional
+        Port to listen on; defaults to DARKSENTINEL_METRICS_PORT. Nothing is
+        started when neither is set.
+    address : str, optional
+        Address to bind; defaults to DARKSENTINEL_METRICS_ADDRESS or 127.0.0.1
+
+    Returns:
+    --------
+    ThreadingHTTPServer or None
+    """
+    global _server
+    if port is None:
+        port = os.environ.get(METRICS_PORT_ENV)
+        if not port:
+            return None
+    address = address or os.environ.get(METRICS_ADDRESS_ENV, DEFAULT_METRICS_ADDRESS)
+    with _server_lock:
+        if _server is not None:
+            return _server or None
+        try:
+            _server = ThreadingHTTPServer((address, int(port)), _MetricsHandler)
+        except OSError:
+            # Another replica on this host already serves the port
+            logger.warning("Metrics port %s:%s is in use; not exporting metrics", address, port)
+            _server = False
+            return None
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, name='darksentinel-metrics', daemon=True).start()
+        logger.info("Serving metrics on http://%s:%s/metrics", address, port)
+        return _server
@@ -5,9 +5,11 @@ Handles data cleaning, transformation, and feature engineering
 
 import pandas as pd
 import re
-import streamlit as st
 
-@st.cache_data
+from .result_cache import cached_result
+from .compact import maybe_compact, prune_categories
+
+@cached_result('dataset')
 def preprocess_data(df):
     """
     Preprocess the cybersecurity attack data
@@ -75,7 +77,7 @@ def preprocess_data(df):
         data['City'] = geo_split[0].str.strip() if len(geo_split.columns) > 0 else None
         data['State'] = geo_split[1].str.strip() if len(geo_split.columns) > 1 else None
     
-    return data
+    return maybe_compact(data, 'preprocess.preprocess_data')
 
 def extract_device_os(user_agent):
     """
@@ -108,6 +110,7 @@ def extract_device_os(user_agent):
     
     return 'Unknown'
 
+@cached_result('filter')
 def filter_data(df, filters):
     """
     Apply filters to the dataframe
@@ -147,4 +150,4 @@ def filter_data(df, filters):
     if filters.get('actions') and len(filters['actions']) > 0:
         filtered = filtered[filtered['Action Taken'].isin(filters['actions'])]
     
-    return filtered
+    return prune_categories(filtered)
@@ -0,0 +1,579 @@
+"""
+Result Cache for DarkSentinel
+Project-level cache for loaded datasets, filter results, aggregations and
+figure JSON, with a memory budget, spill-over to local disk that survives
+restarts, cost-aware eviction and hit/miss/eviction counters
+"""
+
+import contextlib
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import sys
+import threading
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock on the cache directory
+    fcntl = None
+
+import numpy as np
+import pandas as pd
+
+from .fingerprint import fingerprint, tag, sources_of
+from .file_watch import SourceWatcher
+from .tracing import timed_call, span_name
+
+CACHE_DIR_ENV = 'DARKSENTINEL_CACHE_DIR'
+MEMORY_BUDGET_ENV = 'DARKSENTINEL_CACHE_MEMORY_MB'
+DISK_BUDGET_ENV = 'DARKSENTINEL_CACHE_DISK_MB'
+
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'darksentinel'
+DEFAULT_MEMORY_MB = 512
+DEFAULT_DISK_MB = 2048
+INDEX_NAME = 'index.json'
+LOCK_NAME = '.lock'
+SAMPLE_SIZE = 200  # object values sampled per column when estimating sizes
+
+
+def estimate_nbytes(value):
+    """
+    Cheaply estimate the in-memory size of a cached value
+
+    Object (string) columns are estimated from a small sample instead of
+    walking every element like memory_usage(deep=True) does. Also used for
+    the memory figure of the get_data_summary functions.
+    """
+    if isinstance(value, pd.DataFrame):
+        total = int(value.index.memory_usage())
+        for name in value.columns:
+            total += estimate_nbytes(value[name])
+        return total
+    if isinstance(value, pd.Series):
+        values = value.array
+        # Arrow-backed strings and categoricals report exact buffer sizes;
+        # only Python-object storage needs sampling
+        if value.dtype == object or getattr(value.dtype, 'storage', None) == 'python':
+            n = len(value)
+            if n == 0:
+                return 0
+            sample = value.iloc[np.linspace(0, n - 1, min(n, SAMPLE_SIZE)).astype(int)]
+            per_item = sum(sys.getsizeof(v) for v in sample) / len(sample)
+            return int(n * (8 + per_item))
+        return int(getattr(values, 'nbytes', 8 * len(value)))
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+class CacheEntry:
+    """Metadata (and, when resident, the value) of one cached result"""
+
+    __slots__ = ('key', 'kind', 'value', 'nbytes', 'cost', 'priority', 'version',
+                 'sources', 'expires_at', 'on_disk', 'last_access')
+
+    def __init__(self, key, kind, value, nbytes, cost, sources=(), expires_at=None, version=None):
+        self.key = key
+        self.kind = kind
+        self.value = value
+        self.nbytes = max(int(nbytes), 1)
+        self.cost = max(float(cost), 1e-6)
+        self.priority = 0.0
+        self.version = version if version is not None else time.time_ns()
+        self.sources = frozenset(sources)
+        self.expires_at = expires_at
+        self.on_disk = False
+        self.last_access = time.time()
+
+    @property
+    def expired(self):
+        return self.expires_at is not None and time.time() > self.expires_at
+
+    @property
+    def token(self):
+        """Fingerprint token for results derived from this entry"""
+        return f"{self.key}@{self.version}"
+
+    def to_index(self):
+        return {
+            'kind': self.kind, 'nbytes': self.nbytes, 'cost': self.cost,
+            'version': self.version, 'sources': sorted(self.sources),
+            'expires_at': self.expires_at, 'last_access': self.last_access,
+        }
+
+
+@contextlib.contextmanager
+def _directory_lock(directory):
+    """
+    Exclusive lock on a cache directory shared by several processes
+
+    Replicas and worker processes spill into the same directory; the index
+    rebuild, the disk budget pass and the index write happen under this lock.
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(directory / LOCK_NAME, 'a') as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+class ResultCache:
+    """
+    Two-tier (memory, then disk) result cache with cost-aware eviction
+
+    Eviction follows GreedyDual-Size: every access sets an entry's priority
+    to L + cost / size, where cost is the measured recompute time and L is
+    the priority of the last evicted entry. Cheap-to-recompute bytes go
+    first, and entries that have not been touched for a while age out as L
+    rises. Entries evicted from memory are spilled to disk. Entries evicted
+    from the disk tier are deleted.
+
+    The disk tier may be shared with other processes. Its index is rebuilt
+    from the files actually on disk whenever it changes, so every process
+    sees (and budgets) the entries the others spilled.
+    """
+
+    def __init__(self, memory_budget=None, disk_budget=None, directory=None):
+        mb = 1024 ** 2
+        self.memory_budget = memory_budget if memory_budget is not None else \
+            float(os.environ.get(MEMORY_BUDGET_ENV, DEFAULT_MEMORY_MB)) * mb
+        self.disk_budget = disk_budget if disk_budget is not None else \
+            float(os.environ.get(DISK_BUDGET_ENV, DEFAULT_DISK_MB)) * mb
+        self.directory = Path(directory or os.environ.get(CACHE_DIR_ENV, DEFAULT_CACHE_DIR))
+        self._lock = threading.RLock()
+        self._memory = {}
+        self._disk = {}
+        self._inflation = 0.0
+        self._memory_bytes = 0
+        self._disk_bytes = 0
+        self.counters = {
+            'hits': 0, 'disk_hits': 0, 'misses': 0,
+            'evictions': 0, 'spills': 0, 'expirations': 0, 'invalidations': 0,
+        }
+        if self.directory.exists():
+            self._sync_disk()
+
+    # -- disk index -------------------------------------------------------
+
+    def _path(self, key):
+        return self.directory / f"{key}.pkl"
+
+    def _rebuild_index(self):
+        """
+        Rebuild the disk tier from the files in the cache directory
+
+        Metadata comes from this process's own records, then from the shared
+        index. Files neither knows about (e.g. left behind by a process that
+        died before writing the index) are kept at the lowest priority, so the
+        budget pass deletes them first.
+        """
+        try:
+            index = json.loads((self.directory / INDEX_NAME).read_text())
+        except (OSError, ValueError):
+            index = {}
+        disk = {}
+        for path in self.directory.glob('*.pkl'):
+            key = path.stem
+            entry = self._disk.get(key)
+            if entry is None:
+                meta = index.get(key)
+                if meta is not None:
+                    entry = CacheEntry(key, meta['kind'], None, meta['nbytes'], meta['cost'],
+                                       meta.get('sources', ()), meta.get('expires_at'),
+                                       meta.get('version'))
+                    entry.last_access = meta.get('last_access', entry.last_access)
+                    entry.priority = entry.cost / entry.nbytes
+                else:
+                    try:
+                        stat = path.stat()
+                    except OSError:
+                        continue
+                    entry = CacheEntry(key, 'orphan', None, stat.st_size, 0.0)
+                    entry.last_access = stat.st_mtime
+                entry.on_disk = True
+            disk[key] = entry
+        self._disk = disk
+        self._disk_bytes = sum(entry.nbytes for entry in disk.values())
+
+    def _write_index(self):
+        index = {key: entry.to_index() for key, entry in self._disk.items()}
+        staging = self.directory / f".{INDEX_NAME}.{os.getpid()}"
+        staging.write_text(json.dumps(index))
+        os.replace(staging, self.directory / INDEX_NAME)
+
+    def _sync_disk(self):
+        """Merge the shared directory into the disk tier, enforce the disk budget and write the index"""
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with _directory_lock(self.directory):
+                self._rebuild_index()
+                self._enforce_disk_budget()
+                self._write_index()
+        except OSError:
+            pass
+
+    # -- tiers ------------------------------------------------------------
+
+    def _touch(self, entry):
+        entry.last_access = time.time()
+        entry.priority = self._inflation + entry.cost / entry.nbytes
+
+    def _spill(self, entry):
+        """Move an entry from memory to disk; returns False if it cannot be pickled"""
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self._path(entry.key)
+            staging = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(staging, 'wb') as handle:
+                pickle.dump(entry.value, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(staging, path)
+        except Exception:
+            return False
+        # A separate value-less record, so callers still holding the memory
+        # entry keep a usable value
+        spilled = CacheEntry(entry.key, entry.kind, None, entry.nbytes, entry.cost,
+                             entry.sources, entry.expires_at, entry.version)
+        spilled.priority = entry.priority
+        spilled.last_access = entry.last_access
+        spilled.on_disk = True
+        self._disk[entry.key] = spilled
+        self._disk_bytes += spilled.nbytes
+        self.counters['spills'] += 1
+        self._sync_disk()
+        return True
+
+    def _drop_disk(self, key):
+        entry = self._disk.pop(key, None)
+        if entry is not None:
+            self._disk_bytes -= entry.nbytes
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+
+    def _drop_memory(self, key):
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._memory_bytes -= entry.nbytes
+        return entry
+
+    def _enforce_memory_budget(self):
+        while self._memory_bytes > self.memory_budget and self._memory:
+            victim = min(self._memory.values(), key=lambda e: e.priority)
+            self._inflation = victim.priority
+            self._drop_memory(victim.key)
+            self.counters['evictions'] += 1
+            if victim.key in self._disk:
+                # Promoted from disk earlier; the spilled copy is still valid
+                self._disk[victim.key].priority = victim.priority
+            else:
+                self._spill(victim)
+
+    def _enforce_disk_budget(self):
+        while self._disk_bytes > self.disk_budget and self._disk:
+            victim = min(self._disk.values(), key=lambda e: e.priority)
+            self._drop_disk(victim.key)
+            self.counters['evictions'] += 1
+
+    # -- public API -------------------------------------------------------
+
+    def get(self, key):
+        """
+        Look up a key in memory, then on disk
+
+        Returns:
+        --------
+        CacheEntry or None
+            The entry with its value loaded, or None on a miss
+        """
+        return self.lookup(key)[0]
+
+    def lookup(self, key):
+        """
+        Like get(), but also report which tier answered
+
+        Returns:
+        --------
+        tuple
+            (entry, tier) where tier is 'memory', 'disk' or 'miss'
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry.expired:
+                    self._drop_memory(key)
+                    self.counters['expirations'] += 1
+                else:
+                    self._touch(entry)
+                    self.counters['hits'] += 1
+                    return entry, 'memory'
+
+            entry = self._disk.get(key)
+            if entry is not None:
+                if entry.expired:
+                    self._drop_disk(key)
+                    self._sync_disk()
+                    self.counters['expirations'] += 1
+                else:
+                    try:
+                        with open(self._path(key), 'rb') as handle:
+                            value = pickle.load(handle)
+                    except Exception:
+                        self._drop_disk(key)
+                        self._sync_disk()
+                        self.counters['misses'] += 1
+                        return None, 'miss'
+                    # Promote back to memory; the disk copy stays valid
+                    promoted = CacheEntry(key, entry.kind, value, entry.nbytes, entry.cost,
+                                          entry.sources, entry.expires_at, entry.version)
+                    self._memory[key] = promoted
+                    self._memory_bytes += promoted.nbytes
+                    self._touch(promoted)
+                    self.counters['disk_hits'] += 1
+                    self._enforce_memory_budget()
+                    return promoted, 'disk'
+
+            self.counters['misses'] += 1
+            return None, 'miss'
+
+    def put(self, key, value, kind='result', cost=0.0, ttl=None, sources=()):
+        """
+        Store a value under key
+
+        Parameters:
+        -----------
+        key : str
+            Cache key
+        value : any
+            Result to cache (must be picklable to be spilled to disk)
+        kind : str
+            'dataset', 'filter', 'aggregate' or 'figure' (for reporting)
+        cost : float
+            Seconds it took to compute the value
+        ttl : float or None
+            Seconds after which the entry expires
+        sources : iterable of str
+            Source files the value was derived from (see invalidate_source)
+
+        Returns:
+        --------
+        CacheEntry
+        """
+        expires_at = time.time() + ttl if ttl is not None else None
+        entry = CacheEntry(key, kind, value, estimate_nbytes(value), cost, sources, expires_at)
+        with self._lock:
+            self._drop_memory(key)
+            if key in self._disk:
+                self._drop_disk(key)
+                self._sync_disk()
+            self._memory[key] = entry
+            self._memory_bytes += entry.nbytes
+            self._touch(entry)
+            self._enforce_memory_budget()
+        return entry
+
+    def invalidate_source(self, source):
+        """Drop every entry derived from a source file; returns the number dropped"""
+        source = str(source)
+        with self._lock:
+            keys = [k for k, e in self._memory.items() if source in e.sources]
+            disk_keys = [k for k, e in self._disk.items() if source in e.sources]
+            for key in keys:
+                self._drop_memory(key)
+            for key in disk_keys:
+                self._drop_disk(key)
+            if disk_keys:
+                self._sync_disk()
+            dropped = len(set(keys) | set(disk_keys))
+            self.counters['invalidations'] += dropped
+            return dropped
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._memory):
+                self._drop_memory(key)
+            for key in list(self._disk):
+                self._drop_disk(key)
+            self._sync_disk()
+
+    def resident_bytes(self):
+        """Bytes of memory-resident entries, by kind"""
+        with self._lock:
+            totals = {}
+            for entry in self._memory.values():
+                totals[entry.kind] = totals.get(entry.kind, 0) + entry.nbytes
+            return totals
+
+    def stats(self):
+        """Hit/miss/eviction counters and current tier sizes"""
+        with self._lock:
+            lookups = self.counters['hits'] + self.counters['disk_hits'] + self.counters['misses']
+            stats = dict(self.counters)
+            stats.update({
+                'hit_rate': (self.counters['hits'] + self.counters['disk_hits']) / lookups if lookups else 0.0,
+                'memory_entries': len(self._memory),
+                'memory_bytes': self._memory_bytes,
+                'disk_entries': len(self._disk),
+                'disk_bytes': self._disk_bytes,
+            })
+            return stats
+
+
+_cache = None
+_watcher = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache():
+    """Return the process-wide result cache"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResultCache()
+        return _cache
+
+
+def get_source_watcher():
+    """Return the process-wide watcher that invalidates results of changed source files"""
+    global _watcher
+    cache = get_result_cache()
+    with _cache_lock:
+        if _watcher is None:
+            _watcher = SourceWatcher(on_change=cache.invalidate_source)
+        return _watcher
+
+
+def _resolve_source(source, signature, args, kwargs):
+    """Resolved path of the source file a call reads, or None"""
+    if callable(source):
+        path = source(*args, **kwargs)
+    else:
+        bound = signature.bind_partial(*args, **kwargs)
+        bound.apply_defaults()
+        path = bound.arguments.get(source)
+    if path is None or not Path(path).exists():
+        return None
+    return str(Path(path).resolve())
+
+
+def code_version(fn):
+    """
+    Short hash of the code behind fn, mixed into its cache keys
+
+    Spilled results survive restarts, so a result computed by an older
+    version of the code must not be served after an upgrade. The whole
+    defining module is hashed, which also covers the helpers it calls there.
+    """
+    try:
+        source = inspect.getsource(inspect.getmodule(fn)).encode('utf-8')
+    except (OSError, TypeError):
+        code = fn.__code__
+        source = code.co_code + repr(code.co_names).encode('utf-8')
+    return hashlib.sha1(source).hexdigest()[:12]
+
+
+def cached_result(kind, ttl=None, source=None):
+    """
+    Decorator caching a function's result in the project result cache
+
+    The key is the function's qualified name and code version plus a
+    fingerprint of its arguments. Dataframe results are tagged with their cache token, so
+    passing them on to other cached functions costs nothing to fingerprint.
+    Cached values are shared between callers and must not be mutated.
+
+    Functions that read a file name it with source. The file's path and
+    mtime/size signature become part of the key, so a changed file is
+    reloaded on the next call (and only that file), and the watcher drops
+    the stale result together with everything derived from it.
+
+    Parameters:
+    -----------
+    kind : str
+        'dataset', 'filter', 'aggregate' or 'index'
+    ttl : float, optional
+        Seconds after which results expire
+    source : str or callable, optional
+        Name of the argument holding the source file path, or a function
+        taking the same arguments and returning the path it will read
+    """
+    def decorator(fn):
+        name = f"{fn.__module__}.{fn.__qualname__}@{code_version(fn)}"
+        signature = inspect.signature(fn)
+
+        label = span_name(fn)
+
+        def cached_call(args, kwargs):
+            cache = get_result_cache()
+            path = file_sig = None
+            if source is not None:
+                path = _resolve_source(source, signature, args, kwargs)
+                if path is not None:
+                    file_sig = get_source_watcher().check(path)
+            key = fingerprint(name, *args, _source=(path, file_sig), **kwargs)
+            entry, tier = cache.lookup(key)
+            if entry is None:
+                started = time.perf_counter()
+                value = fn(*args, **kwargs)
+                sources = sources_of(*args, kwargs)
+                if path is not None:
+                    sources |= {path}
+                entry = cache.put(key, value, kind=kind, cost=time.perf_counter() - started,
+                                  ttl=ttl, sources=sources)
+            if path is not None:
+                get_source_watcher().track(path, file_sig)
+            return tag(entry.value, entry.token, entry.sources), tier
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return timed_call(label, kind, cached_call, args, kwargs)
+
+        wrapper.cache_kind = kind
+        return wrapper
+    return decorator
+
+
+def cached_figure(fn):
+    """
+    Decorator caching a Plotly figure factory as figure JSON
+
+    Each call returns a fresh Figure rebuilt from the cached JSON, so callers
+    may still update the layout of what they receive.
+    """
+    name = f"{fn.__module__}.{fn.__qualname__}@{code_version(fn)}"
+    label = span_name(fn)
+
+    def cached_call(args, kwargs):
+        import plotly.io as pio
+
+        cache = get_result_cache()
+        key = fingerprint(name, *args, **kwargs)
+        entry, tier = cache.lookup(key)
+        if entry is not None:
+            return pio.from_json(entry.value), tier
+        started = time.perf_counter()
+        figure = fn(*args, **kwargs)
+        if figure is not None:
+            cache.put(key, figure.to_json(), kind='figure', cost=time.perf_counter() - started,
+                      sources=sources_of(*args, kwargs))
+        return figure, tier
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        return timed_call(label, 'figure', cached_call, args, kwargs)
+
+    wrapper.cache_kind = 'figure'
+    return wrapper
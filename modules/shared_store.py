@@ -0,0 +1,212 @@
+"""
+Shared-Memory Dataset Store for DarkSentinel
+Publishes a loaded dataframe once as memory-mapped column files so that every
+Streamlit server process on the host attaches to the same pages read-only,
+instead of each replica holding its own private copy of the dataset
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .fingerprint import fingerprint
+from .tracing import traced
+
+SHARED_STORE_ENV = 'DARKSENTINEL_SHARED_STORE'
+MANIFEST_NAME = 'manifest.json'
+
+
+def shared_store_dir():
+    """
+    Return the directory holding published datasets, or None when disabled
+
+    The store is enabled by setting DARKSENTINEL_SHARED_STORE to "1" (use
+    /dev/shm when available) or to an explicit directory path.
+    """
+    setting = os.environ.get(SHARED_STORE_ENV, '').strip()
+    if setting.lower() in ('', '0', 'false', 'no', 'off'):
+        return None
+    if setting.lower() in ('1', 'true', 'yes', 'on'):
+        base = Path('/dev/shm') if Path('/dev/shm').is_dir() else Path(tempfile.gettempdir())
+        return base / 'darksentinel'
+    return Path(setting)
+
+
+def is_enabled():
+    """True when the shared-memory loader mode is switched on"""
+    return shared_store_dir() is not None
+
+
+def dataset_key(name, source, *more_sources):
+    """
+    Build a store key for a dataset derived from one or more source files
+
+    The key names the files (by resolved path) and changes whenever one of
+    them is modified, so replicas never attach to a stale publication and
+    different files never share one. Files that do not exist count as absent.
+    """
+    sources = [path for path in (source,) + more_sources if path is not None]
+    if not sources:
+        return f"{name}-nosource"
+    signatures = []
+    for path in sources:
+        try:
+            stat = os.stat(path)
+            signatures.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signatures.append(None)
+    paths = [str(Path(path).resolve()) for path in sources]
+    # publish_frame() treats everything before the last '-' as the dataset, so
+    # a new version of the same files replaces the old one
+    return f"{name}-{fingerprint(*paths)}-{fingerprint(*signatures)}"
+
+
+def _encode_column(series):
+    """Split a column into a fixed-width array plus the metadata to rebuild it"""
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        return np.asarray(series.cat.codes), {'kind': 'categorical', 'categories': series.cat.categories,
+                                               'ordered': bool(dtype.ordered)}
+    if dtype.kind == 'M' and getattr(dtype, 'tz', None) is None:
+        return series.to_numpy(dtype='datetime64[ns]').view('int64'), {'kind': 'datetime'}
+    if dtype.kind == 'm':
+        return series.to_numpy(dtype='timedelta64[ns]').view('int64'), {'kind': 'timedelta'}
+    if isinstance(dtype, np.dtype) and dtype.kind in 'biuf':
+        return series.to_numpy(), {'kind': 'numeric'}
+    # Strings and anything else are dictionary-encoded: the integer codes are
+    # shared, only the (small) dictionary of distinct values is per process
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    codes = codes.astype(np.int32 if len(uniques) > np.iinfo(np.int16).max else np.int16)
+    return codes, {'kind': 'dictionary', 'categories': pd.Index(uniques), 'ordered': False}
+
+
+def _decode_column(array, meta):
+    """Rebuild a column around a memory-mapped array without copying it"""
+    kind = meta['kind']
+    if kind == 'datetime':
+        return array.view('datetime64[ns]')
+    if kind == 'timedelta':
+        return array.view('timedelta64[ns]')
+    if kind in ('categorical', 'dictionary'):
+        dtype = pd.CategoricalDtype(meta['categories'], ordered=meta['ordered'])
+        return pd.Categorical.from_codes(array, dtype=dtype, validate=False)
+    return array
+
+
+@traced
+def publish_frame(df, key, directory=None):
+    """
+    Write a dataframe into the store under key
+
+    Columns are written to a private staging directory which is then renamed
+    into place, so concurrent publishers never expose a partial dataset. Older
+    publications of the same dataset are removed; processes still attached to
+    them keep their mappings until they let go.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Dataframe to publish
+    key : str
+        Store key from dataset_key()
+    directory : Path, optional
+        Store directory (defaults to shared_store_dir())
+
+    Returns:
+    --------
+    Path
+        Directory of the publication
+    """
+    root = Path(directory) if directory is not None else shared_store_dir()
+    root.mkdir(parents=True, exist_ok=True)
+    target = root / key
+    if (target / MANIFEST_NAME).exists():
+        return target
+
+    staging = Path(tempfile.mkdtemp(prefix=f".{key}-", dir=root))
+    try:
+        columns = []
+        for position, name in enumerate(df.columns):
+            array, meta = _encode_column(df[name])
+            file_name = f"c{position}.npy"
+            np.save(staging / file_name, np.ascontiguousarray(array), allow_pickle=False)
+            if 'categories' in meta:
+                meta['categories'].to_series().to_pickle(staging / f"c{position}.categories.pkl")
+            columns.append({
+                'name': name,
+                'file': file_name,
+                'kind': meta['kind'],
+                'ordered': meta.get('ordered', False),
+            })
+        if not isinstance(df.index, pd.RangeIndex):
+            df.index.to_series().to_pickle(staging / 'index.pkl')
+        manifest = {'rows': len(df), 'columns': columns}
+        (staging / MANIFEST_NAME).write_text(json.dumps(manifest, default=str))
+        try:
+            os.rename(staging, target)
+        except OSError:
+            # Another process won the race; its publication is equivalent
+            shutil.rmtree(staging, ignore_errors=True)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    prefix = key.rsplit('-', 1)[0] + '-'
+    for stale in root.glob(f"{prefix}*"):
+        if stale.name != key and not stale.name.startswith('.'):
+            shutil.rmtree(stale, ignore_errors=True)
+    return target
+
+
+@traced
+def attach_frame(key, directory=None):
+    """
+    Attach to a published dataframe read-only, or return None if absent
+
+    Every column is backed by a memory-mapped file, so the pages are shared
+    between all processes that attach to the same key.
+    """
+    root = Path(directory) if directory is not None else shared_store_dir()
+    if root is None:
+        return None
+    target = root / key
+    manifest_path = target / MANIFEST_NAME
+    if not manifest_path.exists():
+        return None
+
+    manifest = json.loads(manifest_path.read_text())
+    data = {}
+    for position, column in enumerate(manifest['columns']):
+        array = np.load(target / column['file'], mmap_mode='r', allow_pickle=False)
+        meta = {'kind': column['kind'], 'ordered': column.get('ordered', False)}
+        if column['kind'] in ('categorical', 'dictionary'):
+            meta['categories'] = pd.Index(pd.read_pickle(target / f"c{position}.categories.pkl"))
+        data[column['name']] = _decode_column(array, meta)
+
+    index = None
+    if (target / 'index.pkl').exists():
+        index = pd.Index(pd.read_pickle(target / 'index.pkl'))
+    # copy=False keeps each column on its own memory-mapped block
+    return pd.DataFrame(data, index=index, copy=False)
+
+
+@traced
+def load_or_publish(key, loader, directory=None):
+    """
+    Attach to the dataset under key, publishing it with loader() first if needed
+
+    The process that publishes also drops its private copy and attaches, so
+    memory use is the same for the first replica as for the rest. loader must
+    not keep its result alive (e.g. in the result cache), or the private copy
+    outlives the publication.
+    """
+    df = attach_frame(key, directory)
+    if df is not None:
+        return df
+    publish_frame(loader(), key, directory)
+    return attach_frame(key, directory)
@@ -0,0 +1,192 @@
+"""
+Trigram Text Index for DarkSentinel
+Answers the explorer's case-insensitive substring searches from a trigram
+index over each column's distinct values, built once per dataset version:
+the query's trigrams narrow the candidates and only those are verified.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .ip_index import format_ipv4, is_packed_ipv4
+from .result_cache import cached_result
+
+GRAM = 3
+MAX_INDEXED_CHARS = 64    # longer values are not indexed and always verified
+_CODE_BITS = 21           # Unicode code points fit in 21 bits, so a trigram fits in an int64
+
+
+def _distinct_values(column):
+    """Per-row codes (-1 for missing) and the distinct values as lowercase strings"""
+    if is_packed_ipv4(column):
+        codes, uniques = pd.factorize(column.to_numpy())
+        return codes, format_ipv4(uniques)
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        codes, uniques = column.cat.codes.to_numpy(), column.cat.categories
+    else:
+        codes, uniques = pd.factorize(column.to_numpy(dtype=object), use_na_sentinel=True)
+    return codes, pd.Index(uniques).astype(str).str.lower().to_numpy(dtype=object)
+
+
+def _trigram_keys(chars):
+    """int64 keys of the trigrams starting at each position of a code-point matrix (0 past the end)"""
+    chars = chars.astype(np.int64)
+    keys = (chars[:, :-2] << (2 * _CODE_BITS)) | (chars[:, 1:-1] << _CODE_BITS) | chars[:, 2:]
+    return np.where(chars[:, 2:] != 0, keys, 0)
+
+
+def _query_keys(query):
+    chars = np.array([[ord(c) for c in query]], dtype=np.int64)
+    return np.unique(_trigram_keys(chars))
+
+
+class TextIndex:
+    """
+    Trigram postings over the distinct values of one column
+
+    Values are lowercased; the postings map each trigram to the sorted ids
+    of the distinct values containing it, and the rows of each value are
+    kept grouped so a match is turned into row labels with a few slices.
+    """
+
+    __slots__ = ('values', 'keys', 'offsets', 'postings', 'unindexed', 'row_offsets', 'row_labels')
+
+    def __init__(self, codes, values, labels):
+        self.values = values
+        n = len(values)
+        lengths = np.fromiter((len(v) for v in values), dtype=np.int64, count=n)
+        self.unindexed = np.flatnonzero(lengths > MAX_INDEXED_CHARS)
+
+        if n:
+            width = int(min(max(lengths.max(), GRAM), MAX_INDEXED_CHARS))
+            chars = values.astype(f"U{width}").view(np.uint32).reshape(n, width)
+            keys = _trigram_keys(chars).ravel()
+            ids = np.repeat(np.arange(n, dtype=np.int32), width - GRAM + 1)
+            present = keys != 0
+            keys, ids = keys[present], ids[present]
+            order = np.argsort(keys, kind='stable')    # ids stay ascending within a key
+            keys, ids = keys[order], ids[order]
+            first = np.ones(len(keys), dtype=bool)
+            first[1:] = (keys[1:] != keys[:-1]) | (ids[1:] != ids[:-1])
+            keys, ids = keys[first], ids[first]
+            starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else np.zeros(0, int)
+            self.keys = keys[starts]
+            self.offsets = np.r_[starts, len(keys)]
+            self.postings = ids
+        else:
+            self.keys = np.zeros(0, dtype=np.int64)
+            self.offsets = np.zeros(1, dtype=np.int64)
+            self.postings = np.zeros(0, dtype=np.int32)
+
+        present = codes >= 0
+        order = np.argsort(codes[present], kind='stable')
+        self.row_labels = np.asarray(labels)[present][order]
+        self.row_offsets = np.r_[0, np.cumsum(np.bincount(codes[present], minlength=n))]
+
+    def __len__(self):
+        return len(self.row_labels)
+
+    def _candidates(self, query):
+        """Ids of the distinct values that can contain query (all of them for short queries)"""
+        if len(query) < GRAM:
+            return np.arange(len(self.values))
+        lists = []
+        for key in _query_keys(query):
+            slot = np.searchsorted(self.keys, key)
+            if slot == len(self.keys) or self.keys[slot] != key:
+                return self.unindexed
+            lists.append(self.postings[self.offsets[slot]:self.offsets[slot + 1]])
+        lists.sort(key=len)
+        candidates = lists[0]
+        for ids in lists[1:]:
+            if not len(candidates):
+                break
+            candidates = np.intersect1d(candidates, ids, assume_unique=True)
+        return np.union1d(candidates, self.unindexed)
+
+    def matching_values(self, query):
+        """Ids of the distinct values containing query (case-insensitive)"""
+        query = query.lower()
+        candidates = self._candidates(query)
+        found = np.fromiter((query in v for v in self.values[candidates]), dtype=bool, count=len(candidates))
+        return candidates[found]
+
+    def search(self, query):
+        """
+        Row labels whose value contains query (case-insensitive)
+
+        Returns:
+        --------
+        np.ndarray
+            Row labels, grouped by value
+        """
+        ids = self.matching_values(query)
+        starts, ends = self.row_offsets[ids], self.row_offsets[ids + 1]
+        used = ends > starts
+        starts, ends = starts[used], ends[used]
+        if not len(starts):
+            return self.row_labels[:0]
+        # Positions of the concatenated [start, end) ranges, as a running sum of steps
+        lengths = ends - starts
+        steps = np.ones(lengths.sum(), dtype=np.int64)
+        steps[0] = starts[0]
+        steps[np.cumsum(lengths)[:-1]] = starts[1:] - ends[:-1] + 1
+        return self.row_labels[np.cumsum(steps)]
+
+
+@cached_result('index')
+def build_text_index(df, column):
+    """
+    Build the trigram index over one text column of a dataset
+
+    Cached per dataset version, so it is built once and then shared by
+    every search and session.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Dataset (text, categorical or packed address column)
+    column : str
+        Column to index
+
+    Returns:
+    --------
+    TextIndex
+    """
+    codes, values = _distinct_values(df[column])
+    return TextIndex(codes, values, df.index.to_numpy())
+
+
+def search_text(df, query, columns, base=None):
+    """
+    Rows of df where any of columns contains query (case-insensitive, not a regex)
+
+    The per-column indexes are built from base, the dataset df was filtered
+    from, so changing the search text never rescans the frame.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Rows to search (labels must come from base)
+    query : str
+        Search box text
+    columns : sequence of str
+        Text columns, e.g. ('User Information',)
+    base : pd.DataFrame, optional
+        Full dataset to index (defaults to df)
+
+    Returns:
+    --------
+    pd.DataFrame
+        Matching rows of df
+    """
+    if not query:
+        return df
+    base = base if base is not None else df
+    return df[df.index.isin(text_search_rows(base, query, columns))]
+
+
+def text_search_rows(base, query, columns):
+    """Labels of the rows of base where any of columns contains query (see search_text); a label may repeat"""
+    labels = [build_text_index(base, name).search(query) for name in columns if name in base.columns]
+    return np.concatenate(labels) if labels else base.index.to_numpy()[:0]
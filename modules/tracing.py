@@ -0,0 +1,348 @@
+"""
+Timing Spans for DarkSentinel
+Lightweight per-rerun timing of dashboard sections and module functions,
+annotated with cache hits, shown in an opt-in sidebar panel and appended to
+a local JSONL trace file for offline analysis
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+from .metrics import STAGE_SECONDS, CACHE_LOOKUPS, RERUN_SECONDS, start_metrics_server
+
+TRACE_FILE_ENV = 'DARKSENTINEL_TRACE_FILE'
+PANEL_ENV = 'DARKSENTINEL_PERF_PANEL'
+PANEL_QUERY_PARAM = 'perf'
+HISTORY_SIZE = 20          # reruns kept per session for the panel
+HISTORY_KEY = '_perf_trace_history'
+
+_local = threading.local()
+_file_lock = threading.Lock()
+
+
+class Span:
+    """One timed section or function call"""
+
+    __slots__ = ('name', 'kind', 'parent', 'depth', 'start', 'end', 'attrs')
+
+    def __init__(self, name, kind, parent, depth, start, attrs):
+        self.name = name
+        self.kind = kind
+        self.parent = parent
+        self.depth = depth
+        self.start = start
+        self.end = None
+        self.attrs = attrs
+
+    @property
+    def duration(self):
+        """Seconds spent in the span (up to now while it is still open)"""
+        end = self.end if self.end is not None else time.perf_counter()
+        return end - self.start
+
+
+class Trace:
+    """
+    Spans recorded during one script rerun
+
+    Sections are sequential top-level spans: starting a section closes the
+    previous one, so an app marks its layout with one call per section and
+    no re-indenting. Function spans nest under whatever is open when they
+    are entered.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.rerun_id = uuid.uuid4().hex[:12]
+        self.started_at = time.time()
+        self.origin = time.perf_counter()
+        self.finished_at = None
+        self.spans = []
+        self._stack = []
+
+    def open(self, name, kind='function', attrs=None):
+        parent = self._stack[-1] if self._stack else None
+        span = Span(name, kind, parent.name if parent is not None else None,
+                    len(self._stack), time.perf_counter(), attrs or {})
+        self.spans.append(span)
+        self._stack.append(span)
+        return span
+
+    def close(self, span):
+        """Close span and anything still open above it on the stack"""
+        now = time.perf_counter()
+        while span in self._stack:
+            top = self._stack.pop()
+            top.end = now
+
+    def section(self, name, **attrs):
+        for span in self._stack:
+            if span.kind == 'section':
+                self.close(span)
+                break
+        return self.open(name, 'section', attrs)
+
+    def finish(self):
+        if self._stack:
+            self.close(self._stack[0])
+        self.finished_at = time.perf_counter()
+
+    @property
+    def current(self):
+        return self._stack[-1] if self._stack else None
+
+    @property
+    def total(self):
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return end - self.origin
+
+    def records(self):
+        """Spans as JSON-serialisable dicts (times in milliseconds from rerun start)"""
+        return [{
+            'app': self.app,
+            'rerun': self.rerun_id,
+            'ts': self.started_at,
+            'name': span.name,
+            'kind': span.kind,
+            'parent': span.parent,
+            'depth': span.depth,
+            'start_ms': round((span.start - self.origin) * 1000, 3),
+            'duration_ms': round(span.duration * 1000, 3),
+            **span.attrs,
+        } for span in self.spans]
+
+
+def current_trace():
+    """The trace of the rerun running on this thread, or None"""
+    return getattr(_local, 'trace', None)
+
+
+@contextmanager
+def span(name, kind='function', **attrs):
+    """
+    Time a block as a span of the current rerun
+
+    Outside a traced rerun (worker processes, headless scripts, background
+    threads) this does nothing beyond one attribute lookup.
+    """
+    trace = current_trace()
+    if trace is None:
+        yield None
+        return
+    opened = trace.open(name, kind, attrs)
+    try:
+        yield opened
+    finally:
+        trace.close(opened)
+
+
+def section(name, **attrs):
+    """Close the current dashboard section span and open the next one"""
+    trace = current_trace()
+    if trace is not None:
+        trace.section(name, **attrs)
+
+
+def annotate(**attrs):
+    """Attach attributes (e.g. cache='hit') to the innermost open span"""
+    trace = current_trace()
+    if trace is not None and trace.current is not None:
+        trace.current.attrs.update(attrs)
+
+
+def span_name(fn):
+    """Short 'module.function' name used for function spans"""
+    return f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__qualname__}"
+
+
+def timed_call(name, kind, call, *args, **kwargs):
+    """
+    Run call(*args, **kwargs) as a span and report its stage latency
+
+    call returns (value, cache tier or None); the tier is recorded on the
+    span and counted in the cache lookup metrics.
+
+    Returns:
+    --------
+    any
+        The value returned by call
+    """
+    trace = current_trace()
+    opened = trace.open(name, attrs={'cache_kind': kind}) if trace is not None else None
+    started = time.perf_counter()
+    try:
+        value, tier = call(*args, **kwargs)
+        if tier is not None:
+            CACHE_LOOKUPS.inc(stage=name, kind=kind, result=tier)
+            if opened is not None:
+                opened.attrs['cache'] = tier
+        return value
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - started, stage=name, kind=kind)
+        if opened is not None:
+            trace.close(opened)
+
+
+def traced(fn):
+    """Decorator timing every call of fn as a function span and stage metric"""
+    name = span_name(fn)
+
+    def call(*args, **kwargs):
+        return fn(*args, **kwargs), None
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        return timed_call(name, 'function', call, *args, **kwargs)
+
+    return wrapper
+
+
+def trace_file():
+    """Path of the JSONL trace file, or None when tracing to disk is off"""
+    path = os.environ.get(TRACE_FILE_ENV)
+    return Path(path) if path else None
+
+
+def write_trace(trace, path=None):
+    """Append the spans of a finished rerun to the JSONL trace file"""
+    path = path or trace_file()
+    if path is None or not trace.spans:
+        return
+    lines = ''.join(json.dumps(record, default=str) + '\n' for record in trace.records())
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with _file_lock, open(path, 'a', encoding='utf-8') as handle:
+            handle.write(lines)
+    except OSError:
+        pass
+
+
+def _session_state():
+    try:
+        import streamlit as st
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        if get_script_run_ctx() is None:
+            return None
+        return st.session_state
+    except Exception:
+        return None
+
+
+@contextmanager
+def trace_rerun(app):
+    """
+    Trace one script rerun of an app
+
+    Wrap the app's main() call. The finished trace is kept in the session
+    for the performance panel and appended to the trace file, also when the
+    rerun ends through st.rerun() or st.stop(). The first rerun also starts
+    the metrics endpoint when DARKSENTINEL_METRICS_PORT is set.
+    """
+    start_metrics_server()
+    trace = Trace(app)
+    _local.trace = trace
+    try:
+        yield trace
+    finally:
+        trace.finish()
+        _local.trace = None
+        RERUN_SECONDS.observe(trace.total, app=app)
+        write_trace(trace)
+        state = _session_state()
+        if state is not None:
+            history = state.get(HISTORY_KEY, [])
+            history.append(trace)
+            state[HISTORY_KEY] = history[-HISTORY_SIZE:]
+
+
+def panel_enabled():
+    """Whether the performance panel was asked for (env var or ?perf=1)"""
+    if os.environ.get(PANEL_ENV, '').lower() in ('1', 'true', 'yes', 'on'):
+        return True
+    try:
+        import streamlit as st
+    except ImportError:
+        return False
+    if hasattr(st, 'query_params'):
+        value = st.query_params.get(PANEL_QUERY_PARAM, '')
+    else:
+        # streamlit < 1.30 only has the experimental API (lists of values)
+        value = st.experimental_get_query_params().get(PANEL_QUERY_PARAM, [''])[0]
+    return value.lower() not in ('', '0', 'false')
+
+
+def section_breakdown(trace):
+    """
+    Per-section totals of a trace
+
+    Returns:
+    --------
+    list of dict
+        One row per section with its time, share of the rerun, number of
+        function calls inside it and how many of those were cache hits
+    """
+    total = trace.total or 1e-9
+    rows = []
+    current = None
+    for span in trace.spans:
+        if span.kind == 'section':
+            current = {'section': span.name, 'ms': span.duration * 1000,
+                       'share': span.duration / total, 'calls': 0, 'cache_hits': 0, 'cache_misses': 0}
+            rows.append(current)
+        elif current is not None:
+            current['calls'] += 1
+            cache = span.attrs.get('cache')
+            if cache in ('memory', 'disk', 'hit', 'ready'):
+                current['cache_hits'] += 1
+            elif cache in ('miss', 'pending'):
+                current['cache_misses'] += 1
+    return rows
+
+
+def render_performance_panel(trace=None):
+    """
+    Render the per-rerun timing breakdown in the sidebar when enabled
+
+    Call at the end of the app, after every section has rendered.
+    """
+    if not panel_enabled():
+        return
+    import pandas as pd
+    import streamlit as st
+
+    trace = trace or current_trace()
+    if trace is None:
+        return
+    trace.section("Performance panel")
+    history = st.session_state.get(HISTORY_KEY, [])
+
+    with st.sidebar.expander("⏱️ Performance", expanded=True):
+        st.caption(f"Rerun {trace.rerun_id}: {trace.total * 1000:,.0f} ms so far")
+        sections = pd.DataFrame(section_breakdown(trace))
+        if not sections.empty:
+            st.dataframe(sections, hide_index=True, use_container_width=True,
+                         column_config={
+                             'ms': st.column_config.NumberColumn(format="%.1f"),
+                             'share': st.column_config.ProgressColumn(min_value=0.0, max_value=1.0),
+                         })
+
+        calls = [s for s in trace.spans if s.kind != 'section']
+        if calls:
+            slowest = sorted(calls, key=lambda s: s.duration, reverse=True)[:15]
+            st.dataframe(pd.DataFrame([{
+                'function': s.name, 'section': s.parent, 'ms': round(s.duration * 1000, 1),
+                'cache': s.attrs.get('cache', ''),
+            } for s in slowest]), hide_index=True, use_container_width=True)
+
+        if history:
+            st.caption("Previous reruns (ms): " + ", ".join(
+                f"{t.total * 1000:,.0f}" for t in history[-10:]))
+        path = trace_file()
+        if path is not None:
+            st.caption(f"Spans are appended to `{path}`")
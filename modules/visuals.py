@@ -3,11 +3,16 @@ Visualization Module for DarkSentinel
 Contains all chart and graph generation functions
 """
 
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import pandas as pd
 
+from .lazy_imports import lazy_module
+from .result_cache import cached_figure
+
+# Plotly is imported on the first figure built, not when the module loads
+px = lazy_module('plotly.express')
+go = lazy_module('plotly.graph_objects')
+plotly_subplots = lazy_module('plotly.subplots')
+
 # Cyber Dark Neon Theme Colors
 COLORS = {
     'background': '#0b0f14',
@@ -29,6 +34,7 @@ PLOTLY_TEMPLATE = {
     }
 }
 
+@cached_figure
 def create_time_series_chart(df, date_col='Date', title='Attacks Over Time'):
     """Create time series chart of attacks with improved scaling and visibility"""
     # Resample to monthly data if we have daily data
@@ -36,13 +42,13 @@ def create_time_series_chart(df, date_col='Date', title='Attacks Over Time'):
         time_data = df.set_index(date_col).resample('M').size().reset_index(name='count')
         time_data[date_col] = time_data[date_col].dt.strftime('%Y-%m')
     else:
-        time_data = df.groupby(date_col).size().reset_index(name='count')
+        time_data = df.groupby(date_col, observed=True).size().reset_index(name='count')
     
     # Calculate 3-month moving average for trend line
     time_data['moving_avg'] = time_data['count'].rolling(window=3, min_periods=1).mean()
     
     # Create figure with secondary y-axis for better scaling
-    fig = make_subplots(specs=[[{"secondary_y": False}]])
+    fig = plotly_subplots.make_subplots(specs=[[{"secondary_y": False}]])
     
     # Add bar chart for actual counts
     fig.add_trace(
@@ -113,6 +119,7 @@ def create_time_series_chart(df, date_col='Date', title='Attacks Over Time'):
     
     return fig
 
+@cached_figure
 def create_attack_type_chart(df, color_by='Year', title='Attack Types Distribution'):
     """Create histogram of attack types"""
     fig = px.histogram(
@@ -127,6 +134,7 @@ def create_attack_type_chart(df, color_by='Year', title='Attack Types Distributi
     
     return fig
 
+@cached_figure
 def create_severity_pie_chart(df, title='Severity Level Distribution'):
     """Create pie chart for severity levels"""
     severity_counts = df['Severity Level'].value_counts()
@@ -143,6 +151,7 @@ def create_severity_pie_chart(df, title='Severity Level Distribution'):
     
     return fig
 
+@cached_figure
 def create_device_os_chart(df, title='Device/OS Distribution'):
     """Create pie chart for device/OS distribution"""
     device_counts = df['Device/OS'].value_counts()
@@ -160,6 +169,7 @@ def create_device_os_chart(df, title='Device/OS Distribution'):
     
     return fig
 
+@cached_figure
 def create_protocol_attack_chart(df, title='Protocol vs Attack Type'):
     """Create histogram of protocols by attack type"""
     fig = px.histogram(
@@ -175,6 +185,7 @@ def create_protocol_attack_chart(df, title='Protocol vs Attack Type'):
     
     return fig
 
+@cached_figure
 def create_action_taken_chart(df, title='Actions Taken Distribution'):
     """Create bar chart for actions taken"""
     action_counts = df['Action Taken'].value_counts()
@@ -192,9 +203,10 @@ def create_action_taken_chart(df, title='Actions Taken Distribution'):
     
     return fig
 
+@cached_figure
 def create_geo_map(df, title='Attack Distribution by Location'):
     """Create geographic scatter map"""
-    geo_data = df.groupby(['City', 'State']).size().reset_index(name='count')
+    geo_data = df.groupby(['City', 'State'], observed=True).size().reset_index(name='count')
     
     # For demonstration, we'll create a simple bar chart of top cities
     # In production, you'd use actual lat/lon coordinates
@@ -215,9 +227,10 @@ def create_geo_map(df, title='Attack Distribution by Location'):
     
     return fig
 
+@cached_figure
 def create_hourly_heatmap(df, title='Attack Patterns by Hour and Day'):
     """Create heatmap of attacks by hour and day of week"""
-    heatmap_data = df.groupby(['DayofWeek', 'Hour']).size().reset_index(name='count')
+    heatmap_data = df.groupby(['DayofWeek', 'Hour'], observed=True).size().reset_index(name='count')
     heatmap_pivot = heatmap_data.pivot(index='DayofWeek', columns='Hour', values='count').fillna(0)
     
     day_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
@@ -239,9 +252,10 @@ def create_hourly_heatmap(df, title='Attack Patterns by Hour and Day'):
     
     return fig
 
+@cached_figure
 def create_monthly_trend_chart(df, title='Monthly Attack Trends'):
     """Create line chart showing monthly trends"""
-    monthly_data = df.groupby(['Year', 'Month']).size().reset_index(name='count')
+    monthly_data = df.groupby(['Year', 'Month'], observed=True).size().reset_index(name='count')
     monthly_data['YearMonth'] = monthly_data['Year'].astype(str) + '-' + monthly_data['Month'].astype(str).str.zfill(2)
     
     fig = px.line(
@@ -258,6 +272,7 @@ def create_monthly_trend_chart(df, title='Monthly Attack Trends'):
     
     return fig
 
+@cached_figure
 def create_browser_traffic_chart(df, title='Traffic Type by Browser'):
     """Create stacked bar chart of traffic types by browser"""
     fig = px.histogram(
@@ -273,6 +288,7 @@ def create_browser_traffic_chart(df, title='Traffic Type by Browser'):
     
     return fig
 
+@cached_figure
 def create_packet_length_distribution(df, title='Packet Length Distribution'):
     """Create histogram of packet lengths"""
     fig = px.histogram(
@@ -288,6 +304,7 @@ def create_packet_length_distribution(df, title='Packet Length Distribution'):
     
     return fig
 
+@cached_figure
 def create_ids_firewall_chart(df, title='IDS/IPS Alerts vs Action Taken'):
     """Create grouped bar chart for IDS alerts and actions"""
     fig = px.histogram(
@@ -303,6 +320,7 @@ def create_ids_firewall_chart(df, title='IDS/IPS Alerts vs Action Taken'):
     
     return fig
 
+@cached_figure
 def create_sankey_diagram(df, title='Attack Flow: Protocol → Attack Type → Action'):
     """Create Sankey diagram showing flow from protocol to attack type to action"""
     # Prepare data for Sankey
@@ -369,6 +387,7 @@ def create_sankey_diagram(df, title='Attack Flow: Protocol → Attack Type → A
     
     return fig
 
+@cached_figure
 def create_anomaly_score_distribution(df, title='Anomaly Score Distribution'):
     """Create histogram of anomaly scores with threshold line"""
     mean_score = df['Anomaly Scores'].mean()
@@ -0,0 +1,234 @@
+"""
+Cache Warm-up for DarkSentinel
+Runs the expensive first-request stages (CSV parsing, schema mapping,
+preprocessing, anomaly training, default-view aggregations and charts) in the
+background when the server boots, and exposes a readiness flag for health checks
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+READY_FILE_ENV = 'DARKSENTINEL_READY_FILE'
+DEFAULT_READY_FILE = '/tmp/darksentinel.ready'
+
+logger = logging.getLogger(__name__)
+
+_warmup_lock = threading.Lock()
+_warmup_thread = None
+
+
+def ready_file():
+    """Path of the readiness flag file polled by the container HEALTHCHECK"""
+    return Path(os.environ.get(READY_FILE_ENV, DEFAULT_READY_FILE))
+
+
+def is_ready():
+    """True once the warm-up for this server has finished"""
+    return ready_file().exists()
+
+
+def mark_ready(details=''):
+    path = ready_file()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"{time.strftime('%Y-%m-%d %H:%M:%S')} {details}".strip() + '\n')
+
+
+def clear_ready():
+    try:
+        ready_file().unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _build_charts(factories):
+    """Build each (name, callable) chart, logging rather than raising on failure"""
+    for name, factory in factories:
+        try:
+            factory()
+        except Exception:
+            logger.exception("Warm-up chart %s failed", name)
+
+
+def _warm_app():
+    """Warm the caches used by app.py (original DarkSentinel dashboard)"""
+    from modules.data_loader import load_data
+    from modules.preprocess import preprocess_data, filter_data
+    from modules.anomaly import run_anomaly_detection
+    from modules.workers import get_worker_pool
+    from modules import visuals
+
+    df = preprocess_data(load_data('cybersecurity_attacks.csv'))
+    filters = {
+        'years': sorted(df['Year'].unique()),
+        'months': sorted(df['Month'].unique()),
+        'attack_types': sorted(df['Attack Type'].unique()),
+        'severity_levels': sorted(df['Severity Level'].unique()),
+        'devices': sorted(df['Device/OS'].unique()),
+        'protocols': sorted(df['Protocol'].unique()),
+    }
+    filtered = filter_data(df, filters)
+
+    pool = get_worker_pool()
+    df_with_anomalies = pool.run(run_anomaly_detection, filtered, contamination=0.1)
+
+    _build_charts([
+        ('attack_type', lambda: visuals.create_attack_type_chart(filtered, color_by='Year')),
+        ('severity_pie', lambda: visuals.create_severity_pie_chart(filtered)),
+        ('time_series', lambda: visuals.create_time_series_chart(filtered)),
+        ('monthly_trend', lambda: visuals.create_monthly_trend_chart(filtered)),
+        ('hourly_heatmap', lambda: visuals.create_hourly_heatmap(filtered)),
+        ('geo_map', lambda: visuals.create_geo_map(filtered)),
+        ('device_os', lambda: visuals.create_device_os_chart(filtered)),
+        ('browser_traffic', lambda: visuals.create_browser_traffic_chart(filtered)),
+        ('protocol_attack', lambda: visuals.create_protocol_attack_chart(filtered)),
+        ('sankey', lambda: visuals.create_sankey_diagram(filtered)),
+        ('packet_length', lambda: visuals.create_packet_length_distribution(filtered)),
+        ('action_taken', lambda: visuals.create_action_taken_chart(filtered)),
+        ('ids_firewall', lambda: visuals.create_ids_firewall_chart(filtered)),
+        ('anomaly_scores', lambda: visuals.create_anomaly_score_distribution(df_with_anomalies)),
+    ])
+
+
+def _warm_app_v2():
+    """Warm the caches used by app_v2.py (cyber command center)"""
+    from modules.shared_store import is_enabled as shared_store_enabled
+    from modules_v2.data_loader_v2 import load_data, load_shared_data, filter_data
+    from modules_v2 import advanced_visuals, live_feed
+
+    df = load_shared_data() if shared_store_enabled() else load_data()
+    filters = {
+        'date_range': (df['timestamp'].min().date(), df['timestamp'].max().date()),
+        'attack_types': sorted(df['attack_type'].unique()),
+        'target_systems': sorted(df['target_system'].unique()),
+        'locations': sorted(df['location'].unique()),
+        'industries': sorted(df['industry'].unique()),
+        'severity_range': (1, 10),
+        'outcomes': sorted(df['outcome'].unique()),
+    }
+    filtered = filter_data(df, filters)
+
+    _build_charts([
+        ('ticker', lambda: live_feed.create_attack_ticker(filtered, n_items=10)),
+        ('top_attacks', lambda: live_feed.create_top_attacks(filtered, n=10)),
+        ('globe', lambda: advanced_visuals.create_3d_globe(filtered)),
+        ('sunburst', lambda: advanced_visuals.create_sunburst_chart(filtered)),
+        ('treemap', lambda: advanced_visuals.create_treemap(filtered)),
+        ('3d_scatter', lambda: advanced_visuals.create_3d_scatter(filtered)),
+        ('mitigation', lambda: advanced_visuals.create_mitigation_chart(filtered)),
+        ('waterfall', lambda: advanced_visuals.create_waterfall_chart(filtered)),
+        ('calendar', lambda: advanced_visuals.create_heatmap_calendar(filtered)),
+        ('sankey', lambda: advanced_visuals.create_sankey_flow(filtered)),
+    ])
+
+
+def _warm_app_final():
+    """Warm the caches used by app_final.py (global threats dashboard)"""
+    from modules.workers import get_worker_pool
+    from modules_v2.data_loader_global import (
+        load_global_data, filter_data, get_yearly_trends, get_defense_effectiveness
+    )
+    from modules_v2 import visuals_global, recent_attacks
+
+    df = load_global_data()
+    years = sorted(df['Year'].unique())
+    filters = {
+        'year_range': (years[0], years[-1]),
+        'countries': sorted(df['Country'].unique()),
+        'attack_types': sorted(df['Attack Type'].unique()),
+        'industries': sorted(df['Target Industry'].unique()),
+        'sources': sorted(df['Attack Source'].unique()),
+        'severity_categories': ['Low', 'Medium', 'High', 'Critical'],
+    }
+    filtered = filter_data(df, filters)
+
+    pool = get_worker_pool()
+    yearly = pool.run(get_yearly_trends, filtered)
+    defense_stats = pool.run(get_defense_effectiveness, filtered)
+
+    _build_charts([
+        ('summary_cards', lambda: recent_attacks.create_attack_summary_cards(filtered)),
+        ('recent_attacks', lambda: recent_attacks.create_recent_attacks_table(filtered, n=10)),
+        ('yearly_trend', lambda: visuals_global.create_yearly_trend_chart(yearly)),
+        ('attack_types', lambda: visuals_global.create_attack_type_distribution(filtered)),
+        ('industry_sunburst', lambda: visuals_global.create_industry_sunburst(filtered)),
+        ('globe', lambda: visuals_global.create_3d_globe_global(filtered)),
+        ('country_heatmap', lambda: visuals_global.create_country_heatmap(filtered)),
+        ('defense', lambda: visuals_global.create_defense_effectiveness_chart(defense_stats)),
+        ('defense_metrics', lambda: visuals_global.create_defense_metrics_comparison(defense_stats)),
+        ('financial', lambda: visuals_global.create_financial_impact_chart(filtered)),
+        ('vulnerability', lambda: visuals_global.create_vulnerability_analysis(filtered)),
+        ('resolution', lambda: visuals_global.create_resolution_time_box(filtered)),
+        ('3d_correlation', lambda: visuals_global.create_3d_attack_correlation(filtered)),
+        ('flow', lambda: visuals_global.create_attack_flow_sankey(filtered)),
+    ])
+
+
+WARMERS = {
+    'app.py': _warm_app,
+    'app_v2.py': _warm_app_v2,
+    'app_final.py': _warm_app_final,
+}
+
+
+def warm_up(script='app_v2.py'):
+    """
+    Run every warm-up stage for a dashboard entry point in this process
+
+    Parameters:
+    -----------
+    script : str
+        Entry point being served ('app.py', 'app_v2.py' or 'app_final.py')
+
+    Returns:
+    --------
+    float
+        Seconds spent warming up
+    """
+    warmer = WARMERS.get(Path(script).name)
+    if warmer is None:
+        raise ValueError(f"No warm-up defined for {script}")
+    started = time.perf_counter()
+    warmer()
+    return time.perf_counter() - started
+
+
+def _run_warmup(script):
+    try:
+        elapsed = warm_up(script)
+        logger.info("Warm-up for %s finished in %.1fs", script, elapsed)
+        mark_ready(f"{script} warm in {elapsed:.1f}s")
+    except Exception:
+        # A failed warm-up must not keep the server out of rotation forever;
+        # the pages still work, the first request is just slower
+        logger.exception("Warm-up for %s failed", script)
+        mark_ready(f"{script} warm-up failed")
+
+
+def start_background_warmup(script='app_v2.py'):
+    """
+    Start the warm-up in a daemon thread (once per process)
+
+    The readiness flag is cleared immediately and set again when the warm-up
+    finishes, so a HEALTHCHECK polling is_ready() keeps traffic away until the
+    caches are hot.
+    """
+    global _warmup_thread
+    with _warmup_lock:
+        if _warmup_thread is not None:
+            return _warmup_thread
+        clear_ready()
+        _warmup_thread = threading.Thread(
+            target=_run_warmup, args=(script,), name='darksentinel-warmup', daemon=True
+        )
+        _warmup_thread.start()
+        return _warmup_thread
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    target = sys.argv[1] if len(sys.argv) > 1 else 'app_v2.py'
+    print(f"Warm-up for {target} took {warm_up(target):.1f}s")
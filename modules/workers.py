@@ -0,0 +1,282 @@
+"""
+Background Worker Pool for DarkSentinel
+Runs CPU-heavy dashboard computations (anomaly training, export
+serialization) in separate processes so a heavy session does not hold the GIL
+on the Streamlit server while other sessions wait for their reruns. Cheap
+aggregates stay inline: shipping their input to a worker costs more than
+computing them.
+"""
+
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import streamlit as st
+
+from .fingerprint import fingerprint
+from .ip_index import unpack_ipv4_columns
+from .tracing import span, span_name
+
+DEFAULT_MAX_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+DEFAULT_MAX_PENDING = 8       # jobs allowed in flight before new ones are refused
+DEFAULT_CACHE_SIZE = 32       # finished results kept, keyed by input fingerprint
+DEFAULT_TIMEOUT = 300         # seconds
+TIMEOUT_BACKOFF = 60          # seconds before a timed-out job may be submitted again
+RERUN_INTERVAL = 0.5          # seconds between polls while jobs are running
+
+
+class Job:
+    """A computation submitted to the worker pool"""
+
+    def __init__(self, key, future, timeout):
+        self.key = key
+        self.future = future
+        self.timeout = timeout
+        self.submitted_at = time.monotonic()
+        self.started_at = None
+
+    @property
+    def elapsed(self):
+        """Seconds since the job started running (0 while it is still queued)"""
+        if self.started_at is None:
+            return 0.0
+        return time.monotonic() - self.started_at
+
+    @property
+    def timed_out(self):
+        return (
+            self.timeout is not None
+            and not self.future.done()
+            and self.elapsed > self.timeout
+        )
+
+
+class WorkerPool:
+    """
+    Process pool with a bounded job queue and a result cache
+
+    Jobs are identified by the fingerprint of the function and its inputs, so
+    two sessions asking for the same computation share one job and one result.
+
+    A running process job cannot be cancelled, so a job that times out keeps
+    its worker busy until it finishes: it still counts against max_pending,
+    and the same job is not submitted again for TIMEOUT_BACKOFF seconds.
+    """
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, max_pending=DEFAULT_MAX_PENDING,
+                 cache_size=DEFAULT_CACHE_SIZE):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.cache_size = cache_size
+        self._executor = None
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._abandoned = []
+        self._timed_out = {}
+        self._results = OrderedDict()
+
+    def _get_executor(self):
+        if self._executor is None:
+            # 'spawn' avoids forking the multi-threaded Streamlit server
+            context = multiprocessing.get_context('spawn')
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+        return self._executor
+
+    def job_key(self, fn, *args, **kwargs):
+        """Fingerprint identifying a call of fn with the given inputs"""
+        return fingerprint(f"{fn.__module__}.{fn.__qualname__}", *args, **kwargs)
+
+    def _store_result(self, key, result):
+        self._results[key] = result
+        self._results.move_to_end(key)
+        while len(self._results) > self.cache_size:
+            self._results.popitem(last=False)
+
+    def _mark_started(self, now):
+        """
+        Stamp jobs that a worker has picked up since the last poll
+
+        The executor reports a job as running as soon as it is moved to the call
+        queue, which holds one job more than there are workers, so a job only
+        counts as started while a worker is free for it. Jobs are checked in
+        submission order, the order the executor hands them out.
+        """
+        busy = len(self._abandoned) + sum(
+            1 for job in self._jobs.values()
+            if job.started_at is not None and not job.future.done()
+        )
+        for job in self._jobs.values():
+            if busy >= self.max_workers:
+                break
+            if job.started_at is None and job.future.running():
+                job.started_at = now
+                busy += 1
+
+    def poll(self, fn, *args, timeout=DEFAULT_TIMEOUT, **kwargs):
+        """
+        Submit a job if needed and report its state without blocking
+
+        Parameters:
+        -----------
+        fn : callable
+            Module-level (picklable) function to run in a worker process
+        *args, **kwargs :
+            Arguments passed to fn
+        timeout : float or None
+            Seconds a job may run (not counting time queued) before it is abandoned
+
+        Returns:
+        --------
+        tuple
+            (status, value) where status is one of 'done', 'running', 'busy',
+            'timeout' or 'failed'; value is the result for 'done' and the
+            exception for 'failed', otherwise None
+        """
+        key = self.job_key(fn, *args, **kwargs)
+
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                return 'done', self._results[key]
+
+            now = time.monotonic()
+            self._abandoned = [future for future in self._abandoned if not future.done()]
+            self._timed_out = {
+                timed_out_key: timed_out_at
+                for timed_out_key, timed_out_at in self._timed_out.items()
+                if now - timed_out_at < TIMEOUT_BACKOFF
+            }
+            if key in self._timed_out:
+                return 'timeout', None
+
+            self._mark_started(now)
+
+            job = self._jobs.get(key)
+            if job is not None:
+                if job.future.done():
+                    del self._jobs[key]
+                    error = job.future.exception()
+                    if error is not None:
+                        return 'failed', error
+                    result = job.future.result()
+                    self._store_result(key, result)
+                    return 'done', result
+                if job.timed_out:
+                    del self._jobs[key]
+                    if not job.future.cancel():
+                        self._abandoned.append(job.future)
+                    self._timed_out[key] = now
+                    return 'timeout', None
+                return 'running', None
+
+            if len(self._jobs) + len(self._abandoned) >= self.max_pending:
+                return 'busy', None
+
+            future = self._get_executor().submit(fn, *args, **kwargs)
+            self._jobs[key] = Job(key, future, timeout)
+            return 'running', None
+
+    def run(self, fn, *args, timeout=DEFAULT_TIMEOUT, **kwargs):
+        """
+        Run a job in the pool and block until it finishes
+
+        Used outside of page reruns (e.g. headless scripts) where waiting is fine.
+        The result is cached exactly as for poll().
+        """
+        while True:
+            status, value = self.poll(fn, *args, timeout=timeout, **kwargs)
+            if status == 'done':
+                return value
+            if status == 'failed':
+                raise value
+            if status == 'timeout':
+                raise TimeoutError(f"{fn.__qualname__} did not finish within {timeout}s")
+            time.sleep(0.05)
+
+    def pending_count(self):
+        """Jobs in flight, including timed-out ones still occupying a worker"""
+        with self._lock:
+            self._abandoned = [future for future in self._abandoned if not future.done()]
+            return len(self._jobs) + len(self._abandoned)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._jobs.clear()
+            self._abandoned.clear()
+            self._timed_out.clear()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+@st.cache_resource
+def get_worker_pool():
+    """Return the process-wide worker pool shared by all sessions"""
+    pool = WorkerPool()
+    atexit.register(pool.shutdown)
+    return pool
+
+
+def compute_in_background(fn, *args, label='Computing…', timeout=DEFAULT_TIMEOUT, **kwargs):
+    """
+    Run fn in the worker pool and render a placeholder while it is computing
+
+    Parameters:
+    -----------
+    fn : callable
+        Module-level function to run
+    *args, **kwargs :
+        Arguments passed to fn
+    label : str
+        Text shown in the "computing…" placeholder
+    timeout : float or None
+        Per-job timeout in seconds
+
+    Returns:
+    --------
+    any
+        The result if it is ready, otherwise None (a placeholder is shown and
+        the page is scheduled to rerun by rerun_while_pending())
+    """
+    with span(span_name(fn), worker=True) as opened:
+        status, value = get_worker_pool().poll(fn, *args, timeout=timeout, **kwargs)
+        if opened is not None:
+            opened.attrs['cache'] = 'ready' if status == 'done' else 'pending'
+            opened.attrs['status'] = status
+
+    if status == 'done':
+        return value
+
+    if status == 'running':
+        st.info(f"⏳ {label}")
+        st.session_state['_worker_jobs_pending'] = True
+    elif status == 'busy':
+        st.info(f"⏳ All workers are busy — {label.rstrip('.…')} is queued")
+        st.session_state['_worker_jobs_pending'] = True
+    elif status == 'timeout':
+        st.warning(f"⌛ {label.rstrip('.…')} timed out after {timeout}s")
+    else:
+        st.error(f"❌ {label.rstrip('.…')} failed: {value}")
+    return None
+
+
+def rerun_while_pending(interval=RERUN_INTERVAL):
+    """
+    Rerun the page while background jobs started during this run are in flight
+
+    Call once at the end of the script, after everything else has rendered.
+    """
+    if st.session_state.pop('_worker_jobs_pending', False):
+        time.sleep(interval)
+        st.rerun()
+
+
+def csv_bytes(df, positions=None):
+    """Serialize a dataframe, or the rows at the given positions of it, to UTF-8 CSV bytes (export job)"""
+    if positions is not None:
+        df = df.iloc[positions]
+    return unpack_ipv4_columns(df).to_csv(index=False).encode('utf-8')
@@ -1,15 +1,12 @@
 """
 DarkSentinel V2 Modules Package
 Enhanced modules with glassmorphism theme and advanced features
+
+Submodules are imported on first attribute access (PEP 562), so an app only
+loads the ones it uses.
 """
 
-from . import glassmorphism_theme
-from . import data_loader_v2
-from . import data_loader_global
-from . import advanced_visuals
-from . import visuals_global
-from . import live_feed
-from . import recent_attacks
+from modules.lazy_imports import lazy_submodules
 
 __all__ = [
     'glassmorphism_theme', 
@@ -20,3 +17,5 @@ __all__ = [
     'live_feed',
     'recent_attacks'
 ]
+
+__getattr__, __dir__ = lazy_submodules(__name__, __all__)
@@ -3,12 +3,16 @@ Advanced Visualizations Module for DarkSentinel V2
 3D visualizations, animated charts, and interactive components
 """
 
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
 
+from modules.lazy_imports import lazy_module
+from modules.result_cache import cached_figure
+
+# Plotly is imported on the first figure built, not when the module loads
+px = lazy_module('plotly.express')
+go = lazy_module('plotly.graph_objects')
+
 # Glassmorphism Cyber Theme Colors
 COLORS = {
     'bg': '#050816',
@@ -76,11 +80,12 @@ def apply_theme(fig, title=None, height=None):
         fig.update_layout(height=height)
     return fig
 
+@cached_figure
 def create_3d_globe(df, title='🌍 Global Attack Distribution'):
     """Create 3D globe visualization with attack locations"""
     
     # Aggregate data by location
-    location_data = df.groupby('location').agg({
+    location_data = df.groupby('location', observed=True).agg({
         'attack_type': 'count',
         'data_compromised_GB': 'sum',
         'attack_severity': 'mean'
@@ -144,11 +149,12 @@ def create_3d_globe(df, title='🌍 Global Attack Distribution'):
     
     return fig
 
+@cached_figure
 def create_animated_timeline(df, title='📈 Attack Timeline Animation'):
     """Create animated timeline showing attacks over time"""
     
     # Aggregate by date and attack type
-    timeline_data = df.groupby([df['timestamp'].dt.date, 'attack_type']).size().reset_index(name='count')
+    timeline_data = df.groupby([df['timestamp'].dt.date, 'attack_type'], observed=True).size().reset_index(name='count')
     timeline_data.columns = ['date', 'attack_type', 'count']
     
     fig = px.scatter(
@@ -168,11 +174,12 @@ def create_animated_timeline(df, title='📈 Attack Timeline Animation'):
     
     return fig
 
+@cached_figure
 def create_sunburst_chart(df, title='🎯 Attack Hierarchy'):
     """Create sunburst chart for hierarchical attack data"""
     
     # Create hierarchy: Industry -> Attack Type -> Target System
-    hierarchy_data = df.groupby(['industry', 'attack_type', 'target_system']).size().reset_index(name='count')
+    hierarchy_data = df.groupby(['industry', 'attack_type', 'target_system'], observed=True).size().reset_index(name='count')
     
     fig = px.sunburst(
         hierarchy_data,
@@ -187,6 +194,7 @@ def create_sunburst_chart(df, title='🎯 Attack Hierarchy'):
     
     return fig
 
+@cached_figure
 def create_3d_scatter(df, title='🔮 3D Attack Correlation Analysis'):
     """Create 3D scatter plot with even distribution across all axes"""
     
@@ -336,11 +344,12 @@ def create_3d_scatter(df, title='🔮 3D Attack Correlation Analysis'):
     
     return fig
 
+@cached_figure
 def create_radar_chart(df, title='📡 Security Posture Radar'):
     """Create radar chart for security metrics"""
     
     # Calculate metrics by security tool
-    tool_metrics = df.groupby('security_tools_used').agg({
+    tool_metrics = df.groupby('security_tools_used', observed=True).agg({
         'outcome': lambda x: (x == 'Success').mean() * 100,
         'response_time_min': 'mean',
         'attack_severity': 'mean',
@@ -375,6 +384,7 @@ def create_radar_chart(df, title='📡 Security Posture Radar'):
     
     return fig
 
+@cached_figure
 def create_heatmap_calendar(df, title='📅 Attack Patterns by Day of Week'):
     """Create simple bar chart showing attack distribution by day of week"""
     
@@ -415,6 +425,7 @@ def create_heatmap_calendar(df, title='📅 Attack Patterns by Day of Week'):
     
     return fig
 
+@cached_figure
 def create_gauge_chart(value, title='Threat Level', max_value=100):
     """Create animated gauge chart"""
     
@@ -447,10 +458,11 @@ def create_gauge_chart(value, title='Threat Level', max_value=100):
     
     return fig
 
+@cached_figure
 def create_treemap(df, title='🗂️ Attack Distribution Treemap'):
     """Create treemap visualization"""
     
-    treemap_data = df.groupby(['industry', 'attack_type']).size().reset_index(name='count')
+    treemap_data = df.groupby(['industry', 'attack_type'], observed=True).size().reset_index(name='count')
     
     fig = px.treemap(
         treemap_data,
@@ -465,11 +477,12 @@ def create_treemap(df, title='🗂️ Attack Distribution Treemap'):
     
     return fig
 
+@cached_figure
 def create_sankey_flow(df, title='🔀 Attack Flow Diagram'):
     """Create Sankey diagram"""
     
     # Create flow: Attack Type -> Target System -> Outcome
-    flow_data = df.groupby(['attack_type', 'target_system', 'outcome']).size().reset_index(name='count')
+    flow_data = df.groupby(['attack_type', 'target_system', 'outcome'], observed=True).size().reset_index(name='count')
     
     # Create node labels
     attack_types = df['attack_type'].unique().tolist()
@@ -518,6 +531,7 @@ def create_sankey_flow(df, title='🔀 Attack Flow Diagram'):
     return fig
 
 
+@cached_figure
 def create_mitigation_chart(df, title='🛠️ Mitigation Methods Used'):
     """Simple and clear chart showing most common mitigation methods"""
     
@@ -558,11 +572,12 @@ def create_mitigation_chart(df, title='🛠️ Mitigation Methods Used'):
     
     return fig
 
+@cached_figure
 def create_waterfall_chart(df, title='📊 Attack Outcomes by Type'):
     """Create stacked bar chart showing attack outcomes"""
     
     # Calculate outcomes by attack type
-    outcome_data = df.groupby(['attack_type', 'outcome']).size().unstack(fill_value=0)
+    outcome_data = df.groupby(['attack_type', 'outcome'], observed=True).size().unstack(fill_value=0)
     
     # Get top attack types
     top_attacks = df['attack_type'].value_counts().head(8).index
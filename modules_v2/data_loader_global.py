@@ -7,7 +7,15 @@ import pandas as pd
 import streamlit as st
 from datetime import datetime
 
-@st.cache_data(ttl=3600)
+from modules.result_cache import cached_result, estimate_nbytes
+from modules.compact import maybe_compact, prune_categories
+from modules.data_adapter import resolve_dataset
+
+def _global_source(file_path='Global_Cybersecurity_Threats_2015-2024_LARGE.csv'):
+    """Path load_global_data() will read for file_path (used for change detection)"""
+    return resolve_dataset(file_path, '.')
+
+@cached_result('dataset', source=_global_source)
 def load_global_data(file_path='Global_Cybersecurity_Threats_2015-2024_LARGE.csv'):
     """
     Load global cybersecurity threat data from CSV file
@@ -65,7 +73,7 @@ def load_global_data(file_path='Global_Cybersecurity_Threats_2015-2024_LARGE.csv
             (df['Number of Affected Users'] / df['Number of Affected Users'].max()) * 50
         ).round(2)
         
-        return df
+        return maybe_compact(df, 'data_loader_global.load_global_data', _global_source(file_path))
         
     except FileNotFoundError:
         st.error(f"❌ Data file not found: {file_path}")
@@ -75,6 +83,7 @@ def load_global_data(file_path='Global_Cybersecurity_Threats_2015-2024_LARGE.csv
         st.error(f"❌ Error loading data: {str(e)}")
         st.stop()
 
+@cached_result('aggregate')
 def get_data_summary(df):
     """
     Get comprehensive summary statistics
@@ -103,10 +112,11 @@ def get_data_summary(df):
         'avg_response_time_hours': (df['response_time_min'].mean() / 60) if 'response_time_min' in df.columns else 0,
         'success_rate': ((df['outcome'] == 'Success').mean() * 100) if 'outcome' in df.columns else 0,
         'avg_severity': float(df['attack_severity'].mean()) if 'attack_severity' in df.columns else 0,
-        'memory_usage_mb': df.memory_usage(deep=True).sum() / (1024**2)
+        'memory_usage_mb': estimate_nbytes(df) / (1024**2)
     }
     return summary
 
+@cached_result('aggregate')
 def get_attack_statistics(df):
     """
     Get detailed attack statistics
@@ -137,6 +147,7 @@ def get_attack_statistics(df):
     }
     return stats
 
+@cached_result('filter')
 def filter_data(df, filters):
     """
     Apply multiple filters to dataframe
@@ -183,8 +194,9 @@ def filter_data(df, filters):
     if filters.get('severity_categories'):
         filtered = filtered[filtered['Severity_Category'].isin(filters['severity_categories'])]
     
-    return filtered
+    return prune_categories(filtered)
 
+@cached_result('aggregate')
 def get_top_threats(df, n=10):
     """
     Get top N threats by various criteria
@@ -216,6 +228,7 @@ def get_top_threats(df, n=10):
         ].to_dict('records'),
     }
 
+@cached_result('aggregate')
 def get_yearly_trends(df):
     """
     Get year-over-year trends
@@ -230,7 +243,7 @@ def get_yearly_trends(df):
     pd.DataFrame
         Yearly aggregated data
     """
-    yearly = df.groupby('Year').agg({
+    yearly = df.groupby('Year', observed=True).agg({
         'Attack Type': 'count',
         'Financial Loss (in Million $)': 'sum',
         'Number of Affected Users': 'sum',
@@ -241,6 +254,7 @@ def get_yearly_trends(df):
     
     return yearly
 
+@cached_result('aggregate')
 def get_defense_effectiveness(df):
     """
     Calculate defense mechanism effectiveness
@@ -255,7 +269,7 @@ def get_defense_effectiveness(df):
     pd.DataFrame
         Defense effectiveness metrics
     """
-    defense_stats = df.groupby('Defense Mechanism Used').agg({
+    defense_stats = df.groupby('Defense Mechanism Used', observed=True).agg({
         'Attack Type': 'count',
         'Financial Loss (in Million $)': 'mean',
         'Number of Affected Users': 'mean',
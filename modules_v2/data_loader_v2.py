@@ -6,8 +6,20 @@ Handles loading and validation of the new cybersecurity attack data
 import pandas as pd
 import streamlit as st
 from datetime import datetime
+from pathlib import Path
 
-@st.cache_data(ttl=3600)
+from modules.result_cache import cached_result, estimate_nbytes
+from modules.compact import maybe_compact, prune_categories
+from modules.data_adapter import find_dataset
+from modules.tracing import traced
+from modules.ip_index import ipv4_strings
+from .sketches import distinct_count
+
+def _dataset_source(file_path=None):
+    """Path load_data() reads: always the data adapter's pick in the project root"""
+    return find_dataset(Path(__file__).parent.parent)
+
+@cached_result('dataset', source=_dataset_source)
 def load_data(file_path='cybersecurity_large_synthesized_data.csv'):
     """
     Load cybersecurity attack data from CSV file
@@ -51,87 +63,7 @@ def load_data(file_path='cybersecurity_large_synthesized_data.csv'):
                 else:
                     raise FileNotFoundError(f"No suitable dataset found in {root_dir}")
         
-        # Handle different possible timestamp column names and create a clean datetime 'timestamp' column
-        timestamp_candidates = ['timestamp', 'Timestamp', 'Year']
-        timestamp_col = None
-        
-        for col in timestamp_candidates:
-            if col in df.columns:
-                timestamp_col = col
-                break
-        
-        if timestamp_col is None:
-            st.warning("No timestamp column found. Creating one with current time.")
-            df['timestamp'] = pd.Timestamp.now()
-        elif timestamp_col == 'Year':
-            # Convert Year to a proper timestamp (Jan 1st of that year)
-            df['timestamp'] = pd.to_datetime(df['Year'].astype(str) + '-01-01', errors='coerce')
-        else:
-            # Parse the found timestamp column into datetime
-            df['timestamp'] = pd.to_datetime(df[timestamp_col], errors='coerce')
-        
-        # Drop rows where timestamp could not be parsed to avoid defaulting everything to 'now'
-        if df['timestamp'].isna().any():
-            df = df.dropna(subset=['timestamp']).reset_index(drop=True)
-        
-        # Add computed columns based on timestamp
-        df['date'] = df['timestamp'].dt.date
-        df['year'] = df['timestamp'].dt.year
-        df['month'] = df['timestamp'].dt.month
-        df['month_name'] = df['timestamp'].dt.month_name()
-        df['day'] = df['timestamp'].dt.day
-        df['day_of_week'] = df['timestamp'].dt.dayofweek
-        df['day_name'] = df['timestamp'].dt.day_name()
-        df['hour'] = df['timestamp'].dt.hour
-        df['minute'] = df['timestamp'].dt.minute
-        
-        # Ensure required columns exist with default values
-        required_columns = {
-            'attack_type': 'Unknown',
-            'target_system': 'Generic System',
-            'location': 'Unknown Location',
-            'industry': 'Various',
-            'attack_severity': 5,  # Medium severity default
-            'data_compromised_GB': 0,
-            'outcome': 'Unknown',
-            'attacker_ip': '0.0.0.0',
-            'target_ip': '0.0.0.0',
-            'user_role': 'User',
-            'security_tools_used': 'Basic Security Suite',
-            'mitigation_method': 'Standard Protocol',
-            'attack_duration_min': 30,  # Default 30 minutes
-            'response_time_min': 15,    # Default 15 minutes
-        }
-        
-        for col, default_value in required_columns.items():
-            if col not in df.columns:
-                df[col] = default_value
-
-        # If dataset provides 'target_industry', map it into the expected 'industry' column
-        if 'target_industry' in df.columns:
-            df['industry'] = df['industry'].where(df['industry'].ne('Various'), df['target_industry'])
-        
-        # Add success rate
-        df['is_successful'] = (df['outcome'] == 'Success').astype(int)
-        
-        # Add severity category
-        df['severity_category'] = pd.cut(
-            df['attack_severity'],
-            bins=[0, 3, 6, 10],
-            labels=['Low', 'Medium', 'High']
-        )
-        
-        # Add data loss category
-        df['data_loss_category'] = pd.cut(
-            df['data_compromised_GB'],
-            bins=[-0.01, 25, 50, 75, 100],
-            labels=['Minimal', 'Moderate', 'Significant', 'Critical']
-        )
-        
-        # Add response efficiency (lower is better)
-        df['response_efficiency'] = df['response_time_min'] / df['attack_duration_min']
-        
-        return df
+        return maybe_compact(add_derived_columns(df), 'data_loader_v2.load_data', _dataset_source())
         
     except FileNotFoundError:
         st.error(f"❌ Data file not found: {file_path}")
@@ -141,14 +73,159 @@ def load_data(file_path='cybersecurity_large_synthesized_data.csv'):
         st.error(f"❌ Error loading data: {str(e)}")
         st.stop()
 
-def get_data_summary(df):
+@traced
+def add_derived_columns(df):
+    """
+    Add the timestamp-derived, default and computed columns the V2 dashboard uses
+    
+    Applied to the whole dataset by load_data() and to each batch of appended
+    rows in tail-follow mode (see live_ingest); every step is row-local.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Frame in the canonical schema (see data_adapter.map_to_canonical)
+        
+    Returns:
+    --------
+    pd.DataFrame
+        Frame with derived columns
+    """
+    # Handle different possible timestamp column names and create a clean datetime 'timestamp' column
+    timestamp_candidates = ['timestamp', 'Timestamp', 'Year']
+    timestamp_col = None
+    
+    for col in timestamp_candidates:
+        if col in df.columns:
+            timestamp_col = col
+            break
+    
+    if timestamp_col is None:
+        st.warning("No timestamp column found. Creating one with current time.")
+        df['timestamp'] = pd.Timestamp.now()
+    elif timestamp_col == 'Year':
+        # Convert Year to a proper timestamp (Jan 1st of that year)
+        df['timestamp'] = pd.to_datetime(df['Year'].astype(str) + '-01-01', errors='coerce')
+    else:
+        # Parse the found timestamp column into datetime
+        df['timestamp'] = pd.to_datetime(df[timestamp_col], errors='coerce')
+    
+    # Drop rows where timestamp could not be parsed to avoid defaulting everything to 'now'
+    if df['timestamp'].isna().any():
+        df = df.dropna(subset=['timestamp']).reset_index(drop=True)
+    
+    # Add computed columns based on timestamp
+    df['date'] = df['timestamp'].dt.date
+    df['year'] = df['timestamp'].dt.year
+    df['month'] = df['timestamp'].dt.month
+    df['month_name'] = df['timestamp'].dt.month_name()
+    df['day'] = df['timestamp'].dt.day
+    df['day_of_week'] = df['timestamp'].dt.dayofweek
+    df['day_name'] = df['timestamp'].dt.day_name()
+    df['hour'] = df['timestamp'].dt.hour
+    df['minute'] = df['timestamp'].dt.minute
+    
+    # Ensure required columns exist with default values
+    required_columns = {
+        'attack_type': 'Unknown',
+        'target_system': 'Generic System',
+        'location': 'Unknown Location',
+        'industry': 'Various',
+        'attack_severity': 5,  # Medium severity default
+        'data_compromised_GB': 0,
+        'outcome': 'Unknown',
+        'attacker_ip': '0.0.0.0',
+        'target_ip': '0.0.0.0',
+        'user_role': 'User',
+        'security_tools_used': 'Basic Security Suite',
+        'mitigation_method': 'Standard Protocol',
+        'attack_duration_min': 30,  # Default 30 minutes
+        'response_time_min': 15,    # Default 15 minutes
+    }
+    
+    for col, default_value in required_columns.items():
+        if col not in df.columns:
+            df[col] = default_value
+
+    # If dataset provides 'target_industry', map it into the expected 'industry' column
+    if 'target_industry' in df.columns:
+        df['industry'] = df['industry'].where(df['industry'].ne('Various'), df['target_industry'])
+    
+    # Add success rate
+    df['is_successful'] = (df['outcome'] == 'Success').astype(int)
+    
+    # Add severity category
+    df['severity_category'] = pd.cut(
+        df['attack_severity'],
+        bins=[0, 3, 6, 10],
+        labels=['Low', 'Medium', 'High']
+    )
+    
+    # Add data loss category
+    df['data_loss_category'] = pd.cut(
+        df['data_compromised_GB'],
+        bins=[-0.01, 25, 50, 75, 100],
+        labels=['Minimal', 'Moderate', 'Significant', 'Critical']
+    )
+    
+    # Add response efficiency (lower is better)
+    df['response_efficiency'] = df['response_time_min'] / df['attack_duration_min']
+    
+    return df
+
+@st.cache_resource(max_entries=2)
+def _attach_shared_data(key, file_path):
+    from modules.fingerprint import tag
+    from modules.shared_store import load_or_publish
+    # Publish from the undecorated loader: the result cache would otherwise keep
+    # the private frame alive for the life of the process
+    frame = load_or_publish(key, lambda: load_data.__wrapped__(file_path))
+    # The store key already identifies the content, so tag it for the result cache
+    return tag(frame, key)
+
+@traced
+def load_shared_data(file_path='cybersecurity_large_synthesized_data.csv'):
+    """
+    Load the dataset through the shared-memory store
+    
+    The first server process on the host publishes the fully prepared frame
+    from load_data(); every other replica attaches to the same memory-mapped
+    columns read-only, so RAM per host stays flat as replicas are added.
+    Text columns come back dictionary-encoded (categorical).
+    
+    Parameters:
+    -----------
+    file_path : str
+        Path to the CSV file (same fallback rules as load_data)
+        
+    Returns:
+    --------
+    pd.DataFrame
+        Read-only, memory-mapped dataframe
+    """
+    from pathlib import Path
+    from modules.data_adapter import find_dataset
+    from modules.shared_store import dataset_key
+    
+    root_dir = Path(__file__).parent.parent
+    source = find_dataset(root_dir)
+    key = dataset_key('data_loader_v2.load_data', source, file_path)
+    return _attach_shared_data(key, file_path)
+
+@cached_result('aggregate')
+def get_data_summary(df, base=None):
     """
     Get comprehensive summary statistics
     
+    Unique attackers and targets are exact for small frames and HyperLogLog
+    estimates (about 1.6% standard error) above sketches.EXACT_DISTINCT_ROWS rows.
+    
     Parameters:
     -----------
     df : pd.DataFrame
         Input dataframe
+    base : pd.DataFrame, optional
+        Full dataset df was filtered from; its per-row sketch codes are reused
         
     Returns:
     --------
@@ -161,17 +238,18 @@ def get_data_summary(df):
         'date_range_start': df['timestamp'].min(),
         'date_range_end': df['timestamp'].max(),
         'total_days': (df['timestamp'].max() - df['timestamp'].min()).days,
-        'unique_attackers': df['attacker_ip'].nunique(),
-        'unique_targets': df['target_ip'].nunique(),
+        'unique_attackers': distinct_count(df, 'attacker_ip', base),
+        'unique_targets': distinct_count(df, 'target_ip', base),
         'total_data_compromised_TB': df['data_compromised_GB'].sum() / 1024,
         'avg_attack_duration_hours': df['attack_duration_min'].mean() / 60,
         'avg_response_time_hours': df['response_time_min'].mean() / 60,
         'success_rate': (df['outcome'] == 'Success').mean() * 100,
         'avg_severity': df['attack_severity'].mean(),
-        'memory_usage_mb': df.memory_usage(deep=True).sum() / (1024**2)
+        'memory_usage_mb': estimate_nbytes(df) / (1024**2)
     }
     return summary
 
+@cached_result('aggregate')
 def get_attack_statistics(df):
     """
     Get detailed attack statistics
@@ -199,6 +277,7 @@ def get_attack_statistics(df):
     }
     return stats
 
+@traced
 def get_real_time_metrics(df, last_n_hours=24):
     """
     Get real-time metrics for the last N hours
@@ -229,6 +308,7 @@ def get_real_time_metrics(df, last_n_hours=24):
     }
     return metrics
 
+@cached_result('filter')
 def filter_data(df, filters):
     """
     Apply multiple filters to dataframe
@@ -287,8 +367,9 @@ def filter_data(df, filters):
     if filters.get('security_tools'):
         filtered = filtered[filtered['security_tools_used'].isin(filters['security_tools'])]
     
-    return filtered
+    return prune_categories(filtered)
 
+@cached_result('aggregate')
 def get_top_threats(df, n=10):
     """
     Get top N threats by various criteria
@@ -305,9 +386,14 @@ def get_top_threats(df, n=10):
     dict
         Top threats
     """
+    def top_addresses(column):
+        counts = df.groupby(column, observed=True).size().nlargest(n)
+        counts.index = ipv4_strings(counts.index)
+        return counts.to_dict()
+
     return {
-        'top_attackers': df.groupby('attacker_ip').size().nlargest(n).to_dict(),
-        'top_targets': df.groupby('target_ip').size().nlargest(n).to_dict(),
+        'top_attackers': top_addresses('attacker_ip'),
+        'top_targets': top_addresses('target_ip'),
         'most_data_loss': df.nlargest(n, 'data_compromised_GB')[
             ['timestamp', 'attack_type', 'target_system', 'data_compromised_GB', 'location']
         ].to_dict('records'),
@@ -0,0 +1,86 @@
+"""
+Row-Templated HTML Rendering
+Renders HTML tables and feeds by formatting each column in bulk and filling a
+pre-compiled row template, joined once, instead of growing a string with
+f-strings inside iterrows() loops
+"""
+
+from itertools import starmap
+from string import Formatter
+
+import numpy as np
+import pandas as pd
+
+
+class RowTemplate:
+    """
+    HTML row template with named fields, compiled to positional str.format
+
+    Parameters:
+    -----------
+    template : str
+        Row markup with {field} placeholders (no format specs; columns are
+        formatted in bulk before rendering, see format_column)
+    """
+
+    def __init__(self, template):
+        self.fields = []
+        parts = []
+        for literal, field, spec, conversion in Formatter().parse(template):
+            parts.append(literal.replace('{', '{{').replace('}', '}}'))
+            if field is None:
+                continue
+            if spec or conversion:
+                raise ValueError(f"Format field {field!r} must be pre-formatted, not {spec or conversion!r}")
+            if field not in self.fields:
+                self.fields.append(field)
+            parts.append('{%d}' % self.fields.index(field))
+        self._format = ''.join(parts).format
+
+    def render_rows(self, columns):
+        """
+        Render one string per row
+
+        Parameters:
+        -----------
+        columns : dict
+            Field name -> equal-length sequence of already formatted values
+
+        Returns:
+        --------
+        list of str
+        """
+        return list(starmap(self._format, zip(*(columns[name] for name in self.fields))))
+
+    def render(self, columns):
+        """Render every row and join them into a single string"""
+        return ''.join(self.render_rows(columns))
+
+
+def format_column(values, spec=''):
+    """
+    Format a column to strings in one pass
+
+    Values are converted to Python scalars with tolist() first, so the text
+    matches what an f-string on the row value would produce.
+    """
+    if isinstance(values, (pd.Series, pd.Index)):
+        values = values.tolist()
+    elif isinstance(values, np.ndarray):
+        values = values.tolist()
+    if not spec:
+        return [str(v) for v in values]
+    fmt = ('{:' + spec + '}').format
+    return [fmt(v) for v in values]
+
+
+def choose(conditions, choices, default):
+    """Pick a string per row from the first matching condition (np.select for labels)"""
+    return np.select(conditions, choices, default=default).tolist()
+
+
+def column_or_default(df, name, default):
+    """A column's values, or the default repeated when the column is missing"""
+    if name in df.columns:
+        return df[name]
+    return pd.Series([default] * len(df), index=df.index)
@@ -5,8 +5,14 @@ Terminal-style scrolling feed of recent attacks
 
 import streamlit as st
 import pandas as pd
+from collections import deque
 from datetime import datetime
 
+from .html_rows import RowTemplate, format_column, choose, column_or_default
+from .topk import select_feed_rows, ticker_rows, top_rows, SELECT_K
+from modules.tracing import traced
+from modules.ip_index import ipv4_strings
+
 COLORS = {
     'cyan': '#00f5ff',
     'purple': '#7b2ff7',
@@ -16,27 +22,9 @@ COLORS = {
     'text': '#b8c5d6',
 }
 
-def create_terminal_feed(df, n_recent=20):
-    """
-    Create terminal-style live attack feed
-    
-    Parameters:
-    -----------
-    df : pd.DataFrame
-        Attack data
-    n_recent : int
-        Number of recent attacks to show
-        
-    Returns:
-    --------
-    str
-        HTML for terminal feed
-    """
-    
-    # Get most recent attacks
-    recent_attacks = df.nlargest(n_recent, 'timestamp')
-    
-    feed_html = f"""
+FEED_CAPACITY = 200  # events kept in a FeedRing
+
+_FEED_HEADER = f"""
     <div style="
         background: rgba(0, 0, 0, 0.8);
         border: 1px solid {COLORS['cyan']};
@@ -55,56 +43,8 @@ def create_terminal_feed(df, n_recent=20):
             ┌─[darksentinel@security]─[~]
         </div>
     """
-    
-    for idx, attack in recent_attacks.iterrows():
-        # Determine severity color
-        severity = attack['attack_severity']
-        if severity >= 8:
-            sev_color = COLORS['pink']
-            sev_icon = '🔴'
-        elif severity >= 5:
-            sev_color = COLORS['orange']
-            sev_icon = '🟡'
-        else:
-            sev_color = COLORS['green']
-            sev_icon = '🟢'
-        
-        # Determine outcome color
-        outcome_color = COLORS['pink'] if attack['outcome'] == 'Success' else COLORS['green']
-        outcome_icon = '⚠️' if attack['outcome'] == 'Success' else '✓'
-        
-        timestamp_str = attack['timestamp'].strftime('%Y-%m-%d %H:%M:%S')
-        
-        feed_html += f"""
-        <div style="margin: 10px 0; padding: 10px; background: rgba(255, 255, 255, 0.02); border-left: 3px solid {sev_color}; border-radius: 5px;">
-            <div style="color: {COLORS['cyan']};">
-                └─$ [{timestamp_str}] {sev_icon} SEVERITY: {severity}/10
-            </div>
-            <div style="color: {COLORS['purple']}; margin-left: 20px;">
-                ├─ TYPE: <span style="color: {COLORS['pink']};">{attack['attack_type']}</span>
-            </div>
-            <div style="color: {COLORS['purple']}; margin-left: 20px;">
-                ├─ TARGET: <span style="color: white;">{attack['target_system']}</span> @ {attack['location']}
-            </div>
-            <div style="color: {COLORS['purple']}; margin-left: 20px;">
-                ├─ SOURCE: <span style="color: {COLORS['orange']};">{attack['attacker_ip']}</span> → {attack['target_ip']}
-            </div>
-            <div style="color: {COLORS['purple']}; margin-left: 20px;">
-                ├─ DATA LOSS: <span style="color: {COLORS['pink']};">{attack['data_compromised_GB']:.2f} GB</span>
-            </div>
-            <div style="color: {COLORS['purple']}; margin-left: 20px;">
-                ├─ DURATION: {attack['attack_duration_min']} min | RESPONSE: {attack['response_time_min']} min
-            </div>
-            <div style="color: {COLORS['purple']}; margin-left: 20px;">
-                ├─ MITIGATION: <span style="color: {COLORS['green']};">{attack['mitigation_method']}</span>
-            </div>
-            <div style="color: {COLORS['purple']}; margin-left: 20px;">
-                └─ STATUS: <span style="color: {outcome_color};">{outcome_icon} {attack['outcome']}</span>
-            </div>
-        </div>
-        """
-    
-    feed_html += """
+
+_FEED_FOOTER = """
         <div style="color: #00ff88; margin-top: 15px;">
             └─[EOF] End of feed
         </div>
@@ -127,9 +67,212 @@ def create_terminal_feed(df, n_recent=20):
         }
     </style>
     """
+
+_FEED_ENTRY = RowTemplate(f"""
+        <div style="margin: 10px 0; padding: 10px; background: rgba(255, 255, 255, 0.02); border-left: 3px solid {{sev_color}}; border-radius: 5px;">
+            <div style="color: {COLORS['cyan']};">
+                └─$ [{{timestamp}}] {{sev_icon}} SEVERITY: {{severity}}/10
+            </div>
+            <div style="color: {COLORS['purple']}; margin-left: 20px;">
+                ├─ TYPE: <span style="color: {COLORS['pink']};">{{attack_type}}</span>
+            </div>
+            <div style="color: {COLORS['purple']}; margin-left: 20px;">
+                ├─ TARGET: <span style="color: white;">{{target_system}}</span> @ {{location}}
+            </div>
+            <div style="color: {COLORS['purple']}; margin-left: 20px;">
+                ├─ SOURCE: <span style="color: {COLORS['orange']};">{{attacker_ip}}</span> → {{target_ip}}
+            </div>
+            <div style="color: {COLORS['purple']}; margin-left: 20px;">
+                ├─ DATA LOSS: <span style="color: {COLORS['pink']};">{{data_loss}} GB</span>
+            </div>
+            <div style="color: {COLORS['purple']}; margin-left: 20px;">
+                ├─ DURATION: {{duration}} min | RESPONSE: {{response}} min
+            </div>
+            <div style="color: {COLORS['purple']}; margin-left: 20px;">
+                ├─ MITIGATION: <span style="color: {COLORS['green']};">{{mitigation}}</span>
+            </div>
+            <div style="color: {COLORS['purple']}; margin-left: 20px;">
+                └─ STATUS: <span style="color: {{outcome_color}};">{{outcome_icon}} {{outcome}}</span>
+            </div>
+        </div>
+        """)
+
+def render_feed_entries(attacks):
+    """
+    Render attacks as terminal feed entries, formatting each column in bulk
+    
+    Parameters:
+    -----------
+    attacks : pd.DataFrame
+        Attacks to render, in display order
+        
+    Returns:
+    --------
+    list of str
+        One HTML fragment per attack
+    """
+    # Determine severity and outcome colors
+    severity = attacks['attack_severity']
+    tiers = [severity.to_numpy() >= 8, severity.to_numpy() >= 5]
+    success = [(attacks['outcome'] == 'Success').to_numpy()]
     
-    return feed_html
+    return _FEED_ENTRY.render_rows({
+        'sev_color': choose(tiers, [COLORS['pink'], COLORS['orange']], COLORS['green']),
+        'sev_icon': choose(tiers, ['🔴', '🟡'], '🟢'),
+        'timestamp': format_column(attacks['timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S')),
+        'severity': format_column(severity),
+        'attack_type': format_column(attacks['attack_type']),
+        'target_system': format_column(attacks['target_system']),
+        'location': format_column(attacks['location']),
+        'attacker_ip': format_column(ipv4_strings(attacks['attacker_ip'])),
+        'target_ip': format_column(ipv4_strings(attacks['target_ip'])),
+        'data_loss': format_column(attacks['data_compromised_GB'], '.2f'),
+        'duration': format_column(attacks['attack_duration_min']),
+        'response': format_column(attacks['response_time_min']),
+        'mitigation': format_column(attacks['mitigation_method']),
+        'outcome_color': choose(success, [COLORS['pink']], COLORS['green']),
+        'outcome_icon': choose(success, ['⚠️'], '✓'),
+        'outcome': format_column(attacks['outcome']),
+    })
 
+@traced
+def create_terminal_feed(df, n_recent=20):
+    """
+    Create terminal-style live attack feed
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Attack data
+    n_recent : int
+        Number of recent attacks to show
+        
+    Returns:
+    --------
+    str
+        HTML for terminal feed
+    """
+    
+    # Get most recent attacks
+    recent_attacks = df.nlargest(n_recent, 'timestamp')
+    
+    return _FEED_HEADER + ''.join(render_feed_entries(recent_attacks)) + _FEED_FOOTER
+
+class FeedRing:
+    """
+    Fixed-capacity ring buffer of the most recent feed events
+    
+    Events are pushed as data arrives and rendered to HTML once, when pushed;
+    the terminal is assembled from those cached fragments. Every event gets a
+    sequence number so a client holding a cursor can fetch only what arrived
+    since (delta rendering) instead of the whole terminal.
+    """
+    
+    def __init__(self, capacity=FEED_CAPACITY):
+        self.capacity = capacity
+        self._events = deque(maxlen=capacity)  # (seq, row_id, fragment), oldest first
+        self._seq = 0
+        self._cleared = 0  # events up to this sequence number were dropped by clear()
+    
+    @property
+    def cursor(self):
+        """Sequence number of the newest event pushed so far"""
+        return self._seq
+    
+    def __len__(self):
+        return len(self._events)
+    
+    def push(self, batch):
+        """
+        Append a batch of newly arrived events (only those that can survive are rendered)
+        
+        Returns:
+        --------
+        int
+            Number of events pushed
+        """
+        if batch is None or batch.empty:
+            return 0
+        newest = batch.nlargest(self.capacity, 'timestamp').iloc[::-1]
+        for row_id, fragment in zip(newest.index, render_feed_entries(newest)):
+            self._seq += 1
+            self._events.append((self._seq, row_id, fragment))
+        return len(newest)
+    
+    def latest(self, n):
+        """Fragments of the n newest events, newest first"""
+        n = min(n, len(self._events))
+        return [self._events[-i][2] for i in range(1, n + 1)]
+    
+    def since(self, cursor):
+        """
+        Events that arrived after cursor
+        
+        Returns:
+        --------
+        tuple
+            (fragments newest first, new cursor); fragments is None when the
+            cursor has fallen out of the ring (or the ring was cleared since)
+            and the whole terminal must be re-rendered
+        """
+        evicted = self._events[0][0] - 1 if self._events else self._seq
+        if cursor < evicted or cursor <= self._cleared or cursor > self._seq:
+            return None, self._seq
+        fragments = [fragment for seq, _, fragment in reversed(self._events) if seq > cursor]
+        return fragments, self._seq
+    
+    def clear(self):
+        self._events.clear()
+        self._cleared = self._seq
+
+@traced
+def create_live_terminal_feed(ring, n_recent=20):
+    """
+    Terminal feed assembled from a FeedRing's cached fragments (no dataframe scan)
+    
+    Parameters:
+    -----------
+    ring : FeedRing
+        Ring buffer maintained as events arrive
+    n_recent : int
+        Number of recent attacks to show
+        
+    Returns:
+    --------
+    str
+        HTML for terminal feed
+    """
+    return _FEED_HEADER + ''.join(ring.latest(n_recent)) + _FEED_FOOTER
+
+def update_live_terminal_feed(ring, shown=None, n_recent=20):
+    """
+    Terminal feed updated with only the events that arrived since the last render
+    
+    Parameters:
+    -----------
+    ring : FeedRing
+        Ring buffer maintained as events arrive
+    shown : tuple, optional
+        (cursor, fragments) returned by the previous call, e.g. kept in the
+        session; None renders the terminal from scratch
+    n_recent : int
+        Number of recent attacks to show
+        
+    Returns:
+    --------
+    tuple
+        (html, shown): HTML for terminal feed and the state to pass next time
+    """
+    delta = None
+    if shown is not None:
+        delta, cursor = ring.since(shown[0])
+    if delta is None:
+        cursor, fragments = ring.cursor, ring.latest(n_recent)
+    else:
+        fragments = (delta + shown[1])[:n_recent]
+    return _FEED_HEADER + ''.join(fragments) + _FEED_FOOTER, (cursor, fragments)
+
+@traced
 def create_attack_ticker(df, n_items=10):
     """
     Create scrolling ticker of critical attacks
@@ -147,17 +290,9 @@ def create_attack_ticker(df, n_items=10):
         HTML for ticker
     """
     
-    # Get critical attacks (severity >= 8), fallback to high severity (>= 7) if not enough
-    critical = df[df['attack_severity'] >= 8].nlargest(n_items, 'timestamp')
-    
-    # If we don't have enough critical attacks, add high severity ones
-    if len(critical) < n_items:
-        high_severity = df[df['attack_severity'] >= 7].nlargest(n_items, 'timestamp')
-        critical = high_severity
-    
-    # Ensure we have at least some items
-    if len(critical) == 0:
-        critical = df.nlargest(min(n_items, len(df)), 'timestamp')
+    # Get critical attacks (severity >= 8), fallback to high severity (>= 7) if not
+    # enough, then to everything; the shared selection serves create_top_attacks too
+    critical = ticker_rows(select_feed_rows(df, max(n_items, SELECT_K)), n_items)
     
     ticker_items = []
     for idx, attack in critical.iterrows():
@@ -201,20 +336,29 @@ def create_attack_ticker(df, n_items=10):
     return ticker_html
 
 
+_TOP_ATTACK_ROW = RowTemplate(
+        "<tr>\n<td style='padding:8px'>{date}</td>\n<td style='padding:8px'>{attack_type}</td>\n"
+        "<td style='padding:8px'>{target_system}</td>\n<td style='padding:8px'>{location}</td>\n"
+        "<td style='padding:8px'>{severity}</td>\n<td style='padding:8px'>{data_loss} GB</td>\n</tr>"
+)
+
+@traced
 def create_top_attacks(df, n=10):
         """
         Create an HTML block listing top N attacks with concise info.
         """
-        # Sort by severity then data loss
-        if 'attack_severity' in df.columns:
-                top = df.sort_values(['attack_severity', 'data_compromised_GB'], ascending=False).head(n)
-        else:
-                top = df.sort_values('data_compromised_GB', ascending=False).head(n)
+        # Top n by severity then data loss (partial selection, shared with the ticker)
+        top = top_rows(select_feed_rows(df, max(n, SELECT_K)), n)
 
-        rows = []
-        for _, a in top.iterrows():
-                ts = pd.to_datetime(a.get('timestamp', pd.Timestamp.now()))
-                rows.append(f"<tr>\n<td style='padding:8px'>{ts.strftime('%Y-%m-%d')}</td>\n<td style='padding:8px'>{a.get('attack_type','Unknown')}</td>\n<td style='padding:8px'>{a.get('target_system','Unknown')}</td>\n<td style='padding:8px'>{a.get('location','Unknown')}</td>\n<td style='padding:8px'>{a.get('attack_severity',0)}</td>\n<td style='padding:8px'>{a.get('data_compromised_GB',0):.1f} GB</td>\n</tr>")
+        timestamps = pd.to_datetime(column_or_default(top, 'timestamp', pd.Timestamp.now()))
+        rows = _TOP_ATTACK_ROW.render({
+                'date': format_column(timestamps.dt.strftime('%Y-%m-%d')),
+                'attack_type': format_column(column_or_default(top, 'attack_type', 'Unknown')),
+                'target_system': format_column(column_or_default(top, 'target_system', 'Unknown')),
+                'location': format_column(column_or_default(top, 'location', 'Unknown')),
+                'severity': format_column(column_or_default(top, 'attack_severity', 0)),
+                'data_loss': format_column(column_or_default(top, 'data_compromised_GB', 0), '.1f'),
+        })
 
         table_html = f"""
         <div style="background: rgba(0,0,0,0.6); border:1px solid {COLORS['cyan']}; border-radius:10px; padding:12px;">
@@ -226,7 +370,7 @@ def create_top_attacks(df, n=10):
                     </tr>
                 </thead>
                 <tbody>
-                    {''.join(rows)}
+                    {rows}
                 </tbody>
             </table>
         </div>
@@ -234,7 +378,8 @@ def create_top_attacks(df, n=10):
 
         return table_html
 
-def create_status_board(df):
+@traced
+def create_status_board(df, counts=None):
     """
     Create real-time status board
     
@@ -242,6 +387,8 @@ def create_status_board(df):
     -----------
     df : pd.DataFrame
         Attack data
+    counts : dict, optional
+        Precomputed totals (LiveAggregates.status_counts()); df is not scanned
         
     Returns:
     --------
@@ -250,10 +397,16 @@ def create_status_board(df):
     """
     
     # Calculate real-time stats
-    total_attacks = len(df)
-    active_threats = (df['outcome'] == 'Success').sum()
-    critical_count = (df['attack_severity'] >= 8).sum()
-    total_data_loss = df['data_compromised_GB'].sum()
+    if counts is not None:
+        total_attacks = counts['total_attacks']
+        active_threats = counts['active_threats']
+        critical_count = counts['critical_count']
+        total_data_loss = counts['total_data_loss']
+    else:
+        total_attacks = len(df)
+        active_threats = (df['outcome'] == 'Success').sum()
+        critical_count = (df['attack_severity'] >= 8).sum()
+        total_data_loss = df['data_compromised_GB'].sum()
     
     # Create a compact status board (removed big threat banner per request)
     status_html = f"""
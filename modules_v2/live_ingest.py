@@ -0,0 +1,416 @@
+"""
+Tail-Follow Ingestion Module
+Follows a dataset CSV that the SOC keeps appending to: only newly appended
+rows are parsed, mapped to the canonical schema, appended to an in-memory
+store and folded into the running counts and top-N structures the live feed
+renders from, so a refresh costs time proportional to the new data
+"""
+
+import csv
+import io
+import itertools
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from modules.data_adapter import find_dataset, map_to_canonical
+from modules.fingerprint import tag
+from .data_loader_v2 import add_derived_columns
+from .live_feed import FeedRing
+from .sketches import BucketedSketch, BucketedTopK
+from .topk import top_n_positions, top_n_positions_by
+
+LIVE_TAIL_ENV = 'DARKSENTINEL_LIVE_TAIL'
+TOP_CAPACITY = 50            # rows kept per top-N structure (>= any n the feed asks for)
+SEVERITY_TIERS = (8, 7, 0)   # ticker tiers: critical, high, everything
+
+# Tokens of live frames must never match entries the disk cache kept from an
+# earlier process, so they carry a per-process prefix
+_TOKEN_PREFIX = f"live:{os.getpid()}-{time.time_ns()}"
+_store_ids = itertools.count(1)
+
+
+def tail_mode_enabled():
+    """True when DARKSENTINEL_LIVE_TAIL switches the V2 dashboard to tail-follow mode"""
+    return os.environ.get(LIVE_TAIL_ENV, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+class TailReader:
+    """
+    Reads a CSV incrementally from the last byte offset it consumed
+
+    Only complete lines are consumed; a row still being written stays in the
+    file until its newline arrives. If the file is replaced or truncated, the
+    reader starts over from byte zero and reports a reset.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.offset = 0
+        self.header = None
+        self.inode = None
+
+    def read_new(self):
+        """
+        Parse the rows appended since the last call
+
+        Returns:
+        --------
+        tuple
+            (frame, reset): frame holds the new raw rows (None if there are
+            none), reset is True when the file was replaced or truncated
+        """
+        stat = os.stat(self.path)
+        reset = self.inode is not None and (stat.st_ino != self.inode or stat.st_size < self.offset)
+        if reset:
+            self.offset = 0
+            self.header = None
+        self.inode = stat.st_ino
+        if stat.st_size <= self.offset:
+            return None, reset
+
+        with open(self.path, 'rb') as handle:
+            handle.seek(self.offset)
+            data = handle.read(stat.st_size - self.offset)
+        end = data.rfind(b'\n')
+        if end < 0:
+            return None, reset
+        data = data[:end + 1]
+        self.offset += len(data)
+
+        if self.header is None:
+            first = data.index(b'\n')
+            self.header = next(csv.reader([data[:first].decode('utf-8-sig').rstrip('\r')]))
+            data = data[first + 1:]
+        if not data.strip():
+            return None, reset
+        return pd.read_csv(io.BytesIO(data), header=None, names=self.header), reset
+
+
+class _FrameBuffer:
+    """
+    Column arrays with spare capacity that batches are copied into
+
+    Capacity doubles when full, so appending costs time proportional to the
+    batch (amortized) and the full frame is a set of views, not a copy.
+    Frames returned earlier stay valid: their rows are never written again.
+    Columns whose dtype changes between batches are promoted once (see
+    append); categoricals must keep the same categories.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.columns = None
+        self._data = {}
+        self._categories = {}
+
+    def _grow(self, needed):
+        capacity = max(needed, 2 * len(next(iter(self._data.values()))))
+        for name, data in self._data.items():
+            grown = np.empty(capacity, dtype=data.dtype)
+            grown[:self.rows] = data[:self.rows]
+            self._data[name] = grown
+
+    @staticmethod
+    def _values(series):
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return series.cat.codes.to_numpy(), series.dtype
+        return series.to_numpy(), None
+
+    def append(self, batch):
+        """
+        Copy a batch in after the existing rows
+
+        Returns:
+        --------
+        bool
+            False when the batch does not fit the buffer's layout (different
+            columns or categories); nothing is appended then
+        """
+        if self.columns is None:
+            self.columns = list(batch.columns)
+            for name in self.columns:
+                values, categories = self._values(batch[name])
+                self._data[name] = np.empty(max(len(values), 1024), dtype=values.dtype)
+                self._categories[name] = categories
+        elif list(batch.columns) != self.columns:
+            return False
+
+        converted = {}
+        for name in self.columns:
+            values, categories = self._values(batch[name])
+            if categories != self._categories[name]:
+                return False
+            converted[name] = values
+        end = self.rows + len(batch)
+        if end > len(self._data[self.columns[0]]):
+            self._grow(end)
+        for name, values in converted.items():
+            data = self._data[name]
+            if values.dtype != data.dtype and self._categories[name] is None:
+                try:
+                    common = np.result_type(data.dtype, values.dtype)
+                except TypeError:
+                    common = np.dtype(object)
+                if common != data.dtype:
+                    data = self._data[name] = data.astype(common)
+            data[self.rows:end] = values
+        self.rows = end
+        return True
+
+    def frame(self, index):
+        """The rows appended so far, as views of the buffer"""
+        columns = {}
+        for name in self.columns:
+            data = self._data[name][:self.rows]
+            categories = self._categories[name]
+            columns[name] = data if categories is None else pd.Categorical.from_codes(
+                data, dtype=categories, validate=False)
+        # copy=False keeps each column on its own block, viewing the buffer
+        return pd.DataFrame(columns, index=index, copy=False)
+
+
+def _keep_top(current, batch, by, capacity):
+    """Merge a batch into a bounded top-N frame (one partial selection, no full sort)"""
+    if batch.empty:
+        return current
+    merged = batch if current is None else pd.concat([current, batch])
+    if isinstance(by, str):
+        positions = top_n_positions(merged[by].to_numpy(), capacity)
+    else:
+        positions = top_n_positions_by(merged[by[0]].to_numpy(), merged[by[1]].to_numpy(), capacity)
+    return merged.take(positions)
+
+
+class LiveAggregates:
+    """
+    Running counts and top-N rows for the live feed, updated per batch
+
+    Holds the TOP_CAPACITY most recent rows of every ticker severity tier,
+    the TOP_CAPACITY worst rows by (severity, data loss), and per-day
+    distinct-count sketches and heavy-hitter summaries of the attacker and
+    target IPs. Any top-n query
+    with n <= TOP_CAPACITY gives the same answer on candidates() as on the
+    full frame, so create_attack_ticker/create_top_attacks can render from it.
+    """
+
+    def __init__(self, capacity=TOP_CAPACITY):
+        self.capacity = capacity
+        self.total = 0
+        self.successful = 0
+        self.critical = 0
+        self.data_loss = 0.0
+        self.by_attack_type = Counter()
+        self.by_location = Counter()
+        self.recent = {tier: None for tier in SEVERITY_TIERS}
+        self.top = None
+        self.attackers = BucketedSketch()
+        self.targets = BucketedSketch()
+        self.top_attacker_counts = BucketedTopK()
+        self.top_target_counts = BucketedTopK()
+
+    def update(self, batch):
+        """Fold a batch of prepared rows into the aggregates"""
+        if batch.empty:
+            return
+        self.total += len(batch)
+        self.successful += int((batch['outcome'] == 'Success').sum())
+        self.critical += int((batch['attack_severity'] >= 8).sum())
+        self.data_loss += float(batch['data_compromised_GB'].sum())
+        self.by_attack_type.update(batch['attack_type'].value_counts().to_dict())
+        self.by_location.update(batch['location'].value_counts().to_dict())
+        for tier in SEVERITY_TIERS:
+            in_tier = batch if tier == 0 else batch[batch['attack_severity'] >= tier]
+            self.recent[tier] = _keep_top(self.recent[tier], in_tier, 'timestamp', self.capacity)
+        self.top = _keep_top(self.top, batch, ['attack_severity', 'data_compromised_GB'], self.capacity)
+        self.attackers.update(batch['timestamp'], batch['attacker_ip'])
+        self.targets.update(batch['timestamp'], batch['target_ip'])
+        self.top_attacker_counts.update(batch['timestamp'], batch['attacker_ip'])
+        self.top_target_counts.update(batch['timestamp'], batch['target_ip'])
+
+    def status_counts(self):
+        """Totals in the shape create_status_board() computes from a frame"""
+        return {
+            'total_attacks': self.total,
+            'active_threats': self.successful,
+            'critical_count': self.critical,
+            'total_data_loss': self.data_loss,
+        }
+
+    def top_attack_types(self, n=10):
+        return self.by_attack_type.most_common(n)
+
+    def top_locations(self, n=10):
+        return self.by_location.most_common(n)
+
+    def unique_attackers(self, start=None, end=None):
+        """Estimated distinct attacker IPs between start and end (whole days; None = open)"""
+        estimate = self.attackers.estimate(start, end)
+        return min(estimate, self.total) if start is None and end is None else estimate
+
+    def unique_targets(self, start=None, end=None):
+        """Estimated distinct target IPs between start and end (whole days; None = open)"""
+        estimate = self.targets.estimate(start, end)
+        return min(estimate, self.total) if start is None and end is None else estimate
+
+    def top_attackers(self, n=10, start=None, end=None):
+        """Most frequent attacker IPs between start and end: {ip: count}, see SpaceSaving.top"""
+        return self.top_attacker_counts.top(n, start, end)
+
+    def top_targets(self, n=10, start=None, end=None):
+        """Most frequent target IPs between start and end: {ip: count}, see SpaceSaving.top"""
+        return self.top_target_counts.top(n, start, end)
+
+    def top_address_counts(self, n=10, start=None, end=None):
+        """Top attackers and targets, keyed like the matching entries of get_top_threats()"""
+        return {
+            'top_attackers': self.top_attackers(n, start, end),
+            'top_targets': self.top_targets(n, start, end),
+        }
+
+    def top_address_error(self, start=None, end=None):
+        """Largest undercount in top_address_counts() (see SpaceSaving.max_error)"""
+        return max(self.top_attacker_counts.merged(start, end).max_error(),
+                   self.top_target_counts.merged(start, end).max_error())
+
+    def candidates(self):
+        """Union of every tracked top-N row (deduplicated by row id)"""
+        frames = [f for f in list(self.recent.values()) + [self.top] if f is not None]
+        if not frames:
+            return pd.DataFrame()
+        merged = pd.concat(frames)
+        return merged[~merged.index.duplicated()]
+
+
+class LiveStore:
+    """
+    In-memory dataset fed by a TailReader (or by ingest() calls, e.g. replay)
+
+    Each refresh maps only the new rows (map_to_canonical, then
+    add_derived_columns), gives them consecutive row ids, appends them,
+    updates the aggregates and pushes them into the terminal feed ring. Rows
+    are copied into growable column buffers, and the full frame is a set of
+    views of them (see frame).
+    """
+
+    def __init__(self, path=None, capacity=TOP_CAPACITY):
+        self.reader = TailReader(path) if path is not None else None
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self.feed = FeedRing()
+        self._store_id = next(_store_ids)
+        self._resets = 0
+        self._reset_state()
+
+    def _reset_state(self):
+        self.aggregates = LiveAggregates(self.capacity)
+        self.feed.clear()
+        self._buffer = _FrameBuffer()
+        self._frame = None
+        self.rows = 0
+        self.generation = 0
+        self._resets += 1
+
+    @contextmanager
+    def reading(self):
+        """
+        Hold the store lock while reading the aggregates
+
+        Ingest (e.g. the replay consumer thread) updates them and the feed
+        ring in place, so read both inside this block and keep only what the
+        queries return.
+        """
+        with self._lock:
+            yield self.aggregates
+
+    def reset(self):
+        """Drop every ingested row"""
+        with self._lock:
+            self._reset_state()
+
+    def refresh(self):
+        """
+        Ingest whatever was appended to the followed file since the last refresh
+
+        Returns:
+        --------
+        int
+            Number of new rows
+        """
+        if self.reader is None:
+            return 0
+        with self._lock:
+            raw, reset = self.reader.read_new()
+            if reset:
+                self._reset_state()
+            if raw is None or raw.empty:
+                return 0
+            return self._ingest(add_derived_columns(map_to_canonical(raw)))
+
+    def ingest(self, batch):
+        """
+        Append a batch of rows that are already in the prepared V2 schema
+
+        Returns:
+        --------
+        int
+            Number of rows ingested
+        """
+        if batch is None or batch.empty:
+            return 0
+        with self._lock:
+            return self._ingest(batch.copy())
+
+    def _ingest(self, batch):
+        batch.index = pd.RangeIndex(self.rows, self.rows + len(batch))
+        if not self._buffer.append(batch):
+            # A batch with a different layout: rebuild the buffer around both (rare)
+            rebuilt = _FrameBuffer()
+            rebuilt.append(pd.concat([self._buffer.frame(pd.RangeIndex(self.rows)), batch]) if self.rows else batch)
+            self._buffer = rebuilt
+        self.rows += len(batch)
+        self.generation += 1
+        self._frame = None
+        self.aggregates.update(batch)
+        self.feed.push(batch)
+        return len(batch)
+
+    @property
+    def frame(self):
+        """
+        All rows ingested so far (read-only)
+
+        Rows are appended to column buffers as they arrive, so after new rows
+        the frame is rebuilt as views of the buffers without copying.
+        """
+        with self._lock:
+            if self._frame is None:
+                if not self.rows:
+                    return pd.DataFrame()
+                frame = self._buffer.frame(pd.RangeIndex(self.rows))
+                token = f"{_TOKEN_PREFIX}:{self._store_id}:{self._resets}:{self.rows}"
+                sources = [str(self.reader.path.resolve())] if self.reader is not None else []
+                self._frame = tag(frame, token, sources)
+            return self._frame
+
+
+@st.cache_resource
+def get_live_store(path=None):
+    """
+    Return the process-wide live store for a dataset (the adapter's pick by default)
+
+    The first call ingests the existing file; later refresh() calls only read
+    what was appended since.
+    """
+    if path is None:
+        path = find_dataset(Path(__file__).parent.parent)
+    store = LiveStore(path)
+    store.refresh()
+    return store
@@ -5,6 +5,10 @@ Replaces terminal feed with clean, professional table
 
 import streamlit as st
 import pandas as pd
+from functools import lru_cache
+
+from .html_rows import RowTemplate, format_column, choose
+from modules.tracing import traced
 
 COLORS = {
     'cyan': '#4dd0e1',
@@ -14,27 +18,10 @@ COLORS = {
     'orange': '#ffaa00',
 }
 
-def create_recent_attacks_table(df, n=10):
-    """
-    Create clean table showing top N critical attacks
-    
-    Parameters:
-    -----------
-    df : pd.DataFrame
-        Attack data
-    n : int
-        Number of attacks to show
-        
-    Returns:
-    --------
-    str
-        HTML for recent attacks table
-    """
-    
-    # Get top attacks by financial loss
-    top_attacks = df.nlargest(n, 'Financial Loss (in Million $)')
-    
-    table_html = f"""
+@lru_cache(maxsize=16)
+def _recent_attacks_header(n):
+    """Static chrome above the table rows (depends only on n)"""
+    return f"""
     <div style="
         background: rgba(255, 255, 255, 0.03);
         backdrop-filter: blur(10px);
@@ -68,61 +55,84 @@ def create_recent_attacks_table(df, n=10):
             </thead>
             <tbody>
     """
-    
-    for idx, row in top_attacks.iterrows():
-        # Determine severity color
-        severity_score = row.get('Severity_Score', row['Financial Loss (in Million $)'] / 10)
-        if severity_score >= 8:
-            severity_color = COLORS['pink']
-            severity_icon = '🔴'
-            severity_label = 'CRITICAL'
-        elif severity_score >= 5:
-            severity_color = COLORS['orange']
-            severity_icon = '🟡'
-            severity_label = 'HIGH'
-        else:
-            severity_color = COLORS['green']
-            severity_icon = '🟢'
-            severity_label = 'MEDIUM'
-        
-        table_html += f"""
+
+_RECENT_ATTACKS_FOOTER = """
+            </tbody>
+        </table>
+    </div>
+    """
+
+_RECENT_ATTACK_ROW = RowTemplate(f"""
             <tr style="border-bottom: 1px solid rgba(255, 255, 255, 0.1); transition: background 0.3s;" 
                 onmouseover="this.style.background='rgba(77, 208, 225, 0.05)'" 
                 onmouseout="this.style.background='transparent'">
-                <td style="padding: 12px; color: white;">{row['Year']}</td>
-                <td style="padding: 12px; color: {COLORS['purple']}; font-weight: 600;">{row['Country']}</td>
-                <td style="padding: 12px; color: {COLORS['pink']};">{row['Attack Type']}</td>
-                <td style="padding: 12px; color: #b8c5d6;">{row['Target Industry']}</td>
+                <td style="padding: 12px; color: white;">{{year}}</td>
+                <td style="padding: 12px; color: {COLORS['purple']}; font-weight: 600;">{{country}}</td>
+                <td style="padding: 12px; color: {COLORS['pink']};">{{attack_type}}</td>
+                <td style="padding: 12px; color: #b8c5d6;">{{industry}}</td>
                 <td style="padding: 12px; text-align: right; color: {COLORS['orange']}; font-weight: bold;">
-                    ${row['Financial Loss (in Million $)']:.2f}M
+                    ${{loss}}M
                 </td>
                 <td style="padding: 12px; text-align: right; color: white;">
-                    {row['Number of Affected Users']:,}
+                    {{users}}
                 </td>
                 <td style="padding: 12px; text-align: center;">
                     <span style="
                         background: rgba(255, 255, 255, 0.1);
                         padding: 4px 12px;
                         border-radius: 20px;
-                        color: {severity_color};
+                        color: {{severity_color}};
                         font-size: 11px;
                         font-weight: 600;
-                        border: 1px solid {severity_color};
+                        border: 1px solid {{severity_color}};
                     ">
-                        {severity_icon} {severity_label}
+                        {{severity_icon}} {{severity_label}}
                     </span>
                 </td>
             </tr>
-        """
+        """)
+
+@traced
+def create_recent_attacks_table(df, n=10):
+    """
+    Create clean table showing top N critical attacks
     
-    table_html += """
-            </tbody>
-        </table>
-    </div>
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Attack data
+    n : int
+        Number of attacks to show
+        
+    Returns:
+    --------
+    str
+        HTML for recent attacks table
     """
     
-    return table_html
+    # Get top attacks by financial loss
+    top_attacks = df.nlargest(n, 'Financial Loss (in Million $)')
+    
+    # Determine severity color per row
+    loss = top_attacks['Financial Loss (in Million $)']
+    severity_score = top_attacks['Severity_Score'] if 'Severity_Score' in top_attacks.columns else loss / 10
+    tiers = [severity_score.to_numpy() >= 8, severity_score.to_numpy() >= 5]
+    
+    rows = _RECENT_ATTACK_ROW.render({
+        'year': format_column(top_attacks['Year']),
+        'country': format_column(top_attacks['Country']),
+        'attack_type': format_column(top_attacks['Attack Type']),
+        'industry': format_column(top_attacks['Target Industry']),
+        'loss': format_column(loss, '.2f'),
+        'users': format_column(top_attacks['Number of Affected Users'], ','),
+        'severity_color': choose(tiers, [COLORS['pink'], COLORS['orange']], COLORS['green']),
+        'severity_icon': choose(tiers, ['🔴', '🟡'], '🟢'),
+        'severity_label': choose(tiers, ['CRITICAL', 'HIGH'], 'MEDIUM'),
+    })
+    
+    return _recent_attacks_header(n) + rows + _RECENT_ATTACKS_FOOTER
 
+@traced
 def create_attack_summary_cards(df):
     """Create summary cards for quick insights"""
     
@@ -0,0 +1,248 @@
+"""
+Replay Module
+Streams a stored dataset through the live pipeline in timestamp order at a
+configurable speed-up factor: a producer thread schedules events against the
+wall clock into a bounded buffer (it blocks when the buffer is full, so a
+slow consumer applies backpressure instead of losing events) and a consumer
+feeds them into a LiveStore's ring buffer and incremental aggregates
+"""
+
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from modules.data_adapter import map_to_canonical
+from .data_loader_v2 import add_derived_columns
+from .live_ingest import LiveStore
+
+REPLAY_ENV = 'DARKSENTINEL_REPLAY'
+REPLAY_SPEEDUP_ENV = 'DARKSENTINEL_REPLAY_SPEEDUP'
+
+DEFAULT_SPEEDUP = 1.0
+DEFAULT_BATCH_SIZE = 500      # most events handed over in one batch
+DEFAULT_BUFFER_BATCHES = 32   # batches buffered before the producer blocks
+DEFAULT_MAX_GAP = 2.0         # longest wall-clock wait between events (seconds)
+DEFAULT_TICK = 0.02           # shortest producer sleep; events due meanwhile share a batch
+_STOP = object()
+_RESTART = object()
+
+
+def replay_source():
+    """Dataset path DARKSENTINEL_REPLAY points at, or None when replay mode is off"""
+    setting = os.environ.get(REPLAY_ENV, '').strip()
+    return Path(setting) if setting else None
+
+
+def load_replay_frame(path):
+    """
+    Read a stored dataset (CSV or Parquet) into the prepared V2 schema, sorted by timestamp
+
+    Parameters:
+    -----------
+    path : str or Path
+        Dataset file
+
+    Returns:
+    --------
+    pd.DataFrame
+        Events in timestamp order (stable for equal timestamps)
+    """
+    path = Path(path)
+    raw = pd.read_parquet(path) if path.suffix == '.parquet' else pd.read_csv(path)
+    frame = add_derived_columns(map_to_canonical(raw))
+    order = np.argsort(frame['timestamp'].to_numpy(dtype='datetime64[ns]'), kind='stable')
+    return frame.take(order).reset_index(drop=True)
+
+
+class ReplayEngine:
+    """
+    Replays a timestamp-ordered frame into a sink at speedup x real time
+
+    Parameters:
+    -----------
+    frame : pd.DataFrame
+        Events in the prepared V2 schema, sorted by timestamp
+    sink : callable
+        Called with each batch by the consumer (e.g. LiveStore.ingest)
+    speedup : float
+        Event-time seconds replayed per wall-clock second
+    batch_size : int
+        Most events handed over in one batch
+    buffer_batches : int
+        Capacity of the buffer between producer and consumer
+    max_gap : float or None
+        Longest wall-clock wait between consecutive events; quiet stretches
+        in the data (e.g. year-granular timestamps) are compressed to this
+    tick : float
+        Shortest producer sleep; at high speed-ups the events that fall due
+        meanwhile go out as one batch instead of one batch per event
+    loop : bool
+        Start over from the first event after the last one
+    on_restart : callable, optional
+        Called by the consumer before the events of each new loop (e.g.
+        LiveStore.reset, so a looping replay does not grow without bound)
+    """
+
+    def __init__(self, frame, sink, speedup=DEFAULT_SPEEDUP, batch_size=DEFAULT_BATCH_SIZE,
+                 buffer_batches=DEFAULT_BUFFER_BATCHES, max_gap=DEFAULT_MAX_GAP, tick=DEFAULT_TICK,
+                 loop=False, on_restart=None):
+        if speedup <= 0:
+            raise ValueError("speedup must be positive")
+        self.frame = frame
+        self.sink = sink
+        self.speedup = float(speedup)
+        self.batch_size = batch_size
+        self.max_gap = max_gap
+        self.tick = tick
+        self.loop = loop
+        self.on_restart = on_restart
+        self._times = frame['timestamp'].to_numpy(dtype='datetime64[ns]').view('int64')
+        self._buffer = queue.Queue(maxsize=buffer_batches)
+        self._stop = threading.Event()
+        self._threads = []
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'events_emitted': 0, 'events_ingested': 0, 'batches': 0,
+            'producer_blocked_s': 0.0, 'max_lag_s': 0.0, 'buffer_high_water': 0,
+            'ingest_s': 0.0,
+        }
+        self._started_at = None
+        self.finished = threading.Event()
+
+    # -- producer ---------------------------------------------------------
+
+    def _put(self, item):
+        """Blocking put: a full buffer stalls the producer (backpressure)"""
+        started = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                self._buffer.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        with self._stats_lock:
+            self._stats['producer_blocked_s'] += time.monotonic() - started
+            self._stats['buffer_high_water'] = max(self._stats['buffer_high_water'], self._buffer.qsize())
+
+    def _produce(self):
+        times = self._times
+        n = len(times)
+        try:
+            while not self._stop.is_set():
+                wall_start = time.monotonic()
+                data_start = times[0] if n else 0
+                i = 0
+                while i < n and not self._stop.is_set():
+                    now = time.monotonic()
+                    due = data_start + (now - wall_start) * self.speedup * 1e9
+                    wait = (times[i] - due) / self.speedup / 1e9
+                    if wait > 0:
+                        if self.max_gap is not None and wait > self.max_gap:
+                            # Compress the quiet stretch to max_gap of wall time
+                            wall_start -= wait - self.max_gap
+                            wait = self.max_gap
+                        self._stop.wait(max(min(wait, 0.05), self.tick))
+                        continue
+                    end = min(int(np.searchsorted(times, due, side='right')), i + self.batch_size)
+                    end = max(end, i + 1)
+                    scheduled = wall_start + float(times[i] - data_start) / self.speedup / 1e9
+                    self._put((self.frame.iloc[i:end], scheduled))
+                    with self._stats_lock:
+                        self._stats['events_emitted'] += end - i
+                    i = end
+                if not self.loop or not n:
+                    break
+                self._put(_RESTART)
+        finally:
+            self._put(_STOP)
+
+    # -- consumer ---------------------------------------------------------
+
+    def _consume(self):
+        try:
+            while not self._stop.is_set():
+                try:
+                    item = self._buffer.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if item is _STOP:
+                    break
+                if item is _RESTART:
+                    if self.on_restart is not None:
+                        self.on_restart()
+                    continue
+                batch, scheduled = item
+                started = time.monotonic()
+                self.sink(batch)
+                finished = time.monotonic()
+                with self._stats_lock:
+                    self._stats['events_ingested'] += len(batch)
+                    self._stats['batches'] += 1
+                    self._stats['ingest_s'] += finished - started
+                    self._stats['max_lag_s'] = max(self._stats['max_lag_s'], finished - scheduled)
+        finally:
+            self.finished.set()
+
+    # -- control ----------------------------------------------------------
+
+    def start(self):
+        """Start the producer and consumer threads (once)"""
+        if self._threads:
+            return self
+        self._started_at = time.monotonic()
+        for name, target in (('replay-producer', self._produce), ('replay-consumer', self._consume)):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout=5.0):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def wait(self, timeout=None):
+        """Block until every event has been ingested (or timeout); returns True when done"""
+        return self.finished.wait(timeout)
+
+    def stats(self):
+        """Throughput, backpressure and lag counters"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+        stats['elapsed_s'] = elapsed
+        stats['events_per_s'] = stats['events_ingested'] / elapsed if elapsed else 0.0
+        stats['buffered_batches'] = self._buffer.qsize()
+        return stats
+
+
+@st.cache_resource
+def get_replay_store(path, speedup=DEFAULT_SPEEDUP):
+    """
+    Start replaying a dataset into a fresh live store (once per process)
+
+    Returns:
+    --------
+    tuple
+        (LiveStore, ReplayEngine)
+    """
+    store = LiveStore()
+    engine = ReplayEngine(load_replay_frame(path), store.ingest, speedup=speedup,
+                          loop=True, on_restart=store.reset)
+    engine.start()
+    # Let the first batch land so the first render has rows to show
+    deadline = time.monotonic() + 5.0
+    while store.rows == 0 and not engine.finished.is_set() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return store, engine
+
+
+def replay_speedup():
+    """Speed-up factor from DARKSENTINEL_REPLAY_SPEEDUP (1.0 = real time)"""
+    return float(os.environ.get(REPLAY_SPEEDUP_ENV, DEFAULT_SPEEDUP))
@@ -0,0 +1,151 @@
+"""
+Top-K Selection Module
+Partial-selection helpers (np.argpartition) shared by the live feed widgets:
+the ticker's "most recent n within a severity tier" and the top-attacks
+panel's "top n by (severity, data loss)" are answered from one selection
+over the frame instead of masked nlargest passes and full sorts
+"""
+
+import numpy as np
+import pandas as pd
+
+from modules.result_cache import cached_result
+
+SELECT_K = 50               # rows selected per structure; widgets ask for n <= SELECT_K
+TICKER_TIERS = (8, 7, 0)    # critical, high, everything
+
+
+def top_n_positions(values, n, mask=None):
+    """
+    Positions of the n largest values, like Series.nlargest(n, keep='first')
+
+    Runs in O(len(values)): an argpartition finds the n-th largest value, then
+    ties at that value are filled in position order. The result is ordered by
+    value (descending), ties by position.
+
+    Parameters:
+    -----------
+    values : np.ndarray
+        Numeric (or datetime64) values; NaN never ranks
+    n : int
+        Number of positions to return
+    mask : np.ndarray of bool, optional
+        Only consider positions where mask is True
+
+    Returns:
+    --------
+    np.ndarray
+        Integer positions into values
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in 'mM':
+        values = values.view('int64')
+        valid = values != np.iinfo('int64').min
+    elif values.dtype.kind == 'f':
+        valid = ~np.isnan(values)
+    else:
+        valid = None
+    if mask is not None:
+        valid = mask if valid is None else (valid & mask)
+    positions = np.flatnonzero(valid) if valid is not None else np.arange(len(values))
+    candidates = values[positions]
+
+    if n <= 0 or len(candidates) == 0:
+        return np.empty(0, dtype=np.intp)
+    if n < len(candidates):
+        kth = np.partition(candidates, len(candidates) - n)[len(candidates) - n]
+        above = np.flatnonzero(candidates > kth)
+        ties = np.flatnonzero(candidates == kth)[:n - len(above)]
+        chosen = np.sort(np.concatenate([above, ties]))
+    else:
+        chosen = np.arange(len(candidates))
+    keys = candidates[chosen]
+    # Negate in the values' own type: float64 would round nanosecond timestamps
+    keys = -keys.astype('int64') if keys.dtype.kind in 'iu' else -keys.astype('float64')
+    order = np.argsort(keys, kind='stable')
+    return positions[chosen[order]]
+
+
+def top_n_positions_by(primary, secondary, n):
+    """
+    Positions of the top n rows by (primary, secondary), both descending
+
+    Matches sort_values([primary, secondary], ascending=False).head(n) for
+    rows without NaN keys, but only the rows tied at the cut-off primary value
+    are ranked by the secondary key.
+    """
+    primary = np.asarray(primary, dtype='float64')
+    secondary = np.nan_to_num(np.asarray(secondary, dtype='float64'), nan=-np.inf)
+    first = top_n_positions(primary, n)
+    if len(first) == 0:
+        return first
+    cutoff = primary[first[-1]]
+    above = np.flatnonzero(primary > cutoff)
+    at_cutoff = top_n_positions(secondary, n - len(above), mask=primary == cutoff)
+    chosen = np.concatenate([above, at_cutoff])
+    order = np.lexsort((chosen, -secondary[chosen], -primary[chosen]))
+    return chosen[order]
+
+
+@cached_result('aggregate')
+def select_feed_rows(df, k=SELECT_K):
+    """
+    Select the rows both live feed widgets need, from one pass over the frame
+
+    Severity, timestamp and data-loss columns are pulled out once. The
+    most-recent selection is computed for the critical tier, and for the lower
+    tiers only when the tier above holds fewer than k rows (otherwise no n <= k
+    ticker can fall back to them).
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Attack data
+    k : int
+        Rows kept per selection
+
+    Returns:
+    --------
+    dict
+        'recent': {tier: frame} most recent rows with severity >= tier,
+        'tier_counts': {tier: rows in tier}, 'top': top rows by
+        (severity, data loss)
+    """
+    has_severity = 'attack_severity' in df.columns
+    loss = df['data_compromised_GB'].to_numpy(dtype='float64', na_value=np.nan)
+    selection = {'recent': {}, 'tier_counts': {}}
+
+    if has_severity:
+        severity = df['attack_severity'].to_numpy(dtype='float64', na_value=np.nan)
+        top = top_n_positions_by(severity, loss, k)
+    else:
+        severity = None
+        top = top_n_positions(np.nan_to_num(loss, nan=-np.inf), k)
+    selection['top'] = df.take(top)
+
+    if 'timestamp' in df.columns and severity is not None:
+        timestamps = df['timestamp'].to_numpy(dtype='datetime64[ns]')
+        for tier in TICKER_TIERS:
+            mask = severity >= tier if tier else None
+            count = int(mask.sum()) if mask is not None else len(df)
+            selection['tier_counts'][tier] = count
+            selection['recent'][tier] = df.take(top_n_positions(timestamps, k, mask))
+            if count >= k:
+                break
+    return selection
+
+
+def ticker_rows(selection, n):
+    """Rows create_attack_ticker shows: the critical tier, else high, else everything"""
+    counts, recent = selection['tier_counts'], selection['recent']
+    if not counts:
+        return pd.DataFrame()
+    tier = 8 if counts[8] >= n else 7
+    if counts[tier] == 0:
+        tier = 0
+    return recent[tier].head(n)
+
+
+def top_rows(selection, n):
+    """Rows create_top_attacks shows: top n by severity, then data loss"""
+    return selection['top'].head(n)
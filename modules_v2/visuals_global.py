@@ -3,12 +3,17 @@ Visualizations for Global Cybersecurity Threats Dataset
 Professional charts optimized for the new data structure
 """
 
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
 
+from modules.lazy_imports import lazy_module
+from modules.result_cache import cached_figure
+
+# Plotly is imported on the first figure built, not when the module loads
+px = lazy_module('plotly.express')
+go = lazy_module('plotly.graph_objects')
+plotly_subplots = lazy_module('plotly.subplots')
+
 # Updated color scheme
 COLORS = {
     'bg': '#050816',
@@ -49,6 +54,7 @@ def apply_theme(fig, title=None, height=None):
         fig.update_layout(height=height)
     return fig
 
+@cached_figure
 def create_defense_effectiveness_chart(defense_stats, title='🛡️ Defense Mechanism Effectiveness'):
     """
     Create horizontal bar chart showing defense mechanism effectiveness
@@ -88,6 +94,7 @@ def create_defense_effectiveness_chart(defense_stats, title='🛡️ Defense Mec
     
     return fig
 
+@cached_figure
 def create_defense_metrics_comparison(defense_stats, title='📊 Defense Mechanism Metrics Comparison'):
     """Create grouped bar chart comparing defense metrics"""
     
@@ -134,10 +141,11 @@ def create_defense_metrics_comparison(defense_stats, title='📊 Defense Mechani
     
     return fig
 
+@cached_figure
 def create_yearly_trend_chart(yearly_data, title='📈 Yearly Attack Trends (2015-2024)'):
     """Create line chart showing yearly trends"""
     
-    fig = make_subplots(
+    fig = plotly_subplots.make_subplots(
         rows=2, cols=1,
         subplot_titles=('Attack Count & Financial Loss', 'Affected Users'),
         specs=[[{"secondary_y": True}], [{"secondary_y": False}]],
@@ -190,6 +198,7 @@ def create_yearly_trend_chart(yearly_data, title='📈 Yearly Attack Trends (201
     
     return fig
 
+@cached_figure
 def create_attack_type_distribution(df, title='⚠️ Attack Type Distribution'):
     """Create pie chart for attack types"""
     
@@ -213,10 +222,11 @@ def create_attack_type_distribution(df, title='⚠️ Attack Type Distribution')
     
     return fig
 
+@cached_figure
 def create_country_heatmap(df, title='🌍 Attack Distribution by Country'):
     """Create bar chart for country distribution"""
     
-    country_data = df.groupby('Country').agg({
+    country_data = df.groupby('Country', observed=True).agg({
         'Attack Type': 'count',
         'Financial Loss (in Million $)': 'sum',
         'Number of Affected Users': 'sum'
@@ -253,10 +263,11 @@ def create_country_heatmap(df, title='🌍 Attack Distribution by Country'):
     
     return fig
 
+@cached_figure
 def create_industry_sunburst(df, title='🏢 Industry Attack Breakdown'):
     """Create sunburst chart for industry analysis"""
     
-    industry_data = df.groupby(['Target Industry', 'Attack Type']).size().reset_index(name='count')
+    industry_data = df.groupby(['Target Industry', 'Attack Type'], observed=True).size().reset_index(name='count')
     
     fig = px.sunburst(
         industry_data,
@@ -270,10 +281,11 @@ def create_industry_sunburst(df, title='🏢 Industry Attack Breakdown'):
     
     return fig
 
+@cached_figure
 def create_vulnerability_analysis(df, title='🔓 Security Vulnerability Analysis'):
     """Create stacked bar chart for vulnerability types"""
     
-    vuln_data = df.groupby(['Security Vulnerability Type', 'Attack Source']).size().reset_index(name='count')
+    vuln_data = df.groupby(['Security Vulnerability Type', 'Attack Source'], observed=True).size().reset_index(name='count')
     
     fig = px.bar(
         vuln_data,
@@ -289,10 +301,11 @@ def create_vulnerability_analysis(df, title='🔓 Security Vulnerability Analysi
     
     return fig
 
+@cached_figure
 def create_financial_impact_chart(df, title='💰 Financial Impact by Attack Type'):
     """Create waterfall chart for financial impact"""
     
-    attack_loss = df.groupby('Attack Type')['Financial Loss (in Million $)'].sum().sort_values(ascending=False)
+    attack_loss = df.groupby('Attack Type', observed=True)['Financial Loss (in Million $)'].sum().sort_values(ascending=False)
     
     fig = go.Figure(go.Waterfall(
         name="Financial Loss",
@@ -314,6 +327,7 @@ def create_financial_impact_chart(df, title='💰 Financial Impact by Attack Typ
     
     return fig
 
+@cached_figure
 def create_resolution_time_box(df, title='⏱️ Resolution Time Distribution'):
     """Create box plot for resolution times"""
     
@@ -333,6 +347,7 @@ def create_resolution_time_box(df, title='⏱️ Resolution Time Distribution'):
     
     return fig
 
+@cached_figure
 def create_3d_globe_global(df, title='🌍 Global Attack Distribution'):
     """Create 3D globe visualization for global dataset"""
     
@@ -351,7 +366,7 @@ def create_3d_globe_global(df, title='🌍 Global Attack Distribution'):
     }
     
     # Aggregate data by country
-    country_data = df.groupby('Country').agg({
+    country_data = df.groupby('Country', observed=True).agg({
         'Attack Type': 'count',
         'Financial Loss (in Million $)': 'sum',
         'Number of Affected Users': 'sum'
@@ -415,6 +430,7 @@ def create_3d_globe_global(df, title='🌍 Global Attack Distribution'):
     
     return fig
 
+@cached_figure
 def create_3d_attack_correlation(df, title='🔮 3D Attack Correlation Analysis'):
     """Create 3D scatter plot showing attack correlations"""
     
@@ -443,11 +459,12 @@ def create_3d_attack_correlation(df, title='🔮 3D Attack Correlation Analysis'
     
     return fig
 
+@cached_figure
 def create_attack_flow_sankey(df, title='🔀 Attack Flow Diagram'):
     """Create Sankey diagram showing attack flow"""
     
     # Create flow: Attack Source -> Attack Type -> Target Industry
-    flow_data = df.groupby(['Attack Source', 'Attack Type', 'Target Industry']).size().reset_index(name='count')
+    flow_data = df.groupby(['Attack Source', 'Attack Type', 'Target Industry'], observed=True).size().reset_index(name='count')
     
     # Create node labels
     sources = df['Attack Source'].unique().tolist()
@@ -468,7 +485,7 @@ def create_attack_flow_sankey(df, title='🔀 Attack Flow Diagram'):
         values.append(row['count'])
     
     # Attack Type -> Industry (aggregate)
-    industry_flow = df.groupby(['Attack Type', 'Target Industry']).size().reset_index(name='count')
+    industry_flow = df.groupby(['Attack Type', 'Target Industry'], observed=True).size().reset_index(name='count')
     for _, row in industry_flow.iterrows():
         source_indices.append(all_nodes.index(row['Attack Type']))
         target_indices.append(all_nodes.index(row['Target Industry']))
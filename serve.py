@@ -0,0 +1,34 @@
+"""
+DarkSentinel Server Entrypoint
+Starts the Streamlit server and warms the dashboard caches in the background
+
+Usage:
+    python serve.py app_v2.py --server.port=8501 --server.address=0.0.0.0
+"""
+
+import logging
+import sys
+
+from streamlit.web import cli as stcli
+
+from modules.metrics import start_metrics_server
+from modules.warmup import start_background_warmup
+
+
+def main():
+    args = sys.argv[1:] or ['app_v2.py']
+    logging.basicConfig(level=logging.INFO)
+
+    # Serve /metrics (when DARKSENTINEL_METRICS_PORT is set) before the warm-up
+    # so its load times are recorded too
+    start_metrics_server()
+
+    # Warm the caches inside the server process so the first session hits them
+    start_background_warmup(args[0])
+
+    sys.argv = ['streamlit', 'run', *args]
+    sys.exit(stcli.main())
+
+
+if __name__ == '__main__':
+    main()